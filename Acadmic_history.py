@@ -1,5 +1,7 @@
-import sqlite3
 import random
+import db_connection
+import seed_data
+import users_db
 
 # Run this file once and it will do the job
 courses = [
@@ -14,7 +16,7 @@ grade_choices = ["A+", "A", "B+", "B", "C+", "C", "D+", "D", "F"]
 
 def generate_all_transcripts():
     print("Connecting to database...")
-    con = sqlite3.connect('User.db')
+    con = db_connection.get_connection()
     cur = con.cursor()
 
     # 1. Get all existing Student IDs
@@ -23,43 +25,35 @@ def generate_all_transcripts():
 
     if not students:
         print("No students found in the database! Please add students first.")
-        con.close()
         return
 
     print(f"Found {len(students)} students. Generating transcripts...")
 
-    # 2. Loop through each student
-    count = 0
-    for student_id, name in students:
-        # Optional: Clear old transcript for this student to avoid duplicates
-        cur.execute("DELETE FROM transcripts WHERE student_id=?", (student_id,))
-
-        # 3. Generate random grades for THIS student
-        print(f" -> Generating for {name} (ID: {student_id})...")
-        
-        for course_code, credit_hours in courses:
-            random_grade = random.choice(grade_choices)
-            
-            # 4. Insert into Database
-            # Note: We only need student_id, course_code, and grade. 
-            # Credits are usually stored in the 'courses' table, but the transcript just links them.
-            cur.execute(
-                "INSERT INTO transcripts (student_id, course_code, grade) VALUES (?, ?, ?)",
-                (student_id, course_code, random_grade)
-            )
-            
-            # OPTIONAL: Ensure these courses exist in the 'courses' table too
-            # (so the dashboard can look up their credits later)
-            cur.execute("""
-                INSERT OR IGNORE INTO courses (course_code, course_name, credits, max_capacity) 
-                VALUES (?, ?, ?, ?)
-            """, (course_code, "Generated Course", credit_hours, 50))
-            
-        count += 1
-
-    con.commit()
-    con.close()
-    print(f"\nSuccess! Generated transcripts for {count} students.")
+    # 2. Ensure these courses exist in the 'courses' table too
+    # (so the dashboard can look up their credits later) - one batch
+    seed_data.insert_courses(
+        [(course_code, "Generated Course", credit_hours, None, None, None, None, 50)
+         for course_code, credit_hours in courses],
+        ignore_existing=True
+    )
+
+    # 3. Random grades for every student, recorded as last year's Fall term and
+    # upserted in ONE transaction, so running this again just regenerates them.
+    # Older runs wrote these courses without a term (term ''); a blank grade
+    # removes those rows in the same call, or they would count as a first attempt.
+    term = seed_data.past_term(1)
+    rows = [
+        (student_id, course_code, "", "")
+        for student_id, _ in students
+        for course_code, _ in courses
+    ] + [
+        (student_id, course_code, term, random.choice(grade_choices))
+        for student_id, _ in students
+        for course_code, _ in courses
+    ]
+    users_db.upsert_grades(rows)
+
+    print(f"\nSuccess! Generated transcripts for {len(students)} students.")
 
 if __name__ == "__main__":
     generate_all_transcripts()
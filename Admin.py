@@ -1,7 +1,10 @@
-import csv
 from User import User
 import users_db
-import sqlite3
+import db_connection
+import prereq_graph
+import course_importer
+import gpa_engine
+import course_codes
 
 class Admin(User):
     def __init__(self, user_id, name, email, password):
@@ -11,10 +14,14 @@ class Admin(User):
     #                       ADD COURSE
     # ============================================================
     def add_course(self, code, name, credits, day, start_time, end_time, room, max_capacity, prerequisites=[]):
+        code = course_codes.normalize_code(code)
+        prerequisites = course_codes.normalize_codes(prerequisites)
         if not all([code, name, credits, day, start_time, end_time, room, max_capacity]):
             return False, "All fields are required."
         if credits <= 0: return False, "Credits must be positive."
         if self._course_exists(code): return False, f"Course '{code}' already exists."
+        ok, msg = self.check_prerequisite_cycle(code, prerequisites)
+        if not ok: return False, msg
         
         try:
             new_course = users_db.courses_db((None, code, name, credits, day, start_time, end_time, room, max_capacity))
@@ -24,27 +31,29 @@ class Admin(User):
             return True, f"Course '{code}' added successfully."
         except Exception as e: return False, f"Database Error: {e}"
 
+    # ============================================================
+    #                 PREREQUISITE CYCLE CHECK
+    # ============================================================
+    def check_prerequisite_cycle(self, code, prerequisites):
+        """ Rejects a prerequisite list that would make the prerequisite graph cyclic """
+        if code in prerequisites:
+            return False, f"Course '{code}' cannot be its own prerequisite."
+        cycle = prereq_graph.find_cycle_after_edit(users_db.get_prerequisite_pairs(), code, prerequisites)
+        if cycle:
+            return False, "Prerequisite cycle: " + " -> ".join(cycle)
+        return True, "No prerequisite cycle."
+
     # ============================================================
     #                  BULK IMPORT (CSV)
     # ============================================================
-    def import_courses_from_csv(self, file_path):
-        success_count = 0
-        errors = []
+    def import_courses_from_csv(self, file_path, update_existing=False):
+        """ Streams the CSV into the catalog in one transaction (see course_importer) """
         try:
-            with open(file_path, newline='', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                next(reader, None) # Skip header
-                for row_num, row in enumerate(reader, start=1):
-                    if len(row) < 8:
-                        errors.append(f"Row {row_num}: Incomplete data.")
-                        continue
-                    code, name, credits, day, start, end, room, cap = row[0:8]
-                    try:
-                        success, msg = self.add_course(code.strip(), name.strip(), int(credits), day.strip(), str(start).strip(), str(end).strip(), room.strip(), int(cap), [])
-                        if success: success_count += 1
-                        else: errors.append(f"Row {row_num} ({code}): {msg}")
-                    except Exception as e: errors.append(f"Row {row_num}: {str(e)}")
-            return True, f"Imported {success_count} courses.", errors
+            result = course_importer.import_courses(file_path, update_existing=update_existing)
+            summary = f"Imported {result.added} courses."
+            if result.updated:
+                summary += f" Updated {result.updated}."
+            return True, summary, result.errors
         except Exception as e: return False, f"File Error: {str(e)}", []
 
     # ============================================================
@@ -56,6 +65,7 @@ class Admin(User):
             users_db.execute_query("DELETE FROM program_plans WHERE course_code = ?", (course_code,))
             users_db.execute_query("DELETE FROM registration WHERE course_code = ?", (course_code,))
             users_db.execute_query("DELETE FROM courses WHERE course_code = ?", (course_code,))
+            gpa_engine.refresh_courses([course_code])
             return True, "Course deleted successfully."
         except Exception as e: return False, f"Database Error: {e}"
 
@@ -84,6 +94,7 @@ class Admin(User):
             users_db.execute_query("DELETE FROM registration WHERE student_id = ?", (student_id,))
             users_db.execute_query("DELETE FROM students WHERE id = ?", (student_id,))
             users_db.execute_query("DELETE FROM users WHERE id = ?", (student_id,))
+            gpa_engine.refresh_students([student_id])
             return True, "Student deleted successfully."
         except Exception as e: return False, f"Database Error: {e}"
 
@@ -93,7 +104,7 @@ class Admin(User):
     def _course_exists(self, course_code):
         # We perform a direct SQL query for an EXACT match, 
         # bypassing the fuzzy search engine to avoid false positives.
-        with sqlite3.connect('User.db') as con:
+        with db_connection.get_connection() as con:
             cur = con.cursor()
-            cur.execute("SELECT 1 FROM courses WHERE course_code = ?", (course_code,))
+            cur.execute("SELECT 1 FROM courses WHERE course_code = ?", (course_codes.normalize_code(course_code),))
             return cur.fetchone() is not None
@@ -1,5 +1,5 @@
 import sys
-import sqlite3
+import db_connection
 import smtplib
 import random
 import string
@@ -14,6 +14,7 @@ from PyQt5.QtGui import QFont, QPixmap
 # --- IMPORT DASHBOARDS ---
 from student_dashboard import StudentDashboard
 from admin_dashboard import AdminDashboard
+import users_db
 
 
 class LoginWindow(QWidget):
@@ -179,7 +180,7 @@ class LoginWindow(QWidget):
         email = email.strip()
 
         try:
-            con = sqlite3.connect("User.db")
+            con = db_connection.get_connection()
             cur = con.cursor()
             
             # Check if email exists
@@ -187,7 +188,6 @@ class LoginWindow(QWidget):
             user = cur.fetchone()
             
             if not user:
-                con.close()
                 QMessageBox.warning(self, "Error", "Email address not found.")
                 return
 
@@ -197,7 +197,6 @@ class LoginWindow(QWidget):
             # STORE AS PLAIN TEXT (No Hash)
             cur.execute("UPDATE users SET password=? WHERE email=?", (temp_pass, email))
             con.commit()
-            con.close()
 
             # Send Email
             if self.send_recovery_email(email, temp_pass):
@@ -245,7 +244,7 @@ class LoginWindow(QWidget):
             return
 
         try:
-            con = sqlite3.connect("User.db")
+            con = db_connection.get_connection()
             cur = con.cursor()
 
             query = """
@@ -267,8 +266,6 @@ class LoginWindow(QWidget):
             else:
                 QMessageBox.warning(self, "Access Denied", "User not found.")
 
-            con.close()
-
         except Exception as e:
             QMessageBox.critical(self, "System Error", f"Database Error:\n{e}")
 
@@ -283,6 +280,7 @@ class LoginWindow(QWidget):
 
 
 if __name__ == "__main__":
+    users_db.setup_database()  # creates tables + applies pending migrations
     app = QApplication(sys.argv)
     font = QFont("Segoe UI", 10)
     app.setFont(font)
@@ -1,9 +1,7 @@
 import sys
-import sqlite3
 from PyQt5.QtWidgets import (
     QMainWindow, QApplication, QWidget, QVBoxLayout,
-    QHBoxLayout, QLabel, QPushButton, QTableWidget,
-    QTableWidgetItem, QHeaderView, QFrame, QStackedWidget,
+    QHBoxLayout, QLabel, QPushButton, QFrame, QStackedWidget,
     QLineEdit, QAbstractItemView, QMessageBox, QComboBox,
     QSpinBox, QFormLayout, QCheckBox, QFileDialog, QListWidget
 )
@@ -12,6 +10,14 @@ from PyQt5.QtGui import QFont, QPixmap # Added QPixmap
 
 # --- IMPORT ADMIN LOGIC ---
 from Admin import Admin
+import db_connection
+import users_db
+import grade_pipeline
+import gpa_engine
+import course_codes
+import analytics
+from data_worker import DataWorker
+from table_models import RowTableModel, make_table_view, source_row, selected_row
 
 # --- OPTIONAL: Matplotlib for Bonus #5 ---
 try:
@@ -21,6 +27,73 @@ try:
 except ImportError:
     MATPLOTLIB_AVAILABLE = False
 
+# ==========================================
+#  BACKGROUND QUERIES
+# ==========================================
+# These run on the DataWorker pool (their own SQLite connection), never on the
+# GUI thread, and must not touch widgets; the show_* methods draw the results.
+def fetch_dashboard_stats():
+    con = db_connection.get_connection()
+    return (con.execute("SELECT COUNT(*) FROM students").fetchone()[0],
+            con.execute("SELECT COUNT(*) FROM courses").fetchone()[0])
+
+def fetch_students():
+    return db_connection.get_connection().execute("SELECT id, name, email, program, level FROM students").fetchall()
+
+def fetch_courses():
+    return db_connection.get_connection().execute(
+        "SELECT course_code, course_name, credits, day, start_time, end_time, room, max_capacity FROM courses ORDER BY course_code").fetchall()
+
+def fetch_course_codes():
+    return [r[0] for r in db_connection.get_connection().execute("SELECT course_code FROM courses ORDER BY course_code")]
+
+def fetch_plans(program):
+    return db_connection.get_connection().execute(
+        "SELECT program, level, course_code FROM program_plans WHERE program=? ORDER BY level ASC, course_code", (program,)).fetchall()
+
+def fetch_student_list():
+    return db_connection.get_connection().execute("SELECT id, name FROM students ORDER BY id").fetchall()
+
+def fetch_transcript(sid):
+    """(student name, rows): current registrations are graded in the current term; every other attempt is listed as is."""
+    con = db_connection.get_connection()
+    nm = con.execute("SELECT name FROM students WHERE id=?",(sid,)).fetchone()
+    term = users_db.CURRENT_TERM
+    rows = con.execute("""
+        SELECT course_code, course_name, credits, term, grade FROM (
+            SELECT r.course_code, c.course_name, c.credits, ? AS term, t.grade 
+            FROM registration r 
+            LEFT JOIN courses c ON r.course_code=c.course_code 
+            LEFT JOIN transcripts t ON t.student_id=r.student_id AND t.course_code=r.course_code AND t.term=?
+            WHERE r.student_id=?
+            UNION
+            SELECT t.course_code, c.course_name, c.credits, t.term, t.grade 
+            FROM transcripts t 
+            LEFT JOIN courses c ON t.course_code=c.course_code
+            WHERE t.student_id=? AND NOT (t.term=? AND t.course_code IN (SELECT course_code FROM registration WHERE student_id=?))
+        ) ORDER BY course_code, term
+    """, (term, term, sid, sid, term, sid)).fetchall()
+    return (nm[0] if nm else "Unknown"), rows
+
+def fetch_enrollment():
+    # Course enrollments vs capacity (counts are maintained by triggers)
+    return db_connection.get_connection().execute("""
+        SELECT c.course_code, COALESCE(e.enrolled, 0), c.max_capacity
+        FROM courses c
+        LEFT JOIN course_enrollment e ON c.course_code = e.course_code
+        ORDER BY c.course_code
+    """).fetchall()
+
+def fetch_report(cohort, aggregate):
+    """(cohort, chart data): `aggregate` names an analytics.Cohort method; None is the enrollment chart."""
+    if aggregate is None:
+        return cohort, fetch_enrollment()
+    cohort = cohort or analytics.Cohort.load()
+    return cohort, getattr(cohort, aggregate)()
+
+LOADING_LABELS = {"stats": "overview", "students": "students", "courses": "courses", "course_codes": "course codes",
+                  "plans": "plans", "student_list": "student list", "transcript": "transcript", "report": "report"}
+
 
 class AdminDashboard(QMainWindow):
     def __init__(self, user_id=None):
@@ -34,6 +107,10 @@ class AdminDashboard(QMainWindow):
 
         self.setup_styles()
 
+        # Every read below goes through the worker; results arrive as signals
+        self.worker = DataWorker(self)
+        self.worker.loading.connect(self.on_loading)
+
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
         self.main_layout = QHBoxLayout(self.central_widget)
@@ -87,7 +164,7 @@ class AdminDashboard(QMainWindow):
                 font-size: 16px; font-weight: bold; color: #27ae60; margin-top: 10px;
             }
             QFrame[class="card"] { background-color: white; border-radius: 8px; border: 1px solid #e0e0e0; }
-            QTableWidget {
+            QTableView {
                 background-color: white; border: 1px solid #dcdcdc;
                 gridline-color: #ecf0f1; font-size: 13px;
             }
@@ -210,38 +287,41 @@ class AdminDashboard(QMainWindow):
             layout.addWidget(self.canvas)
 
             # Controls
+            self._cohort = None
+            # chart name -> (analytics.Cohort aggregate computed on the worker, plot)
+            self.charts = {"Enrollment vs Capacity": (None, self.plot_enrollment_stats)}
+            if analytics.NUMPY_AVAILABLE:
+                self.charts.update({
+                    "GPA Distribution by Program": ("gpa_distribution", self.plot_gpa_distribution),
+                    "Grade Histogram": ("grade_histogram", self.plot_grade_histogram),
+                    "Highest DFW Courses": ("course_rates", self.plot_dfw_courses),
+                    "Credit Load": ("credit_loads", self.plot_credit_loads),
+                    "Plan Progress by Level": ("plan_progress", self.plot_plan_progress),
+                })
             btn_box = QHBoxLayout()
-            btn_refresh = QPushButton("Refresh Enrollment Chart")
+            self.chart_combo = QComboBox()
+            self.chart_combo.addItems(list(self.charts))
+            self.chart_combo.currentTextChanged.connect(self.draw_selected_chart)
+            btn_box.addWidget(self.chart_combo)
+            btn_refresh = QPushButton("Refresh")
             btn_refresh.setProperty("class", "action-btn")
-            btn_refresh.clicked.connect(self.plot_enrollment_stats)
+            btn_refresh.clicked.connect(self.refresh_reports)
             btn_box.addWidget(btn_refresh)
             btn_box.addStretch()
             layout.addLayout(btn_box)
+            if not analytics.NUMPY_AVAILABLE:
+                layout.addWidget(QLabel("Cohort charts need 'numpy': pip install numpy"))
 
             # Initial Plot
-            self.plot_enrollment_stats()
+            self.draw_selected_chart()
 
         self.content_area.addWidget(page)
 
-    def plot_enrollment_stats(self):
+    def plot_enrollment_stats(self, data):
         if not MATPLOTLIB_AVAILABLE: return
 
         try:
-            # 1. Fetch Data
-            con = sqlite3.connect("User.db")
-            cur = con.cursor()
-            
-            # Get course enrollments vs capacity
-            cur.execute("""
-                SELECT c.course_code, COUNT(r.student_id), c.max_capacity
-                FROM courses c
-                LEFT JOIN registration r ON c.course_code = r.course_code
-                GROUP BY c.course_code
-                ORDER BY c.course_code
-            """)
-            data = cur.fetchall()
-            con.close()
-
+            # 1. Data (fetch_enrollment, on the worker)
             codes = [row[0] for row in data]
             enrolled = [row[1] for row in data]
             capacity = [row[2] for row in data]
@@ -266,6 +346,110 @@ class AdminDashboard(QMainWindow):
         except Exception as e:
             print(f"Plot Error: {e}")
 
+    def refresh_reports(self):
+        self._cohort = None   # reloaded on the next cohort chart
+        self.draw_selected_chart()
+
+    def draw_selected_chart(self, *args):
+        """The analytics.Cohort is loaded on the worker once per Refresh and reused by every chart."""
+        aggregate, plot = self.charts.get(self.chart_combo.currentText(), self.charts["Enrollment vs Capacity"])
+        self.worker.request("report", fetch_report, self._cohort, aggregate,
+                            on_result=lambda res: self.show_report(res, plot))
+
+    def show_report(self, result, plot):
+        cohort, data = result
+        if cohort is not None: self._cohort = cohort
+        plot(data)
+
+    def plot_gpa_distribution(self, data):
+        try:
+            programs, edges, counts = data
+            self.figure.clear()
+            ax = self.figure.add_subplot(111)
+            width = edges[1] - edges[0]
+            bottom = None
+            for program, row in zip(programs, counts):
+                if not row.any(): continue
+                ax.bar(edges[:-1], row, width=width, align='edge', bottom=bottom, label=program or "(none)")
+                bottom = row if bottom is None else bottom + row
+            ax.set_xlabel("Cumulative GPA")
+            ax.set_ylabel("Students")
+            ax.set_title("GPA Distribution by Program")
+            ax.legend()
+            self.figure.tight_layout()
+            self.canvas.draw()
+        except Exception as e:
+            print(f"Plot Error: {e}")
+
+    def plot_grade_histogram(self, data):
+        try:
+            programs, grades, counts = data
+            self.figure.clear()
+            ax = self.figure.add_subplot(111)
+            x = range(len(grades))
+            bottom = None
+            for program, row in zip(programs, counts):
+                if not row.any(): continue
+                ax.bar(x, row, bottom=bottom, label=program or "(none)")
+                bottom = row if bottom is None else bottom + row
+            ax.set_xticks(x)
+            ax.set_xticklabels(grades)
+            ax.set_ylabel("Grades")
+            ax.set_title("Grade Histogram")
+            ax.legend()
+            self.figure.tight_layout()
+            self.canvas.draw()
+        except Exception as e:
+            print(f"Plot Error: {e}")
+
+    def plot_dfw_courses(self, data):
+        try:
+            rows = [r for r in data if r[1] >= 5][:20]
+            self.figure.clear()
+            ax = self.figure.add_subplot(111)
+            x = range(len(rows))
+            ax.bar(x, [r[3] * 100 for r in rows], color='#e74c3c')
+            ax.set_xticks(x)
+            ax.set_xticklabels([r[0] for r in rows], rotation=45, ha='right')
+            ax.set_ylabel("D / F rate (%)")
+            ax.set_title("Highest DFW Courses (5+ attempts)")
+            self.figure.tight_layout()
+            self.canvas.draw()
+        except Exception as e:
+            print(f"Plot Error: {e}")
+
+    def plot_credit_loads(self, data):
+        try:
+            credits, students = data
+            self.figure.clear()
+            ax = self.figure.add_subplot(111)
+            ax.bar(credits, students, color='#3498db')
+            ax.set_xlabel("Registered credits")
+            ax.set_ylabel("Students")
+            ax.set_title("Credit Load This Term")
+            self.figure.tight_layout()
+            self.canvas.draw()
+        except Exception as e:
+            print(f"Plot Error: {e}")
+
+    def plot_plan_progress(self, data):
+        try:
+            progress = data
+            self.figure.clear()
+            ax = self.figure.add_subplot(111)
+            for program in sorted({p for p, _ in progress}):
+                levels = sorted(l for p, l in progress if p == program)
+                ax.plot(levels, [progress[(program, l)] * 100 for l in levels], marker='o', label=program or "(none)")
+            ax.set_xlabel("Level")
+            ax.set_ylabel("Lower-level plan courses passed (%)")
+            ax.set_ylim(0, 105)
+            ax.set_title("Plan Progress by Level")
+            ax.legend()
+            self.figure.tight_layout()
+            self.canvas.draw()
+        except Exception as e:
+            print(f"Plot Error: {e}")
+
     # =======================================================
     # PAGE 1: OVERVIEW
     # =======================================================
@@ -321,20 +505,19 @@ class AdminDashboard(QMainWindow):
         title.setProperty("class", "page-title")
         header.addWidget(title)
         header.addStretch()
+        self.inp_student_search = QLineEdit(); self.inp_student_search.setPlaceholderText("Search students...")
+        header.addWidget(self.inp_student_search)
         btn_refresh = QPushButton("Refresh List")
         btn_refresh.setProperty("class", "action-btn")
         btn_refresh.clicked.connect(self.load_students)
         header.addWidget(btn_refresh)
         layout.addLayout(header)
-        self.student_table = QTableWidget()
-        self.student_table.setColumnCount(5)
-        self.student_table.setHorizontalHeaderLabels(["ID", "Name", "Email", "Program", "Level"])
-        self.student_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.student_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.student_model = RowTableModel(["ID", "Name", "Email", "Program", "Level"], self)
+        self.student_table = make_table_view(self.student_model)
         self.student_table.setAlternatingRowColors(True)
-        self.student_table.verticalHeader().setVisible(False)
+        self.inp_student_search.textChanged.connect(self.student_table.model().set_filter)
         layout.addWidget(self.student_table)
-        self.student_table.itemDoubleClicked.connect(self.open_transcript_from_students_page)
+        self.student_table.doubleClicked.connect(self.open_transcript_from_students_page)
         action_layout = QHBoxLayout()
         action_layout.addStretch()
         self.btn_show_password = QPushButton("Show Password")
@@ -374,13 +557,9 @@ class AdminDashboard(QMainWindow):
         title = QLabel("Course Management")
         title.setProperty("class", "page-title")
         layout.addWidget(title)
-        self.course_table = QTableWidget()
-        self.course_table.setColumnCount(8)
-        self.course_table.setHorizontalHeaderLabels(["Code", "Name", "Credits", "Day(s)", "Start", "End", "Room", "Cap"])
-        self.course_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.course_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.course_model = RowTableModel(["Code", "Name", "Credits", "Day(s)", "Start", "End", "Room", "Cap"], self)
+        self.course_table = make_table_view(self.course_model)
         self.course_table.setAlternatingRowColors(True)
-        self.course_table.verticalHeader().setVisible(False)
         layout.addWidget(self.course_table)
         action_layout = QHBoxLayout()
         self.btn_import = QPushButton("Import CSV")
@@ -392,6 +571,9 @@ class AdminDashboard(QMainWindow):
         self.btn_load_course.clicked.connect(self.handle_load_course_for_edit)
         action_layout.addWidget(self.btn_load_course)
         action_layout.addStretch()
+        self.inp_course_search = QLineEdit(); self.inp_course_search.setPlaceholderText("Search courses...")
+        self.inp_course_search.textChanged.connect(self.course_table.model().set_filter)
+        action_layout.addWidget(self.inp_course_search)
         self.btn_del_course = QPushButton("Delete Selected Course")
         self.btn_del_course.setProperty("class", "danger-btn")
         self.btn_del_course.clicked.connect(self.handle_delete_course)
@@ -474,13 +656,9 @@ class AdminDashboard(QMainWindow):
         fl.addWidget(self.filter_program)
         fl.addStretch()
         layout.addWidget(filter_frame)
-        self.plans_table = QTableWidget()
-        self.plans_table.setColumnCount(3)
-        self.plans_table.setHorizontalHeaderLabels(["Program", "Level", "Course Code"])
-        self.plans_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.plans_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.plans_model = RowTableModel(["Program", "Level", "Course Code"], self)
+        self.plans_table = make_table_view(self.plans_model)
         self.plans_table.setAlternatingRowColors(True)
-        self.plans_table.verticalHeader().setVisible(False)
         layout.addWidget(self.plans_table)
         form_frame = QFrame()
         form_frame.setProperty("class", "card")
@@ -526,18 +704,23 @@ class AdminDashboard(QMainWindow):
         top_layout.addStretch()
         top_layout.addWidget(btn_load_transcript)
         layout.addWidget(top_frame)
-        self.transcript_table = QTableWidget()
-        self.transcript_table.setColumnCount(4)
-        self.transcript_table.setHorizontalHeaderLabels(["Course Code", "Course Name", "Credits", "Grade"])
-        self.transcript_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.transcript_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        # Only the grade column is editable
+        self.transcript_model = RowTableModel(["Course Code", "Course Name", "Credits", "Term", "Grade"], self, editable=(4,))
+        self.transcript_table = make_table_view(self.transcript_model)
         self.transcript_table.setAlternatingRowColors(True)
-        self.transcript_table.verticalHeader().setVisible(False)
         layout.addWidget(self.transcript_table)
         summary_layout = QHBoxLayout()
         self.lbl_transcript_summary = QLabel("No student selected.")
         summary_layout.addWidget(self.lbl_transcript_summary)
         summary_layout.addStretch()
+        btn_import_grades = QPushButton("Import Grade Sheet")
+        btn_import_grades.setProperty("class", "action-btn")
+        btn_import_grades.clicked.connect(self.handle_import_grades)
+        summary_layout.addWidget(btn_import_grades)
+        btn_export_transcripts = QPushButton("Export Transcripts")
+        btn_export_transcripts.setProperty("class", "action-btn")
+        btn_export_transcripts.clicked.connect(self.handle_export_transcripts)
+        summary_layout.addWidget(btn_export_transcripts)
         self.btn_save_grades = QPushButton("Save Grades")
         self.btn_save_grades.setProperty("class", "success-btn")
         self.btn_save_grades.clicked.connect(self.handle_save_grades)
@@ -546,83 +729,62 @@ class AdminDashboard(QMainWindow):
         self.content_area.addWidget(page)
 
     # --- LOADING FUNCTIONS ---
+    # Each load_* queues its query on the worker (a repeat while it is queued
+    # is coalesced, a newer one supersedes it) and the matching show_* fills
+    # the widgets when the rows arrive.
+    def on_loading(self, key, busy):
+        """Greys out the widget a query is filling and lists pending loads in the status bar."""
+        attr = {"students": "student_table", "courses": "course_table", "plans": "plans_table",
+                "transcript": "transcript_table", "report": "canvas"}.get(key)
+        widget = getattr(self, attr, None) if attr else None   # pages may still be under construction
+        if widget is not None: widget.setEnabled(not busy)
+        pending = [label for k, label in LOADING_LABELS.items() if self.worker.is_loading(k)]
+        self.statusBar().showMessage(f"Loading {', '.join(pending)}..." if pending else "")
+
     def load_dashboard_stats(self):
-        try:
-            con = sqlite3.connect("User.db")
-            cur = con.cursor()
-            cur.execute("SELECT COUNT(*) FROM students")
-            s_count = cur.fetchone()[0]
-            cur.execute("SELECT COUNT(*) FROM courses")
-            c_count = cur.fetchone()[0]
-            con.close()
-            self.card_students.layout().itemAt(1).widget().setText(str(s_count))
-            self.card_courses.layout().itemAt(1).widget().setText(str(c_count))
-        except: pass
+        self.worker.request("stats", fetch_dashboard_stats, on_result=self.show_dashboard_stats)
+
+    def show_dashboard_stats(self, counts):
+        s_count, c_count = counts
+        self.card_students.layout().itemAt(1).widget().setText(str(s_count))
+        self.card_courses.layout().itemAt(1).widget().setText(str(c_count))
 
     def load_students(self):
-        self.student_table.setRowCount(0)
-        try:
-            con = sqlite3.connect("User.db")
-            cur = con.cursor()
-            cur.execute("SELECT id, name, email, program, level FROM students")
-            rows = cur.fetchall()
-            con.close()
-            for r, rd in enumerate(rows):
-                self.student_table.insertRow(r)
-                for c, d in enumerate(rd): self.student_table.setItem(r, c, QTableWidgetItem(str(d)))
-        except: pass
+        self.worker.request("students", fetch_students, on_result=self.show_students)
+
+    def show_students(self, rows):
+        self.student_model.set_rows(rows)
 
     def load_courses(self):
-        self.course_table.setRowCount(0)
-        try:
-            con = sqlite3.connect("User.db")
-            cur = con.cursor()
-            cur.execute("SELECT course_code, course_name, credits, day, start_time, end_time, room, max_capacity FROM courses ORDER BY course_code")
-            rows = cur.fetchall()
-            con.close()
-            for r, rd in enumerate(rows):
-                self.course_table.insertRow(r)
-                for c, d in enumerate(rd): self.course_table.setItem(r, c, QTableWidgetItem(str(d)))
-        except: pass
+        self.worker.request("courses", fetch_courses, on_result=self.show_courses)
 
+    def show_courses(self, rows):
+        self.course_model.set_rows(rows)
+
+    # Both combos list every course code: one query (the two requests coalesce) fills both
     def refresh_prereq_combo(self):
-        try:
-            con = sqlite3.connect("User.db")
-            courses = con.execute("SELECT course_code FROM courses ORDER BY course_code").fetchall()
-            con.close()
-            self.prereq_combo.clear()
-            for c in courses: self.prereq_combo.addItem(c[0])
-        except: pass
+        self.worker.request("course_codes", fetch_course_codes, on_result=self.show_course_codes)
 
     def load_course_codes_into_combo(self):
-        try:
-            con = sqlite3.connect("User.db")
-            courses = con.execute("SELECT course_code FROM courses ORDER BY course_code").fetchall()
-            con.close()
-            self.combo_plan_course.clear()
-            for c in courses: self.combo_plan_course.addItem(c[0])
-        except: pass
+        self.worker.request("course_codes", fetch_course_codes, on_result=self.show_course_codes)
+
+    def show_course_codes(self, codes):
+        for combo in (self.prereq_combo, self.combo_plan_course):
+            combo.clear()
+            combo.addItems(codes)
 
     def load_plans(self):
-        self.plans_table.setRowCount(0)
-        prog = self.filter_program.currentText()
-        try:
-            con = sqlite3.connect("User.db")
-            rows = con.execute("SELECT program, level, course_code FROM program_plans WHERE program=? ORDER BY level ASC, course_code", (prog,)).fetchall()
-            con.close()
-            for r, rd in enumerate(rows):
-                self.plans_table.insertRow(r)
-                for c, d in enumerate(rd): self.plans_table.setItem(r, c, QTableWidgetItem(str(d)))
-        except: pass
+        self.worker.request("plans", fetch_plans, self.filter_program.currentText(), on_result=self.show_plans)
+
+    def show_plans(self, rows):
+        self.plans_model.set_rows(rows)
 
     def load_transcript_student_list(self):
-        try:
-            con = sqlite3.connect("User.db")
-            rows = con.execute("SELECT id, name FROM students ORDER BY id").fetchall()
-            con.close()
-            self.transcript_student_combo.clear()
-            for sid, sname in rows: self.transcript_student_combo.addItem(f"{sid} - {sname}", str(sid))
-        except: pass
+        self.worker.request("student_list", fetch_student_list, on_result=self.show_transcript_student_list)
+
+    def show_transcript_student_list(self, rows):
+        self.transcript_student_combo.clear()
+        for sid, sname in rows: self.transcript_student_combo.addItem(f"{sid} - {sname}", str(sid))
 
     def parse_time_str(self, s):
         try:
@@ -648,17 +810,16 @@ class AdminDashboard(QMainWindow):
         else: QMessageBox.warning(self,"Error",m)
 
     def handle_show_password(self):
-        row = self.student_table.currentRow()
-        if row < 0: return QMessageBox.warning(self,"Error","Select student")
-        sid = self.student_table.item(row,0).text()
+        row = selected_row(self.student_table)
+        if row is None: return QMessageBox.warning(self,"Error","Select student")
+        sid = str(row[0])
         try:
-            con = sqlite3.connect("User.db"); res = con.execute("SELECT password FROM users WHERE id=?",(sid,)).fetchone(); con.close()
+            con = db_connection.get_connection(); res = con.execute("SELECT password FROM users WHERE id=?",(sid,)).fetchone()
             if res: QMessageBox.information(self,"Pass",f"Password: {res[0]}")
         except Exception as e: QMessageBox.warning(self,"Error",str(e))
 
-    def open_transcript_from_students_page(self, item):
-        row = item.row()
-        sid = self.student_table.item(row,0).text()
+    def open_transcript_from_students_page(self, index):
+        sid = str(self.student_model.row(source_row(self.student_table, index))[0])
         idx = self.transcript_student_combo.findData(sid)
         if idx!=-1: self.transcript_student_combo.setCurrentIndex(idx)
         self.switch_page(4, self.nav_transcripts)
@@ -685,27 +846,26 @@ class AdminDashboard(QMainWindow):
         else: QMessageBox.warning(self,"Error",m)
 
     def handle_load_course_for_edit(self):
-        r = self.course_table.currentRow()
-        if r < 0: return QMessageBox.warning(self,"Error","Select course")
-        c = self.course_table.item(r,0).text()
+        row = selected_row(self.course_table)
+        if row is None: return QMessageBox.warning(self,"Error","Select course")
+        c, name, credits, ds, start, end, room, cap = row
         self.edit_mode=True; self.current_edit_code=c; self.btn_update_course.setEnabled(True)
         self.inp_code.setText(c); self.inp_code.setReadOnly(True)
-        self.inp_name.setText(self.course_table.item(r,1).text())
-        try: self.inp_credits.setValue(int(self.course_table.item(r,2).text()))
+        self.inp_name.setText(name or "")
+        try: self.inp_credits.setValue(int(credits))
         except: pass
-        ds = self.course_table.item(r,3).text(); dl = [d.strip() for d in ds.split(",")] if ds else []
+        dl = [d.strip() for d in ds.split(",")] if ds else []
         for cb in self.day_checkboxes: cb.setChecked(cb.text() in dl)
-        sh, sm = self.parse_time_str(self.course_table.item(r,4).text())
-        eh, em = self.parse_time_str(self.course_table.item(r,5).text())
+        sh, sm = self.parse_time_str(str(start))
+        eh, em = self.parse_time_str(str(end))
         self.inp_start_hour.setValue(sh); self.inp_end_hour.setValue(eh)
-        self.inp_room.setText(self.course_table.item(r,6).text())
-        try: self.inp_cap.setValue(int(self.course_table.item(r,7).text()))
+        self.inp_room.setText(room or "")
+        try: self.inp_cap.setValue(int(cap))
         except: pass
         self.prereq_list.clear()
         try:
-            con = sqlite3.connect("User.db")
+            con = db_connection.get_connection()
             for r in con.execute("SELECT prereq_code FROM prerequisites WHERE course_code=?",(c,)): self.prereq_list.addItem(r[0])
-            con.close()
         except: pass
         QMessageBox.information(self,"Edit",f"Editing {c}")
 
@@ -717,19 +877,22 @@ class AdminDashboard(QMainWindow):
         et = f"{self.inp_end_hour.value():02d}:{self.inp_end_min.currentText()}"
         rm = self.inp_room.text().strip(); cp = self.inp_cap.value()
         pre = self.get_current_prereq_codes()
+        ok, msg = self.admin_logic.check_prerequisite_cycle(c, pre)
+        if not ok: return QMessageBox.warning(self,"Error",msg)
         try:
-            con = sqlite3.connect("User.db")
-            con.execute("UPDATE courses SET course_name=?, credits=?, day=?, start_time=?, end_time=?, room=?, max_capacity=? WHERE course_code=?", (n, cr, ds, st, et, rm, cp, c))
-            con.execute("DELETE FROM prerequisites WHERE course_code=?", (c,))
-            for p in pre: con.execute("INSERT INTO prerequisites VALUES (?,?)", (c, p))
-            con.commit(); con.close()
+            with db_connection.get_connection() as con:
+                old = con.execute("SELECT credits FROM courses WHERE course_code=?", (c,)).fetchone()
+                con.execute("UPDATE courses SET course_name=?, credits=?, day=?, start_time=?, end_time=?, room=?, max_capacity=? WHERE course_code=?", (n, cr, ds, st, et, rm, cp, c))
+                con.execute("DELETE FROM prerequisites WHERE course_code=?", (c,))
+                for p in pre: con.execute("INSERT INTO prerequisites VALUES (?,?)", (c, p))
+            if old and old[0] != cr: gpa_engine.refresh_courses([c])
             QMessageBox.information(self,"Success","Updated"); self.load_courses(); self.edit_mode=False; self.btn_update_course.setEnabled(False); self.inp_code.setReadOnly(False); self.inp_code.clear()
         except Exception as e: QMessageBox.warning(self,"Error",str(e))
 
     def handle_delete_course(self):
-        r = self.course_table.currentRow()
-        if r < 0: return
-        c = self.course_table.item(r,0).text()
+        row = selected_row(self.course_table)
+        if row is None: return
+        c = row[0]
         if QMessageBox.question(self,"Confirm",f"Delete {c}?",QMessageBox.Yes|QMessageBox.No)==QMessageBox.Yes:
             s, m = self.admin_logic.delete_course(c)
             if s: self.load_courses(); self.refresh_prereq_combo(); self.load_course_codes_into_combo()
@@ -742,21 +905,21 @@ class AdminDashboard(QMainWindow):
             QMessageBox.information(self,"Result",msg); self.load_courses()
 
     def handle_add_to_plan(self):
-        p = self.filter_program.currentText(); l = self.inp_plan_level.value(); c = self.combo_plan_course.currentText()
+        p = self.filter_program.currentText(); l = self.inp_plan_level.value(); c = course_codes.normalize_code(self.combo_plan_course.currentText())
         try:
-            con = sqlite3.connect("User.db")
+            con = db_connection.get_connection()
             if con.execute("SELECT 1 FROM program_plans WHERE program=? AND level=? AND course_code=?",(p,l,c)).fetchone():
                 return QMessageBox.warning(self,"Error","Exists")
-            con.execute("INSERT INTO program_plans VALUES (?,?,?)",(p,l,c)); con.commit(); con.close()
+            with con: con.execute("INSERT INTO program_plans VALUES (?,?,?)",(p,l,c))
             self.load_plans()
         except Exception as e: QMessageBox.warning(self,"Error",str(e))
 
     def handle_delete_from_plan(self):
-        r = self.plans_table.currentRow()
-        if r<0: return
-        p = self.plans_table.item(r,0).text(); l = self.plans_table.item(r,1).text(); c = self.plans_table.item(r,2).text()
+        row = selected_row(self.plans_table)
+        if row is None: return
+        p, l, c = row
         try:
-            con=sqlite3.connect("User.db"); con.execute("DELETE FROM program_plans WHERE program=? AND level=? AND course_code=?",(p,l,c)); con.commit(); con.close()
+            with db_connection.get_connection() as con: con.execute("DELETE FROM program_plans WHERE program=? AND level=? AND course_code=?",(p,l,c))
             self.load_plans()
         except: pass
 
@@ -767,53 +930,44 @@ class AdminDashboard(QMainWindow):
         self.load_transcript_for_student(sid)
 
     def load_transcript_for_student(self, sid):
-        self.transcript_table.setRowCount(0)
-        try:
-            con = sqlite3.connect("User.db")
-            nm = con.execute("SELECT name FROM students WHERE id=?",(sid,)).fetchone()
-            nm = nm[0] if nm else "Unknown"
-            rows = con.execute("""
-                SELECT course_code, course_name, credits, grade FROM (
-                    SELECT r.course_code, c.course_name, c.credits, t.grade 
-                    FROM registration r 
-                    LEFT JOIN courses c ON r.course_code=c.course_code 
-                    LEFT JOIN transcripts t ON t.student_id=r.student_id AND t.course_code=r.course_code
-                    WHERE r.student_id=?
-                    UNION
-                    SELECT t.course_code, c.course_name, c.credits, t.grade 
-                    FROM transcripts t 
-                    LEFT JOIN courses c ON t.course_code=c.course_code
-                    WHERE t.student_id=? AND t.course_code NOT IN (SELECT course_code FROM registration WHERE student_id=?)
-                ) ORDER BY course_code
-            """, (sid, sid, sid)).fetchall()
-            con.close()
-            for r, rd in enumerate(rows):
-                self.transcript_table.insertRow(r)
-                for c, d in enumerate(rd):
-                    it = QTableWidgetItem(str(d) if d else "")
-                    if c in (0,1,2): it.setFlags(Qt.ItemIsSelectable|Qt.ItemIsEnabled)
-                    self.transcript_table.setItem(r, c, it)
-            self.lbl_transcript_summary.setText(f"Student: {sid} - {nm}")
-        except Exception as e: QMessageBox.warning(self,"Error",str(e))
+        self.worker.request("transcript", fetch_transcript, sid,
+                            on_result=lambda res: self.show_transcript(sid, *res),
+                            on_error=lambda err: QMessageBox.warning(self,"Error",err.strip().splitlines()[-1]))
+
+    def show_transcript(self, sid, nm, rows):
+        self.transcript_model.set_rows(rows)
+        self.lbl_transcript_summary.setText(f"Student: {sid} - {nm}")
 
     def handle_save_grades(self):
         idx = self.transcript_student_combo.currentIndex()
         if idx<0: return
         sid = self.transcript_student_combo.currentData()
         try:
-            con = sqlite3.connect("User.db")
-            for r in range(self.transcript_table.rowCount()):
-                cc = self.transcript_table.item(r,0).text()
-                gr = self.transcript_table.item(r,3).text().strip()
-                if not gr: con.execute("DELETE FROM transcripts WHERE student_id=? AND course_code=?",(sid,cc))
-                else:
-                    if con.execute("SELECT 1 FROM transcripts WHERE student_id=? AND course_code=?",(sid,cc)).fetchone():
-                        con.execute("UPDATE transcripts SET grade=? WHERE student_id=? AND course_code=?",(gr,sid,cc))
-                    else: con.execute("INSERT INTO transcripts VALUES (?,?,?)",(sid,cc,gr))
-            con.commit(); con.close()
+            # One upsert batch keyed on (student, course, term); blank grades remove that attempt
+            users_db.upsert_grades([(sid, code, term, str(grade or "").strip())
+                                    for code, _, _, term, grade in self.transcript_model.rows()])
             QMessageBox.information(self,"Success","Saved"); self.load_transcript_for_student(sid)
         except Exception as e: QMessageBox.warning(self,"Error",str(e))
 
+    def handle_import_grades(self):
+        fp, _ = QFileDialog.getOpenFileName(self, "Grade Sheet", "", "Grade sheets (*.csv *.json *.jsonl)")
+        if not fp: return
+        try:
+            res = grade_pipeline.import_grades(fp)
+            msg = f"Saved {res.saved} grades, removed {res.removed}." + ("\nErrors:\n"+"\n".join(res.errors[:5]) if res.errors else "")
+            QMessageBox.information(self,"Result",msg)
+            if self.transcript_student_combo.currentIndex() >= 0:
+                self.load_transcript_for_student(self.transcript_student_combo.currentData())
+        except Exception as e: QMessageBox.warning(self,"Error",str(e))
+
+    def handle_export_transcripts(self):
+        fp, _ = QFileDialog.getSaveFileName(self, "Export Transcripts", "transcripts.csv", "CSV (*.csv);;JSON (*.json);;JSON Lines (*.jsonl)")
+        if not fp: return
+        try:
+            n = grade_pipeline.export_transcripts(fp)
+            QMessageBox.information(self,"Result",f"Exported {n} transcript rows.")
+        except Exception as e: QMessageBox.warning(self,"Error",str(e))
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     font = QFont("Segoe UI", 10)
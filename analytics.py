@@ -0,0 +1,238 @@
+"""
+Cohort analytics on columnar NumPy arrays.
+
+Cohort.load() reads students, transcripts, registrations, courses and program
+plans ONCE into flat integer arrays (codes and programs become small integer
+indexes), and every aggregate is then a handful of vectorized operations
+(bincount / lexsort / histogram) instead of a Python loop per student:
+    grade_histogram()     grade counts per program
+    gpa_distribution()    cumulative GPA histogram per program (latest attempts, like gpa_engine)
+    course_rates()        attempts, pass rate and DFW rate per course
+    credit_loads()        registered credits per student, as a distribution
+    plan_progress()       share of lower-level plan courses passed, per program and level
+
+NumPy is optional, like matplotlib: without it NUMPY_AVAILABLE is False and
+the admin Reports page only shows the enrollment chart.
+
+    python analytics.py            # print a cohort summary of User.db
+"""
+import db_connection
+import gpa_engine
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+GRADES = tuple(gpa_engine.GRADE_POINTS) + ("IP",)
+DFW_GRADES = ("D+", "D", "F")
+FAIL_GRADES = ("F",)
+OTHER = len(GRADES)     # index of any grade outside GRADES
+
+_GRADE_SQL = "CASE UPPER(t.grade) " + " ".join(
+    f"WHEN '{grade}' THEN {i}" for i, grade in enumerate(GRADES)) + f" ELSE {OTHER} END"
+
+
+def _require_numpy():
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("analytics needs numpy: pip install numpy")
+
+
+class Cohort:
+    """Column arrays for the whole faculty; build with Cohort.load()."""
+
+    def __init__(self, student_ids, programs, student_program, student_level,
+                 course_codes, course_credits, t_student, t_course, t_term, t_grade, terms,
+                 r_student, r_course, plan_program, plan_level, plan_course):
+        self.student_ids = student_ids          # sorted int64; row i of every per-student array
+        self.programs = programs                # program names; student_program indexes it
+        self.student_program = student_program
+        self.student_level = student_level
+        self.course_codes = course_codes        # course index -> code
+        self.course_credits = course_credits
+        self.t_student = t_student              # transcripts: one entry per row
+        self.t_course = t_course                # -1 for a course no longer in the catalog
+        self.t_term = t_term                    # index into terms (sorted, so chronological)
+        self.t_grade = t_grade                  # index into GRADES, OTHER otherwise
+        self.terms = terms
+        self.r_student = r_student              # current registrations
+        self.r_course = r_course
+        self.plan_program = plan_program        # program plans
+        self.plan_level = plan_level
+        self.plan_course = plan_course
+        self._latest = None
+
+    # -----------------------------------------------------------
+    @classmethod
+    def load(cls, con=None):
+        """One query per table; strings become integer indexes with searchsorted / unique."""
+        _require_numpy()
+        con = con or db_connection.get_connection()
+
+        students = con.execute("SELECT id, COALESCE(program, ''), COALESCE(level, 0) FROM students ORDER BY id").fetchall()
+        plans = con.execute("""SELECT p.program, p.level, c.id FROM program_plans p
+                               JOIN courses c ON c.course_code = p.course_code""").fetchall()
+        student_ids = np.array([s[0] for s in students], dtype=np.int64)
+        program_names = [s[1] for s in students] + [p[0] for p in plans]
+        programs, program_idx = np.unique(np.array(program_names, dtype=object).astype(str), return_inverse=True)
+        student_program = program_idx[:len(students)].astype(np.int16)
+        plan_program = program_idx[len(students):].astype(np.int16)
+        student_level = np.array([s[2] for s in students], dtype=np.int8)
+
+        courses = con.execute("SELECT id, course_code, COALESCE(credits, 0) FROM courses ORDER BY id").fetchall()
+        course_ids = np.array([c[0] for c in courses], dtype=np.int64)
+        course_codes = [c[1] for c in courses]
+        course_credits = np.array([c[2] for c in courses], dtype=np.int16)
+
+        def course_index(ids):
+            pos = np.searchsorted(course_ids, ids)
+            found = (pos < len(course_ids)) & (course_ids[np.minimum(pos, len(course_ids) - 1)] == ids)
+            return np.where(found, pos, -1).astype(np.int32)
+
+        def student_index(ids):
+            pos = np.searchsorted(student_ids, ids)
+            found = (pos < len(student_ids)) & (student_ids[np.minimum(pos, len(student_ids) - 1)] == ids)
+            return pos, found
+
+        rows = con.execute(f"""SELECT t.student_id, COALESCE(c.id, -1), t.term, {_GRADE_SQL}
+                               FROM transcripts t LEFT JOIN courses c ON c.course_code = t.course_code""").fetchall()
+        table = np.array(rows, dtype=[("sid", np.int64), ("cid", np.int64), ("term", "U8"), ("grade", np.int8)])
+        t_pos, t_found = student_index(table["sid"])
+        table = table[t_found]
+        terms, t_term = np.unique(table["term"], return_inverse=True)
+
+        regs = np.array(con.execute("""SELECT r.student_id, c.id FROM registration r
+                                       JOIN courses c ON c.course_code = r.course_code""").fetchall(),
+                        dtype=np.int64).reshape(-1, 2)
+        r_pos, r_found = student_index(regs[:, 0])
+
+        return cls(student_ids, [str(p) for p in programs], student_program, student_level,
+                   course_codes, course_credits,
+                   t_pos[t_found].astype(np.int32), course_index(table["cid"]), t_term.astype(np.int16),
+                   table["grade"], list(terms),
+                   r_pos[r_found].astype(np.int32), course_index(regs[r_found, 1]),
+                   plan_program, np.array([p[1] for p in plans], dtype=np.int8),
+                   course_index(np.array([p[2] for p in plans], dtype=np.int64)))
+
+    # -----------------------------------------------------------
+    @property
+    def latest(self):
+        """Boolean mask over transcript rows: the latest attempt of each (student, course)."""
+        if self._latest is None:
+            order = np.lexsort((self.t_term, self.t_course, self.t_student))
+            key = self.t_student[order].astype(np.int64) * (len(self.course_codes) + 1) + self.t_course[order]
+            last = np.ones(len(order), dtype=bool)
+            last[:-1] = key[:-1] != key[1:]
+            self._latest = np.zeros(len(order), dtype=bool)
+            self._latest[order] = last
+        return self._latest
+
+    def _grade_mask(self, grades):
+        return np.isin(self.t_grade, [GRADES.index(g) for g in grades])
+
+    def student_gpa(self):
+        """(gpa, graded credits) per student row: the same numbers gpa_engine caches, in one pass."""
+        points = np.zeros(OTHER + 1)
+        points[:len(gpa_engine.GRADE_POINTS)] = list(gpa_engine.GRADE_POINTS.values())
+        credits = np.where(self.t_course >= 0, self.course_credits[np.maximum(self.t_course, 0)], 0)
+        use = self.latest & (self.t_grade < len(gpa_engine.GRADE_POINTS)) & (self.t_course >= 0)
+        n = len(self.student_ids)
+        total_credits = np.bincount(self.t_student[use], weights=credits[use], minlength=n)
+        total_points = np.bincount(self.t_student[use], weights=(points[self.t_grade] * credits)[use], minlength=n)
+        gpa = np.divide(total_points, total_credits, out=np.zeros(n), where=total_credits > 0)
+        return gpa, total_credits
+
+    # -----------------------------------------------------------
+    def grade_histogram(self):
+        """(programs, GRADES + ('other',), counts[program, grade]) over every transcript row."""
+        width = OTHER + 1
+        counts = np.bincount(self.student_program[self.t_student].astype(np.int64) * width + self.t_grade,
+                             minlength=len(self.programs) * width).reshape(len(self.programs), width)
+        return self.programs, GRADES + ("other",), counts
+
+    def gpa_distribution(self, bins=None):
+        """(programs, bin edges, counts[program, bin]) of cumulative GPA, students with graded credits only."""
+        bins = np.linspace(1.0, 5.0, 17) if bins is None else np.asarray(bins)
+        gpa, credits = self.student_gpa()
+        graded = credits > 0
+        which = np.clip(np.digitize(gpa[graded], bins) - 1, 0, len(bins) - 2)
+        nbins = len(bins) - 1
+        counts = np.bincount(self.student_program[graded].astype(np.int64) * nbins + which,
+                             minlength=len(self.programs) * nbins).reshape(len(self.programs), nbins)
+        return self.programs, bins, counts
+
+    def course_rates(self, min_attempts=1):
+        """
+        [(course_code, attempts, pass rate, DFW rate), ...] for every course with
+        at least `min_attempts` graded attempts, highest DFW rate first.
+        """
+        graded = (self.t_course >= 0) & (self.t_grade < len(gpa_engine.GRADE_POINTS))
+        c = self.t_course[graded]
+        n = len(self.course_codes)
+        attempts = np.bincount(c, minlength=n)
+        fails = np.bincount(c[self._grade_mask(FAIL_GRADES)[graded]], minlength=n)
+        dfw = np.bincount(c[self._grade_mask(DFW_GRADES)[graded]], minlength=n)
+        keep = np.flatnonzero(attempts >= max(1, min_attempts))
+        pass_rate = 1 - fails[keep] / attempts[keep]
+        dfw_rate = dfw[keep] / attempts[keep]
+        order = np.lexsort((keep, -dfw_rate))
+        return [(self.course_codes[keep[i]], int(attempts[keep[i]]), float(pass_rate[i]), float(dfw_rate[i]))
+                for i in order]
+
+    def credit_loads(self):
+        """(credits, number of students) for current registrations, students with none included."""
+        loads = np.bincount(self.r_student, weights=self.course_credits[self.r_course],
+                            minlength=len(self.student_ids)).astype(np.int64)
+        counts = np.bincount(loads)
+        nonzero = np.flatnonzero(counts)
+        return nonzero, counts[nonzero]
+
+    def plan_progress(self):
+        """
+        {(program, level): mean share of the program's lower-level plan courses
+        the students have passed}, for levels above 1.
+        """
+        nprog, ncourse = len(self.programs), len(self.course_codes)
+        max_level = int(max(self.student_level.max(initial=0), self.plan_level.max(initial=0))) + 1
+        # plan_level_of[program, course]: the course's plan level in that program (0 = not in the plan)
+        plan_level_of = np.zeros((nprog, ncourse), dtype=np.int8)
+        valid = self.plan_course >= 0
+        plan_level_of[self.plan_program[valid], self.plan_course[valid]] = self.plan_level[valid]
+        # courses_below[program, level]: plan courses of that program below `level`
+        per_level = np.zeros((nprog, max_level + 1), dtype=np.int64)
+        np.add.at(per_level, (self.plan_program[valid], self.plan_level[valid]), 1)
+        courses_below = np.cumsum(per_level, axis=1) - per_level
+
+        passed = self.latest & (self.t_course >= 0) & (self.t_grade < len(gpa_engine.GRADE_POINTS)) \
+            & ~self._grade_mask(FAIL_GRADES)
+        s = self.t_student[passed]
+        lvl = plan_level_of[self.student_program[s], self.t_course[passed]]
+        counted = (lvl > 0) & (lvl < self.student_level[s])
+        done = np.bincount(s[counted], minlength=len(self.student_ids))
+        needed = courses_below[self.student_program, np.clip(self.student_level, 0, max_level)]
+        share = np.divide(done, needed, out=np.zeros(len(done)), where=needed > 0)
+
+        result = {}
+        key = self.student_program.astype(np.int64) * (max_level + 1) + self.student_level
+        use = (self.student_level > 1) & (needed > 0)
+        sums = np.bincount(key[use], weights=share[use], minlength=nprog * (max_level + 1))
+        counts = np.bincount(key[use], minlength=nprog * (max_level + 1))
+        for k in np.flatnonzero(counts):
+            result[(self.programs[k // (max_level + 1)], int(k % (max_level + 1)))] = float(sums[k] / counts[k])
+        return result
+
+
+if __name__ == "__main__":
+    import users_db
+
+    users_db.setup_database()
+    cohort = Cohort.load()
+    print(f"{len(cohort.student_ids)} students, {len(cohort.t_student)} transcript rows, "
+          f"{len(cohort.r_student)} registrations")
+    programs, edges, counts = cohort.gpa_distribution()
+    for program, row in zip(programs, counts):
+        print(f"  {program or '(none)':12s} {int(row.sum()):6d} students with a GPA")
+    print("Highest DFW rates:")
+    for code, attempts, pass_rate, dfw in cohort.course_rates(min_attempts=5)[:10]:
+        print(f"  {code:10s} {attempts:6d} attempts  pass {pass_rate:.0%}  DFW {dfw:.0%}")
@@ -0,0 +1,109 @@
+"""
+Cohort analytics benchmark: per-student Python loops vs analytics.Cohort.
+
+Seeds a faculty with seed_data (100k students by default), then times:
+  - loop:    the way a cohort question is answered today, one transcript query
+             and a Python loop per student (GPA distribution + per-course DFW)
+  - load:    analytics.Cohort.load() (every table read once into arrays)
+  - each vectorized aggregate on the loaded arrays
+and checks the vectorized GPAs against gpa_engine's cached ones and the
+DFW rates against the loop.
+
+Run from the project folder:
+    python -m benchmarks.bench_analytics --students 100000 --sections 2000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import analytics
+import db_connection
+import gpa_engine
+import seed_data
+import users_db
+
+
+def loop_baseline(con):
+    """GPA histogram per program and DFW rate per course with plain per-student loops."""
+    credits = dict(con.execute("SELECT course_code, credits FROM courses"))
+    gpa_hist = {}
+    attempts, dfw = {}, {}
+    for sid, program in con.execute("SELECT id, program FROM students").fetchall():
+        latest = {}
+        for code, term, grade in con.execute(
+                "SELECT course_code, term, grade FROM transcripts WHERE student_id=? ORDER BY term", (sid,)):
+            latest[code] = grade
+            if grade in gpa_engine.GRADE_POINTS and code in credits:
+                attempts[code] = attempts.get(code, 0) + 1
+                if grade in analytics.DFW_GRADES:
+                    dfw[code] = dfw.get(code, 0) + 1
+        pts = creds = 0
+        for code, grade in latest.items():
+            if grade in gpa_engine.GRADE_POINTS and credits.get(code):
+                pts += gpa_engine.GRADE_POINTS[grade] * credits[code]
+                creds += credits[code]
+        if creds:
+            bucket = min(15, int((pts / creds - 1.0) / 0.25))
+            gpa_hist[(program, bucket)] = gpa_hist.get((program, bucket), 0) + 1
+    return gpa_hist, {code: dfw.get(code, 0) / n for code, n in attempts.items()}
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, round(time.perf_counter() - started, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--sections", type=int, default=2000)
+    parser.add_argument("--skip-loop", action="store_true", help="only time the vectorized module")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    if not analytics.NUMPY_AVAILABLE:
+        sys.exit("numpy is not installed: pip install numpy")
+
+    seconds = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_connection.configure(db_path=os.path.join(tmp, "analytics.db"))
+        users_db.setup_database()
+        seed_data.seed(args.students, args.sections, seed_value=3)
+        con = db_connection.get_connection()
+        # A registration day's worth of seats, so credit loads have something to show
+        con.execute("""INSERT OR IGNORE INTO registration (student_id, course_code)
+                       SELECT s.id, p.course_code FROM students s
+                       JOIN program_plans p ON p.program = s.program AND p.level = s.level
+                       WHERE (s.id + length(p.course_code)) % 17 = 0""")
+        con.commit()
+
+        if not args.skip_loop:
+            (_, loop_dfw), seconds["loop"] = timed(loop_baseline, con)
+        cohort, seconds["load"] = timed(analytics.Cohort.load, con)
+        for name in ("student_gpa", "grade_histogram", "gpa_distribution", "course_rates",
+                     "credit_loads", "plan_progress"):
+            _, seconds[name] = timed(getattr(cohort, name))
+        gpa, _ = cohort.student_gpa()
+        cached = dict(con.execute("SELECT student_id, points / credits FROM student_gpa WHERE credits > 0"))
+        mismatches = sum(1 for sid, g in zip(cohort.student_ids.tolist(), gpa.tolist())
+                         if sid in cached and abs(cached[sid] - g) > 1e-9)
+        if not args.skip_loop:
+            rates = {code: dfw for code, _, _, dfw in cohort.course_rates()}
+            mismatches += sum(1 for code, dfw in loop_dfw.items() if abs(rates.get(code, -1) - dfw) > 1e-9)
+        rows = len(cohort.t_student)
+        db_connection.close_connection()
+
+    report = {"students": args.students, "transcript_rows": rows, "mismatches": mismatches, "seconds": seconds}
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{args.students} students, {rows} transcript rows, {mismatches} mismatches vs gpa_engine / loop")
+    for name, s in seconds.items():
+        print(f"  {name:17s} {s:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Memory / lookup benchmark: dict-of-dicts courses_data vs the compact Catalog.
+
+Builds a synthetic faculty-wide catalog (tens of thousands of sections with a
+few prerequisites each) both ways and reports the memory each one holds
+(tracemalloc) and the time to sum credits over every course.
+
+Run from the project folder:
+    python -m benchmarks.bench_catalog --sections 50000
+"""
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+from catalog import Catalog
+
+DAYS = ["Sun", "Mon", "Tue", "Wed", "Thu", "Sun/Tue", "Mon/Wed"]
+ROOMS = [f"Bldg{b}-{r}" for b in range(1, 30) for r in range(100, 140)]
+
+
+def synthetic_courses(n, seed=1):
+    """Yields (code, dict) rows shaped exactly like users_db.get_all_courses_data()."""
+    rng = random.Random(seed)
+    for i in range(n):
+        day = rng.choice(DAYS)
+        hour = rng.randint(8, 16)
+        start, end = f"{hour:02d}:00", f"{hour:02d}:50"
+        yield f"C{i:06d}", {
+            "name": f"Course {i}",
+            "credits": rng.choice((1, 2, 3, 4)),
+            "max_capacity": rng.choice((25, 30, 40, 60)),
+            "day": day,
+            "start_time": start,
+            "end_time": end,
+            "room": rng.choice(ROOMS),
+            "schedule": [(day, start, end)],
+            "prerequisites": [f"C{rng.randrange(max(i, 1)):06d}" for _ in range(rng.randint(0, 3))] if i else [],
+        }
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    obj = build()
+    build_s = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    total = sum(obj[code]["credits"] for code in obj)
+    scan_s = time.perf_counter() - started
+    return obj, {"bytes": current, "build_s": round(build_s, 3), "scan_s": round(scan_s, 3), "credits": total}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sections", type=int, default=50000)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = {}
+    as_dict, results["dict"] = measure(lambda: dict(synthetic_courses(args.sections)))
+    del as_dict
+    as_catalog, results["catalog"] = measure(lambda: Catalog(synthetic_courses(args.sections)))
+    # Same sum straight off the credits column, without building CourseViews
+    started = time.perf_counter()
+    as_catalog.total_credits(as_catalog)
+    results["catalog"]["column_scan_s"] = round(time.perf_counter() - started, 3)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, r in results.items():
+        print(f"{name:8s} {r['bytes'] / 1e6:8.1f} MB   build {r['build_s']:.3f}s   "
+              f"scan {r['scan_s']:.3f}s   ({args.sections} sections)")
+    print(f"Catalog uses {results['catalog']['bytes'] / results['dict']['bytes']:.0%} of the dict's memory.")
+
+
+if __name__ == "__main__":
+    main()
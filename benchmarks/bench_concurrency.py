@@ -0,0 +1,150 @@
+"""
+Reader / writer concurrency benchmark for the database performance profiles.
+
+Many simulated students hammer the registration and waitlist tables (writers)
+while dashboard-style readers keep refreshing. Each profile runs on its own
+throw-away copy of the schema, plus a rollback-journal baseline for comparison.
+
+Run from the project folder:
+    python -m benchmarks.bench_concurrency --seconds 5 --readers 8 --writers 8
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+import db_connection
+import users_db
+
+BASELINE = "rollback-journal"
+
+
+def seed(num_courses, capacity):
+    """Creates `num_courses` small sections so the waitlist fills up quickly."""
+    con = db_connection.get_connection()
+    with con:
+        con.executemany(
+            "INSERT INTO courses (course_code, course_name, credits, day, start_time, end_time, room, max_capacity) "
+            "VALUES (?, ?, 3, 'Sun', '08:00', '09:20', 'R1', ?)",
+            [(f"BEN{i:03d}", f"Bench Course {i}", capacity) for i in range(num_courses)]
+        )
+
+
+def writer(student_ids, course_codes, capacity, stop, stats):
+    rng = random.Random()
+    con = db_connection.get_connection()
+    while not stop.is_set():
+        sid = rng.choice(student_ids)
+        code = rng.choice(course_codes)
+        t0 = time.perf_counter()
+        try:
+            if rng.random() < 0.2:
+                users_db.drop_course_for_student(sid, code)
+            else:
+                enrolled = con.execute("SELECT COUNT(*) FROM registration WHERE course_code=?", (code,)).fetchone()[0]
+                if enrolled < capacity:
+                    users_db.register_course_for_student(sid, code)
+                else:
+                    users_db.add_to_waitlist(sid, code)
+            stats["writes"] += 1
+            stats["write_time"] += time.perf_counter() - t0
+        except sqlite3.IntegrityError:
+            stats["writes"] += 1      # already registered: still a completed round-trip
+        except sqlite3.OperationalError:
+            stats["locked"] += 1
+    db_connection.close_connection()
+
+
+def reader(student_ids, stop, stats):
+    rng = random.Random()
+    con = db_connection.get_connection()
+    while not stop.is_set():
+        sid = rng.choice(student_ids)
+        t0 = time.perf_counter()
+        try:
+            # Roughly what one StudentDashboard.refresh_ui does
+            users_db.get_registered_courses(sid)
+            users_db.get_current_enrollments()
+            con.execute("SELECT course_code, timestamp FROM waitlist WHERE student_id=?", (sid,)).fetchall()
+            stats["reads"] += 1
+            stats["read_time"] += time.perf_counter() - t0
+        except sqlite3.OperationalError:
+            stats["locked"] += 1
+    db_connection.close_connection()
+
+
+def run_profile(name, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        if name == BASELINE:
+            db_connection.configure(db_path=os.path.join(tmp, "bench.db"), profile="safe",
+                                    pragmas={"journal_mode": "DELETE"})
+        else:
+            db_connection.configure(db_path=os.path.join(tmp, "bench.db"), profile=name)
+        users_db.setup_database()
+        seed(args.courses, args.capacity)
+        db_connection.close_connection()
+
+        student_ids = list(range(2400000, 2400000 + args.students))
+        course_codes = [f"BEN{i:03d}" for i in range(args.courses)]
+        stop = threading.Event()
+        thread_stats = []
+        threads = []
+        for _ in range(args.writers):
+            st = {"writes": 0, "write_time": 0.0, "locked": 0}
+            thread_stats.append(st)
+            threads.append(threading.Thread(target=writer, args=(student_ids, course_codes, args.capacity, stop, st)))
+        for _ in range(args.readers):
+            st = {"reads": 0, "read_time": 0.0, "locked": 0}
+            thread_stats.append(st)
+            threads.append(threading.Thread(target=reader, args=(student_ids, stop, st)))
+
+        for t in threads:
+            t.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+
+    reads = sum(s.get("reads", 0) for s in thread_stats)
+    writes = sum(s.get("writes", 0) for s in thread_stats)
+    read_time = sum(s.get("read_time", 0.0) for s in thread_stats)
+    write_time = sum(s.get("write_time", 0.0) for s in thread_stats)
+    return {
+        "profile": name,
+        "reads_per_sec": round(reads / args.seconds, 1),
+        "writes_per_sec": round(writes / args.seconds, 1),
+        "avg_read_ms": round(1000 * read_time / reads, 3) if reads else None,
+        "avg_write_ms": round(1000 * write_time / writes, 3) if writes else None,
+        "locked_errors": sum(s["locked"] for s in thread_stats),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", nargs="+", default=[BASELINE] + list(db_connection.PROFILES))
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--courses", type=int, default=40)
+    parser.add_argument("--capacity", type=int, default=10)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = [run_profile(name, args) for name in args.profiles]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'profile':<18}{'reads/s':>10}{'writes/s':>10}{'read ms':>10}{'write ms':>10}{'locked':>8}")
+    for r in results:
+        print(f"{r['profile']:<18}{r['reads_per_sec']:>10}{r['writes_per_sec']:>10}"
+              f"{r['avg_read_ms']!s:>10}{r['avg_write_ms']!s:>10}{r['locked_errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Refresh-cost benchmark: trigger-maintained counters vs GROUP BY over registration.
+
+For each size, fills a throw-away database with that many registrations (plus
+a waitlist) and times the dashboard refresh queries both ways:
+  - old: GROUP BY over registration / LEFT JOIN + GROUP BY for the admin chart
+  - new: read course_enrollment (what get_current_enrollments() now does)
+The counter reads should stay flat while the GROUP BY grows with the table.
+
+Run from the project folder:
+    python -m benchmarks.bench_counters --sizes 10000 100000 300000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import db_connection
+import users_db
+
+OLD_QUERIES = {
+    "enrollments": "SELECT course_code, COUNT(student_id) FROM registration GROUP BY course_code",
+    "admin_chart": """SELECT c.course_code, COUNT(r.student_id), c.max_capacity
+                      FROM courses c LEFT JOIN registration r ON c.course_code = r.course_code
+                      GROUP BY c.course_code ORDER BY c.course_code""",
+}
+NEW_QUERIES = {
+    "enrollments": "SELECT course_code, enrolled FROM course_enrollment WHERE enrolled > 0",
+    "admin_chart": """SELECT c.course_code, COALESCE(e.enrolled, 0), c.max_capacity
+                      FROM courses c LEFT JOIN course_enrollment e ON c.course_code = e.course_code
+                      ORDER BY c.course_code""",
+}
+
+
+def seed(registrations, courses):
+    rng = random.Random(registrations)
+    con = db_connection.get_connection()
+    codes = [f"CNT{i:04d}" for i in range(courses)]
+    with con:
+        con.executemany(
+            "INSERT INTO courses (course_code, course_name, credits, day, start_time, end_time, room, max_capacity) "
+            "VALUES (?, 'Counter bench', 3, 'Sun', '08:00', '08:50', 'R1', 1000000)",
+            [(c,) for c in codes])
+        # Registrations go through the triggers, exactly like real sign-ups
+        con.executemany("INSERT OR IGNORE INTO registration (student_id, course_code) VALUES (?, ?)",
+                        ((rng.randrange(registrations), rng.choice(codes)) for _ in range(registrations)))
+        con.executemany("INSERT OR IGNORE INTO waitlist (student_id, course_code) VALUES (?, ?)",
+                        ((rng.randrange(registrations), rng.choice(codes)) for _ in range(registrations // 10)))
+
+
+def time_query(con, sql, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        con.execute(sql).fetchall()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 300000])
+    parser.add_argument("--courses", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_connection.configure(db_path=os.path.join(tmp, "counters.db"))
+            users_db.setup_database()
+            started = time.perf_counter()
+            seed(size, args.courses)
+            seed_s = time.perf_counter() - started
+            con = db_connection.get_connection()
+            row = {"registrations": size, "seed_s": round(seed_s, 2)}
+            for name in OLD_QUERIES:
+                row[f"{name}_group_by_ms"] = round(time_query(con, OLD_QUERIES[name], args.repeat), 3)
+                row[f"{name}_counter_ms"] = round(time_query(con, NEW_QUERIES[name], args.repeat), 3)
+            started = time.perf_counter()
+            row["repaired"] = len(users_db.rebuild_enrollment_counters())
+            row["rebuild_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            db_connection.close_connection()
+        results.append(row)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'registrations':>13} {'GROUP BY ms':>12} {'counter ms':>11} {'chart old':>10} {'chart new':>10} {'rebuild ms':>11}")
+    for r in results:
+        print(f"{r['registrations']:>13} {r['enrollments_group_by_ms']:>12.3f} {r['enrollments_counter_ms']:>11.3f} "
+              f"{r['admin_chart_group_by_ms']:>10.3f} {r['admin_chart_counter_ms']:>10.3f} {r['rebuild_ms']:>11.1f}")
+    if any(r["repaired"] for r in results):
+        print("WARNING: the counters had drifted from the registration / waitlist rows.")
+
+
+if __name__ == "__main__":
+    main()
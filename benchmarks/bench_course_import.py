@@ -0,0 +1,115 @@
+"""
+Course CSV import benchmark: the old per-row add_course() loop vs course_importer.
+
+Writes a faculty catalog CSV (with a prerequisites column and a sprinkling of
+bad rows), then imports it two ways, each into its own fresh database:
+  - per-row:   Admin.add_course() for every row (exists check + insert + commit each)
+  - streaming: course_importer.import_courses() (chunked validation, one transaction)
+Checks that both produce the same row-level error list and reports rows/s.
+
+Run from the project folder:
+    python -m benchmarks.bench_course_import --rows 50000
+    python -m benchmarks.bench_course_import --rows 50000 --skip-per-row
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import tempfile
+import time
+
+import course_importer
+import db_connection
+import users_db
+
+DAYS = ["Sun", "Mon", "Tue", "Wed", "Thu"]
+
+
+def write_catalog(path, rows, bad_every=500):
+    rng = random.Random(3)
+    with open(path, "w", newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["course_code", "course_name", "credits", "day", "start_time", "end_time",
+                         "room", "max_capacity", "prerequisites"])
+        for i in range(rows):
+            code = f"IMP{i:06d}"
+            prereqs = f"IMP{rng.randrange(i):06d}" if i and rng.random() < 0.5 else ""
+            row = [code, f"Imported course {i}", rng.choice((2, 3, 4)), rng.choice(DAYS),
+                   "08:00", "08:50", f"R{i % 300}", 40, prereqs]
+            if bad_every and i % bad_every == 1:
+                row[2] = rng.choice(("0", "x", "-3"))
+            elif bad_every and i % bad_every == 2:
+                row[0] = f"IMP{i - 2:06d}"  # duplicate code
+            writer.writerow(row)
+
+
+def run_per_row(path):
+    """The old Admin.import_courses_from_csv loop, kept here as the baseline."""
+    from Admin import Admin
+    admin = Admin(1, "Bench", "", "")
+    added, errors = 0, []
+    with open(path, newline='', encoding='utf-8') as csvfile:
+        reader = csv.reader(csvfile)
+        next(reader, None)
+        for row_num, row in enumerate(reader, start=1):
+            if len(row) < 8:
+                errors.append(f"Row {row_num}: Incomplete data.")
+                continue
+            code, name, credits, day, start, end, room, cap = row[0:8]
+            try:
+                ok, msg = admin.add_course(code.strip(), name.strip(), int(credits), day.strip(), str(start).strip(),
+                                           str(end).strip(), room.strip(), int(cap), [])
+                if ok: added += 1
+                else: errors.append(f"Row {row_num} ({code}): {msg}")
+            except Exception as e: errors.append(f"Row {row_num}: {str(e)}")
+    return added, errors
+
+
+def run_streaming(path):
+    result = course_importer.import_courses(path)
+    return result.added, result.errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--skip-per-row", action="store_true", help="only time the streaming importer")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    runs = [("streaming", run_streaming)]
+    if not args.skip_per_row:
+        runs.insert(0, ("per-row", run_per_row))
+    results = {}
+    outcomes = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalog.csv")
+        write_catalog(path, args.rows)
+        for name, run in runs:
+            db_connection.configure(db_path=os.path.join(tmp, f"{name}.db"))
+            users_db.setup_database()
+            started = time.perf_counter()
+            added, errors = run(path)
+            elapsed = time.perf_counter() - started
+            db_connection.close_connection()
+            outcomes[name] = (added, errors)
+            results[name] = {"rows": args.rows, "added": added, "errors": len(errors),
+                             "seconds": round(elapsed, 3),
+                             "rows_per_s": round(args.rows / elapsed, 1) if elapsed else None}
+
+    if len(outcomes) == 2:
+        results["same_errors"] = outcomes["per-row"] == outcomes["streaming"]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, r in results.items():
+        if isinstance(r, dict):
+            print(f"{name:10s} {r['rows']} rows -> {r['added']} added, {r['errors']} errors "
+                  f"in {r['seconds']:.3f}s ({r['rows_per_s']} rows/s)")
+    if "same_errors" in results:
+        print("error lists match" if results["same_errors"] else "ERROR LISTS DIFFER")
+
+
+if __name__ == "__main__":
+    main()
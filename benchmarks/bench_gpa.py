@@ -0,0 +1,97 @@
+"""
+GPA benchmark: the old per-refresh scan vs the cached aggregates.
+
+Seeds students with transcripts (seed_data), then times:
+  - scan:      the old OverviewTab loop (every grade row scans the whole catalog)
+  - cached:    gpa_engine.get_gpa() (one primary-key lookup)
+  - recompute: gpa_engine.recompute_all() over every student (dean's list / probation run)
+  - grades:    users_db.upsert_grades() for one grade per student, GPA kept current in the same transaction
+and checks both GPA paths agree.
+
+Run from the project folder:
+    python -m benchmarks.bench_gpa --students 100000 --sections 2000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import db_connection
+import gpa_engine
+import seed_data
+import users_db
+
+
+def scan_gpa(con, courses_data, student_id):
+    """The old OverviewTab.refresh computation, kept here as the baseline."""
+    rows = con.execute("SELECT course_code, grade FROM transcripts WHERE student_id = ? AND grade != 'IP'",
+                       (student_id,)).fetchall()
+    pts = 0; creds = 0
+    for code, grade in rows:
+        if grade.upper() in gpa_engine.GRADE_POINTS:
+            c_cred = 0
+            for db_code, data in courses_data.items():
+                if str(db_code).replace(" ", "").upper() == str(code).replace(" ", "").upper():
+                    c_cred = data.get('credits', 0); break
+            if c_cred: pts += gpa_engine.GRADE_POINTS[grade.upper()] * c_cred; creds += c_cred
+    return pts / creds if creds > 0 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--sections", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=200, help="students timed with each lookup path")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_connection.configure(db_path=os.path.join(tmp, "gpa.db"))
+        users_db.setup_database()
+        seeded = seed_data.seed(args.students, args.sections, seed_value=9)
+        con = db_connection.get_connection()
+        ids = [row[0] for row in seeded["student_rows"]]
+        sample = random.Random(4).sample(ids, min(args.lookups, len(ids)))
+        courses_data = users_db.get_all_courses_data()
+
+        started = time.perf_counter()
+        scanned = [scan_gpa(con, courses_data, sid) for sid in sample]
+        results["scan"] = time.perf_counter() - started
+        started = time.perf_counter()
+        cached = [gpa_engine.get_gpa(sid)[0] for sid in sample]
+        results["cached"] = time.perf_counter() - started
+        mismatches = sum(1 for a, b in zip(scanned, cached) if abs(a - b) > 1e-9)
+
+        started = time.perf_counter()
+        students = gpa_engine.recompute_all()
+        results["recompute"] = time.perf_counter() - started
+
+        rng = random.Random(5)
+        codes = list(courses_data)
+        rows = [(sid, rng.choice(codes), users_db.CURRENT_TERM, rng.choice(seed_data.GRADES)) for sid in ids]
+        started = time.perf_counter()
+        users_db.upsert_grades(rows)
+        results["grades"] = time.perf_counter() - started
+        db_connection.close_connection()
+
+    report = {
+        "students": len(ids), "graded_students": students, "lookups": len(sample), "mismatches": mismatches,
+        "scan_ms_per_student": round(results["scan"] / len(sample) * 1000, 3),
+        "cached_ms_per_student": round(results["cached"] / len(sample) * 1000, 4),
+        "recompute_all_s": round(results["recompute"], 3),
+        "upsert_with_gpa_rows_per_s": round(len(rows) / results["grades"], 1),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"scan     {report['scan_ms_per_student']} ms/student")
+    print(f"cached   {report['cached_ms_per_student']} ms/student ({mismatches} mismatches)")
+    print(f"recompute_all  {students} students in {report['recompute_all_s']}s")
+    print(f"upsert_grades  {len(rows)} grades + GPA upkeep at {report['upsert_with_gpa_rows_per_s']} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+End-of-term grade benchmark: import and export throughput.
+
+Seeds students and a catalog with seed_data, writes a grade sheet with one
+grade per student per course of their level, then:
+  - per-row:  the old dashboard loop (SELECT, then UPDATE or INSERT, per grade)
+  - bulk:     grade_pipeline.import_grades() (batched ON CONFLICT upserts, one transaction)
+  - export:   grade_pipeline.export_transcripts() to csv / json / jsonl
+Each import runs on its own copy of the same database.
+
+Run from the project folder:
+    python -m benchmarks.bench_grades --students 20000 --sections 400
+    python -m benchmarks.bench_grades --students 100000 --skip-per-row
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import db_connection
+import grade_pipeline
+import seed_data
+import users_db
+
+
+def write_sheet(path, con, per_student):
+    rng = random.Random(11)
+    plans = {}
+    for program, level, code in con.execute("SELECT program, level, course_code FROM program_plans"):
+        plans.setdefault((program, level), []).append(code)
+    rows = 0
+    with open(path, "w", newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["student_id", "course_code", "grade"])
+        for sid, program, level in con.execute("SELECT id, program, level FROM students"):
+            codes = plans.get((program, level), [])
+            for code in rng.sample(codes, min(per_student, len(codes))):
+                writer.writerow([sid, code, rng.choice(seed_data.GRADES)])
+                rows += 1
+    return rows
+
+
+def run_per_row(path):
+    """The old handle_save_grades loop, one statement pair per grade, kept here as the baseline."""
+    term = users_db.CURRENT_TERM
+    saved = 0
+    with db_connection.get_connection() as con:
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for sid, cc, gr in reader:
+                sid = int(sid)
+                if con.execute("SELECT 1 FROM transcripts WHERE student_id=? AND course_code=? AND term=?",
+                               (sid, cc, term)).fetchone():
+                    con.execute("UPDATE transcripts SET grade=? WHERE student_id=? AND course_code=? AND term=?",
+                                (gr, sid, cc, term))
+                else:
+                    con.execute("INSERT INTO transcripts (student_id, course_code, term, grade) VALUES (?,?,?,?)",
+                                (sid, cc, term, gr))
+                saved += 1
+    return saved
+
+
+def run_bulk(path):
+    return grade_pipeline.import_grades(path).saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--sections", type=int, default=400)
+    parser.add_argument("--per-student", type=int, default=5, help="grades per student on the sheet")
+    parser.add_argument("--skip-per-row", action="store_true", help="only time the bulk pipeline")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        base = os.path.join(tmp, "base.db")
+        db_connection.configure(db_path=base)
+        users_db.setup_database()
+        seed_data.seed(args.students, args.sections, seed_value=5)
+        sheet = os.path.join(tmp, "grades.csv")
+        rows = write_sheet(sheet, db_connection.get_connection(), args.per_student)
+        db_connection.close_connection()
+
+        runs = [("bulk", run_bulk)] if args.skip_per_row else [("per-row", run_per_row), ("bulk", run_bulk)]
+        for name, run in runs:
+            path = os.path.join(tmp, f"{name}.db")
+            shutil.copy(base, path)
+            db_connection.configure(db_path=path)
+            started = time.perf_counter()
+            saved = run(sheet)
+            elapsed = time.perf_counter() - started
+            results[f"import {name}"] = {"rows": rows, "saved": saved, "seconds": round(elapsed, 3),
+                                         "rows_per_s": round(rows / elapsed, 1) if elapsed else None}
+            if name == "bulk":
+                for fmt in ("csv", "json", "jsonl"):
+                    started = time.perf_counter()
+                    n = grade_pipeline.export_transcripts(os.path.join(tmp, f"out.{fmt}"))
+                    elapsed = time.perf_counter() - started
+                    results[f"export {fmt}"] = {"rows": n, "saved": n, "seconds": round(elapsed, 3),
+                                                "rows_per_s": round(n / elapsed, 1) if elapsed else None}
+            db_connection.close_connection()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, r in results.items():
+        print(f"{name:14s} {r['rows']} rows in {r['seconds']:.3f}s ({r['rows_per_s']} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
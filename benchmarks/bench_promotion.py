@@ -0,0 +1,110 @@
+"""
+Drop-storm benchmark: one-by-one waitlist promotion vs the batched engine.
+
+Seeds full sections with long waitlists, then drops a random set of
+registrations and fills the freed seats two ways, each on its own copy of
+the same database:
+  - single: users_db.drop_course_and_promote() once per drop (one transaction each)
+  - batch:  RegistrationSystem.drop_courses() (all drops + promotions, one transaction,
+            every candidate re-validated)
+Reports wall time and promotions per second.
+
+Run from the project folder:
+    python -m benchmarks.bench_promotion --courses 200 --capacity 40 --drops 2000
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import db_connection
+import users_db
+
+PROGRAM = "Computer"
+
+
+def seed(courses, capacity, waitlist):
+    con = db_connection.get_connection()
+    codes = [f"PRM{i:04d}" for i in range(courses)]
+    with con:
+        con.executemany(
+            "INSERT INTO courses (course_code, course_name, credits, day, start_time, end_time, room, max_capacity) "
+            "VALUES (?, 'Promotion bench', 3, ?, ?, ?, 'R1', ?)",
+            [(code, ["Sun", "Mon", "Tue", "Wed", "Thu"][i % 5],
+              f"{8 + (i // 5) % 10:02d}:00", f"{8 + (i // 5) % 10:02d}:50", capacity)
+             for i, code in enumerate(codes)])
+        con.executemany("INSERT INTO program_plans VALUES (?, 1, ?)", [(PROGRAM, c) for c in codes])
+        total = courses * (capacity + waitlist)
+        con.executemany("INSERT INTO students (id, name, email, program, level) VALUES (?, 'Bench', '', ?, 1)",
+                        [(sid, PROGRAM) for sid in range(1, total + 1)])
+        sid = 1
+        for code in codes:
+            con.executemany("INSERT INTO registration (student_id, course_code) VALUES (?, ?)",
+                            [(s, code) for s in range(sid, sid + capacity)])
+            sid += capacity
+            con.executemany("INSERT INTO waitlist (student_id, course_code) VALUES (?, ?)",
+                            [(s, code) for s in range(sid, sid + waitlist)])
+            sid += waitlist
+    return codes
+
+
+def run_single(drops):
+    promoted = 0
+    for student_id, code in drops:
+        if users_db.drop_course_and_promote(student_id, code) is not None:
+            promoted += 1
+    return promoted, 0
+
+
+def run_batch(drops):
+    from registration_system import RegistrationSystem
+    system = RegistrationSystem()
+    _, result = system.drop_courses(drops)
+    return len(result.promoted), len(result.skipped)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--courses", type=int, default=200)
+    parser.add_argument("--capacity", type=int, default=40)
+    parser.add_argument("--waitlist", type=int, default=20, help="waiting students per course")
+    parser.add_argument("--drops", type=int, default=2000)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        base = os.path.join(tmp, "base.db")
+        db_connection.configure(db_path=base)
+        users_db.setup_database()
+        seed(args.courses, args.capacity, args.waitlist)
+        registrations = db_connection.get_connection().execute(
+            "SELECT student_id, course_code FROM registration").fetchall()
+        db_connection.close_connection()
+        drops = random.Random(7).sample(registrations, min(args.drops, len(registrations)))
+
+        for name, run in (("single", run_single), ("batch", run_batch)):
+            path = os.path.join(tmp, f"{name}.db")
+            shutil.copy(base, path)
+            db_connection.configure(db_path=path)
+            started = time.perf_counter()
+            promoted, skipped = run(drops)
+            elapsed = time.perf_counter() - started
+            db_connection.close_connection()
+            results[name] = {"drops": len(drops), "promoted": promoted, "skipped": skipped,
+                             "seconds": round(elapsed, 3),
+                             "promotions_per_s": round(promoted / elapsed, 1) if elapsed else None}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, r in results.items():
+        print(f"{name:7s} {r['drops']} drops -> {r['promoted']} promoted, {r['skipped']} skipped "
+              f"in {r['seconds']:.3f}s ({r['promotions_per_s']} promotions/s)")
+
+
+if __name__ == "__main__":
+    main()
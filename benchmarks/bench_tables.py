@@ -0,0 +1,73 @@
+"""
+Table population benchmark: QTableWidgetItem per cell vs RowTableModel.
+
+Builds a roster of synthetic student rows and times, offscreen:
+  - widget: the old load_students loop (insertRow + setItem(QTableWidgetItem) per cell)
+  - model:  RowTableModel.set_rows() behind a QTableView (first page only, cells rendered on paint)
+  - sort / filter: a header-click sort and a search over every row through SortFilterProxy
+
+Run from the project folder:
+    python -m benchmarks.bench_tables --rows 50000
+"""
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+
+from table_models import RowTableModel, make_table_view
+
+PROGRAMS = ("Computer", "Communications", "Power", "Biomedical")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    app = QApplication([])
+    rows = [(2400000 + i, f"Student {i}", f"s{i}@stu.kau.edu.sa", PROGRAMS[i % 4], i % 10 + 1)
+            for i in range(args.rows)]
+    seconds = {}
+
+    table = QTableWidget()
+    table.setColumnCount(5)
+    started = time.perf_counter()
+    for r, rd in enumerate(rows):
+        table.insertRow(r)
+        for c, d in enumerate(rd): table.setItem(r, c, QTableWidgetItem(str(d)))
+    seconds["widget"] = time.perf_counter() - started
+
+    model = RowTableModel(["ID", "Name", "Email", "Program", "Level"])
+    view = make_table_view(model)
+    view.resize(1000, 600)
+    started = time.perf_counter()
+    model.set_rows(rows)
+    view.show()
+    app.processEvents()
+    seconds["model"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    view.sortByColumn(1, Qt.DescendingOrder)
+    seconds["sort"] = time.perf_counter() - started
+    started = time.perf_counter()
+    view.model().set_filter("student 4999")
+    seconds["filter"] = time.perf_counter() - started
+    matches = view.model().rowCount()
+
+    report = {"rows": args.rows, "filter_matches": matches, "seconds": {k: round(v, 4) for k, v in seconds.items()}}
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{args.rows} rows")
+    for name, s in report["seconds"].items():
+        print(f"  {name:7s} {s:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Registration-day load simulator.
+
+Seeds a realistic faculty with seed_data (thousands of sections spread over programs
+and levels, prerequisite chains, program plans, tens of thousands of students
+with full transcripts), then replays registration-day traffic against
+RegistrationSystem from many concurrent worker processes:
+    register  - a student picks 1-3 of the popular courses they are eligible for
+    drop      - a student drops one of their courses (waitlist gets promoted)
+    leave     - a student leaves one of their waitlists
+    view      - a student refreshes their schedule / waitlist positions
+Every worker owns a slice of the students and tracks their registered and
+waitlisted (student, course) pairs, so drops and leaves hit real rows. Sections
+are shrunk to --capacity seats and demand is skewed to the first --hot eligible
+courses of each plan, so sections fill, waitlists form and drops promote.
+
+Latency is recorded per operation only for operations that wrote (views, and
+registrations rejected by validation, get their own buckets); attempts that
+found nothing to change are counted under "noops". At the end every course is
+checked for overbooking and the counters for drift. Results (p50/p95/p99
+latency per operation, throughput, violations) are printed as JSON; the exit
+status is 1 if any violation was found or a waitlist path (waitlisted, left,
+promoted) never ran.
+
+Run from the project folder:
+    python -m benchmarks.load_simulator --students 20000 --sections 2000 --workers 8 --ops 500
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+import db_connection
+import seed_data
+import users_db
+
+MIX = (("register", 0.55), ("drop", 0.15), ("leave", 0.05), ("view", 0.25))
+
+# Outcomes that must be nonzero, or the run never exercised the waitlist
+REQUIRED_OUTCOMES = ("waitlisted", "left", "promoted")
+
+
+# ==========================================
+#  TRAFFIC
+# ==========================================
+def worker(db_path, seed_value, ops, hot, my_ids, result_queue):
+    # Imported here so each process builds its own connection and catalog
+    from registration_system import RegistrationSystem
+    from Student import Student
+
+    db_connection.configure(db_path=db_path)
+    rng = random.Random(seed_value)
+    system = RegistrationSystem()
+    mine = set(my_ids)
+    students = {sid: (program, level) for sid, program, level in
+                db_connection.get_connection().execute("SELECT id, program, level FROM students")
+                if sid in mine}
+    names = [name for name, _ in MIX]
+    weights = [w for _, w in MIX]
+    latencies = {name: [] for name in names}
+    latencies["register_rejected"] = []
+    noops = {name: 0 for name in ("register", "drop", "leave")}
+    errors = {}
+    outcomes = {"registered": 0, "waitlisted": 0, "rejected": 0, "dropped": 0, "left": 0, "promoted": 0}
+
+    # This worker's view of its students' seats; re-read from the database whenever it turns out stale
+    registered = {}     # sid -> set of course codes
+    waiting = {}        # sid -> set of course codes
+    wanted = {}         # sid -> popular plan courses the student is eligible for
+
+    def sync(sid):
+        registered[sid] = set(users_db.get_registered_courses(sid))
+        waiting[sid] = {row[0] for row in users_db.get_waitlist_positions(sid)}
+
+    def pick_pair(holdings):
+        sid = rng.choice([s for s, codes in holdings.items() if codes])
+        return sid, rng.choice(sorted(holdings[sid]))
+
+    ids = sorted(students)
+    for _ in range(ops):
+        op = rng.choices(names, weights)[0]
+        # Only target pairs that exist; with nothing to drop / leave yet, register instead
+        if op == "drop" and not any(registered.values()):
+            op = "register"
+        elif op == "leave" and not any(waiting.values()):
+            op = "register"
+        if op in ("register", "view"):
+            sid = rng.choice(ids)
+        else:
+            sid, code = pick_pair(registered if op == "drop" else waiting)
+        program, level = students[sid]
+        student = Student(sid, "Sim", "", program, level, "")
+        if sid not in registered:
+            sync(sid)
+        bucket = op
+        started = time.perf_counter()
+        try:
+            if op == "register":
+                if sid not in wanted:
+                    plan = system.program_plan.get(program, {}).get(level, [])
+                    eligible = system.prereqs.eligible(users_db.get_completed_courses(sid), plan)
+                    wanted[sid] = [c for c in plan if c in eligible][:hot]
+                choices = [c for c in wanted[sid] if c not in registered[sid] and c not in waiting[sid]]
+                if not choices:
+                    noops[op] += 1
+                    continue
+                ok, msg = system.register_courses_for_student(
+                    student, rng.sample(choices, min(len(choices), rng.randint(1, 3))))
+                if not ok:
+                    outcomes["rejected"] += 1
+                    bucket = "register_rejected"
+                else:
+                    before = len(waiting[sid])
+                    sync(sid)
+                    outcomes["waitlisted" if len(waiting[sid]) > before else "registered"] += 1
+            elif op == "drop":
+                dropped, result = system.drop_courses([(sid, code)])
+                registered[sid].discard(code)
+                for promoted_sid, promoted_code in result.promoted:
+                    if promoted_sid in registered:
+                        registered[promoted_sid].add(promoted_code)
+                        waiting[promoted_sid].discard(promoted_code)
+                outcomes["promoted"] += len(result.promoted)
+                if not dropped:
+                    sync(sid)
+                    noops[op] += 1
+                    continue
+                outcomes["dropped"] += 1
+            elif op == "leave":
+                if not users_db.leave_waitlist(sid, code):
+                    sync(sid)       # promoted by another worker's drop meanwhile
+                    noops[op] += 1
+                    continue
+                waiting[sid].discard(code)
+                outcomes["left"] += 1
+            else:
+                sync(sid)
+        except sqlite3.Error as e:
+            errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+            continue
+        latencies[bucket].append(time.perf_counter() - started)
+    result_queue.put((latencies, errors, outcomes, noops))
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    k = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+def summarize(values):
+    values = sorted(values)
+    return {"count": len(values),
+            "p50_ms": round(percentile(values, 50) * 1000, 3) if values else None,
+            "p95_ms": round(percentile(values, 95) * 1000, 3) if values else None,
+            "p99_ms": round(percentile(values, 99) * 1000, 3) if values else None}
+
+
+def check_violations(con):
+    overbooked = con.execute("""
+        SELECT c.course_code, COUNT(r.student_id), c.max_capacity
+        FROM courses c JOIN registration r ON r.course_code = c.course_code
+        GROUP BY c.course_code
+        HAVING COUNT(r.student_id) > c.max_capacity""").fetchall()
+    both = con.execute("""
+        SELECT COUNT(*) FROM waitlist w
+        JOIN registration r ON r.student_id = w.student_id AND r.course_code = w.course_code""").fetchone()[0]
+    drifted = users_db.rebuild_enrollment_counters()
+    return {"overbooked_courses": [list(row) for row in overbooked],
+            "registered_and_waitlisted": both,
+            "counter_drift": [list(row) for row in drifted]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--sections", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8, help="concurrent worker processes")
+    parser.add_argument("--ops", type=int, default=500, help="operations per worker")
+    parser.add_argument("--capacity", type=int, default=20,
+                        help="seats per section, small so sections fill (0 keeps the seeded capacities)")
+    parser.add_argument("--hot", type=int, default=6,
+                        help="each student only asks for the first N plan courses they are eligible for")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--profile", default=None, help="database profile (see db_connection.PROFILES)")
+    parser.add_argument("--out", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "registration_day.db")
+        db_connection.configure(db_path=db_path)
+        users_db.setup_database(profile=args.profile)
+        started = time.perf_counter()
+        dataset = seed_data.seed(args.students, args.sections, args.seed)
+        dataset.pop("student_rows")
+        dataset["seed_s"] = round(time.perf_counter() - started, 2)
+        if args.capacity:
+            with db_connection.transaction(immediate=True) as con:
+                con.execute("UPDATE courses SET max_capacity = ?", (args.capacity,))
+        ids = [row[0] for row in db_connection.get_connection().execute("SELECT id FROM students ORDER BY id")]
+        db_connection.close_connection()
+
+        # One student is only ever driven by one worker, like one student at one browser
+        queue = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=worker,
+                                         args=(db_path, args.seed + n, args.ops, args.hot,
+                                               ids[n::args.workers], queue))
+                 for n in range(args.workers)]
+        started = time.perf_counter()
+        for p in procs:
+            p.start()
+        latencies = {}
+        errors = {}
+        outcomes = {}
+        noops = {}
+        for _ in procs:
+            lat, errs, outs, idle = queue.get()
+            for name, n in outs.items():
+                outcomes[name] = outcomes.get(name, 0) + n
+            for name, n in idle.items():
+                noops[name] = noops.get(name, 0) + n
+            for op, values in lat.items():
+                latencies.setdefault(op, []).extend(values)
+            for name, n in errs.items():
+                errors[name] = errors.get(name, 0) + n
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - started
+
+        violations = check_violations(db_connection.get_connection())
+        db_connection.close_connection()
+
+    all_values = [v for values in latencies.values() for v in values]
+    report = {
+        "config": vars(args),
+        "dataset": dataset,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_ops_per_s": round(len(all_values) / elapsed, 1) if elapsed else None,
+        "latency": dict({"all": summarize(all_values)}, **{op: summarize(v) for op, v in latencies.items()}),
+        "outcomes": outcomes,
+        "noops": noops,
+        "errors": errors,
+        "violations": violations,
+        "unexercised": [name for name in REQUIRED_OUTCOMES if not outcomes.get(name)],
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    if violations["overbooked_courses"] or violations["registered_and_waitlisted"] or violations["counter_drift"]:
+        sys.exit(1)
+    if report["unexercised"]:
+        sys.exit(f"No {', '.join(report['unexercised'])} operations happened; raise --ops or lower --capacity.")
+
+
+if __name__ == "__main__":
+    main()
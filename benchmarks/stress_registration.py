@@ -0,0 +1,141 @@
+"""
+Multi-process overbooking stress test for RegistrationSystem.
+
+Several processes register, drop and re-register random students into a few
+small sections at the same time. Afterwards every course is checked against
+its max_capacity; the script exits with status 1 if any course is overbooked,
+a waitlisted student is also registered in the same course, or the
+course_enrollment counters disagree with the registration rows.
+
+Run from the project folder:
+    python -m benchmarks.stress_registration --processes 8 --ops 300
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+
+import db_connection
+import users_db
+
+PROGRAM = "Computer"
+
+
+def seed(num_courses, capacity, num_students):
+    con = db_connection.get_connection()
+    with con:
+        for i in range(num_courses):
+            code = f"STR{i:02d}"
+            # Spread the sections over the week so a random pick rarely clashes
+            con.execute(
+                "INSERT INTO courses (course_code, course_name, credits, day, start_time, end_time, room, max_capacity) "
+                "VALUES (?, ?, 3, ?, ?, ?, 'R1', ?)",
+                (code, f"Stress {i}", ["Sun", "Mon", "Tue", "Wed", "Thu"][i % 5],
+                 f"{8 + i // 5:02d}:00", f"{8 + i // 5:02d}:50", capacity)
+            )
+            con.execute("INSERT INTO program_plans VALUES (?, 1, ?)", (PROGRAM, code))
+        con.executemany(
+            "INSERT INTO students (id, name, email, program, level) VALUES (?, 'Stress', '', ?, 1)",
+            [(sid, PROGRAM) for sid in range(1, num_students + 1)]
+        )
+
+
+def worker(db_path, seed_value, num_courses, num_students, ops, result_queue):
+    # Imported here so each process builds its own connection and catalog
+    from registration_system import RegistrationSystem
+    from Student import Student
+
+    db_connection.configure(db_path=db_path)
+    rng = random.Random(seed_value)
+    system = RegistrationSystem(max_credits=9)
+    codes = [f"STR{i:02d}" for i in range(num_courses)]
+    counts = {"registered": 0, "waitlisted": 0, "dropped": 0, "rejected": 0, "locked": 0}
+
+    for _ in range(ops):
+        student = Student(rng.randint(1, num_students), "Stress", "", PROGRAM, 1, "")
+        try:
+            if rng.random() < 0.25:
+                mine = system.get_student_registered_courses(student)
+                if mine:
+                    system.drop_course_for_student(student, rng.choice(mine))
+                    counts["dropped"] += 1
+                continue
+            picks = rng.sample(codes, rng.randint(1, 3))
+            ok, msg = system.register_courses_for_student(student, picks)
+            if not ok:
+                counts["rejected"] += 1
+            elif "waitlist" in msg:
+                counts["waitlisted"] += 1
+            else:
+                counts["registered"] += 1
+        except sqlite3.OperationalError:
+            counts["locked"] += 1
+    result_queue.put(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=300, help="operations per process")
+    parser.add_argument("--courses", type=int, default=6)
+    parser.add_argument("--capacity", type=int, default=15)
+    parser.add_argument("--students", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "stress.db")
+        db_connection.configure(db_path=db_path)
+        users_db.setup_database()
+        seed(args.courses, args.capacity, args.students)
+        db_connection.close_connection()
+
+        queue = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(target=worker,
+                                    args=(db_path, n, args.courses, args.students, args.ops, queue))
+            for n in range(args.processes)
+        ]
+        for p in procs:
+            p.start()
+        totals = {}
+        for _ in procs:
+            for k, v in queue.get().items():
+                totals[k] = totals.get(k, 0) + v
+        for p in procs:
+            p.join()
+
+        con = db_connection.get_connection()
+        overbooked = con.execute("""
+            SELECT c.course_code, COUNT(r.student_id), c.max_capacity
+            FROM courses c JOIN registration r ON r.course_code = c.course_code
+            GROUP BY c.course_code
+            HAVING COUNT(r.student_id) > c.max_capacity""").fetchall()
+        both = con.execute("""
+            SELECT COUNT(*) FROM waitlist w
+            JOIN registration r ON r.student_id = w.student_id AND r.course_code = w.course_code""").fetchone()[0]
+        drift = con.execute("""
+            SELECT e.course_code, e.enrolled, e.waitlisted,
+                   (SELECT COUNT(*) FROM registration r WHERE r.course_code = e.course_code),
+                   (SELECT COUNT(*) FROM waitlist w WHERE w.course_code = e.course_code)
+            FROM course_enrollment e""").fetchall()
+        drift = [row for row in drift if row[1:3] != row[3:5]]
+        db_connection.close_connection()
+
+    print(f"Operations: {totals}")
+    for code, enrolled, cap in overbooked:
+        print(f"OVERBOOKED {code}: {enrolled} / {cap}")
+    if both:
+        print(f"{both} waitlist entries are also registered in the same course")
+    for code, enrolled, waitlisted, actual_enrolled, actual_waitlisted in drift:
+        print(f"COUNTER DRIFT {code}: counters say {enrolled}/{waitlisted} enrolled/waitlisted, "
+              f"tables have {actual_enrolled}/{actual_waitlisted}")
+    if overbooked or both or drift:
+        sys.exit(1)
+    print("No course exceeded max_capacity.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Bulk enrollment for advisors: register many students at once.
+
+Requests come from a CSV file (student_id,course_code rows; several rows per
+student are grouped) or from a program/level, which enrolls every student of
+that level into the level's program plan courses.
+
+    python bulk_enroll.py --program Computer --level 1
+    python bulk_enroll.py --csv cohort.csv --report results.csv
+"""
+import argparse
+import csv
+import sqlite3
+import sys
+from collections import namedtuple
+
+import course_codes
+import db_connection
+import users_db
+
+# One line of the per-student report
+EnrollmentResult = namedtuple("EnrollmentResult", "student_id ok registered waitlisted message")
+
+
+# ==========================================
+#  REQUEST SOURCES
+# ==========================================
+def requests_from_csv(file_path):
+    """[(student_id, [course codes]), ...] from student_id,course_code rows (header optional)."""
+    grouped = {}
+    with open(file_path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if len(row) < 2 or not row[0].strip():
+                continue
+            sid, code = row[0].strip(), course_codes.normalize_code(row[1])
+            if not sid.isdigit():
+                continue    # header line
+            courses = grouped.setdefault(int(sid), [])
+            if code and code not in courses:
+                courses.append(code)
+    return list(grouped.items())
+
+
+def requests_from_plan(system, program, level):
+    """Every student of `program` at `level`, each with that level's plan courses."""
+    courses = list(system.program_plan.get(program, {}).get(level, []))
+    return [(sid, courses) for sid in users_db.get_student_ids(program, level)]
+
+
+# ==========================================
+#  BULK ENROLLMENT
+# ==========================================
+def _validate_with_cohort_cache(system, requests, contexts, cache):
+    """
+    Validates the requests one student at a time against the cached catalog,
+    but memoizes the result in `cache`: students asking for the same courses
+    with the same relevant history (a cohort) get one validate_registration()
+    call between them. Returns {student_id: error message or None}.
+    """
+    validator = system.validator
+    prereqs = system.prereqs
+    errors = {}
+    for sid, courses in requests:
+        context = contexts.get(sid)
+        if context is None:
+            errors[sid] = "Student not found."
+            continue
+        program, level, registered, completed = context
+        if not courses:
+            errors[sid] = "No courses selected."
+            continue
+        already = [c for c in courses if c in registered]
+        if already:
+            errors[sid] = f"Already registered in {already[0]}."
+            continue
+
+        # Only the completed courses that matter for these prerequisites go into the key
+        needed = 0
+        for code in courses:
+            i = prereqs.index.get(code)
+            if i is not None:
+                needed |= prereqs.direct[i]
+        key = (program, level, tuple(courses), prereqs.mask(completed) & needed)
+        if key not in cache:
+            ok, msg = validator.validate_registration(
+                selected_courses=courses,
+                completed_courses=completed,
+                student_program=program,
+                student_level=level,
+                current_enrollments=None
+            )
+            cache[key] = None if ok else msg
+        errors[sid] = cache[key]
+    return errors
+
+
+def bulk_enroll(system, requests, chunk_size=500):
+    """
+    Registers many students: `requests` is [(student_id, [course codes]), ...].
+    - one catalog refresh, then one transaction per `chunk_size` students
+    - inside it: one bulk load of the chunk's histories (under the write lock,
+      so no registration can land between the read and the inserts), validation
+      memoized across identical requests, and executemany writes; seats are
+      handed out in request order and full courses fall back to the waitlist,
+      exactly like register_courses_for_student()
+    Returns a list of EnrollmentResult, one per student, in request order
+    (several requests for the same student are merged).
+    """
+    system.refresh_data()
+    system.conflict_matrix()
+    merged = {}
+    for sid, courses in requests:
+        merged.setdefault(sid, []).extend(course_codes.normalize_codes(courses))
+    requests = [(sid, list(dict.fromkeys(courses))) for sid, courses in merged.items()]
+
+    results = []
+    cache = {}
+    for start in range(0, len(requests), chunk_size):
+        part = requests[start:start + chunk_size]
+        errors = {}
+        seated = {}
+        try:
+            with db_connection.transaction(immediate=True) as con:
+                contexts = users_db.get_student_contexts(sid for sid, _ in part)
+                errors = _validate_with_cohort_cache(system, part, contexts, cache)
+                chunk = [(sid, courses) for sid, courses in part if errors.get(sid) is None]
+                free = users_db.get_free_seats({c for _, courses in chunk for c in courses})
+                seats = []
+                waits = []
+                for sid, courses in chunk:
+                    got, waiting = [], []
+                    for code in courses:
+                        if free.get(code, 0) > 0:
+                            free[code] -= 1
+                            got.append(code)
+                            seats.append((sid, code))
+                        else:
+                            waiting.append(code)
+                            waits.append((sid, code))
+                    seated[sid] = (got, waiting)
+                con.executemany("INSERT INTO registration (student_id, course_code) VALUES (?, ?)", seats)
+                con.executemany("DELETE FROM waitlist WHERE student_id=? AND course_code=?", seats)
+                con.executemany("INSERT OR IGNORE INTO waitlist (student_id, course_code) VALUES (?, ?)", waits)
+        except sqlite3.Error as e:
+            for sid, _ in part:
+                if errors.get(sid) is None:
+                    errors[sid] = f"Database Error: {e}"
+            seated = {}
+
+        for sid, courses in part:
+            if sid in seated:
+                got, waiting = seated[sid]
+                if not waiting:
+                    msg = "Registered."
+                elif got:
+                    msg = "Registered; full courses waitlisted."
+                else:
+                    msg = "All courses full; waitlisted."
+                results.append(EnrollmentResult(sid, True, got, waiting, msg))
+            else:
+                results.append(EnrollmentResult(sid, False, [], [], errors[sid]))
+    return results
+
+
+def write_report(results, file_path):
+    with open(file_path, "w", newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["student_id", "status", "registered", "waitlisted", "message"])
+        for r in results:
+            writer.writerow([r.student_id, "OK" if r.ok else "FAILED",
+                             ";".join(r.registered), ";".join(r.waitlisted), r.message])
+
+
+if __name__ == "__main__":
+    from registration_system import RegistrationSystem
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--csv", help="student_id,course_code rows")
+    source.add_argument("--program", help="enroll a whole program level into its plan courses")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--report", help="write the per-student report to this CSV file")
+    args = parser.parse_args()
+
+    users_db.setup_database()
+    system = RegistrationSystem()
+    if args.csv:
+        reqs = requests_from_csv(args.csv)
+    else:
+        reqs = requests_from_plan(system, args.program, args.level)
+
+    results = bulk_enroll(system, reqs, args.chunk_size)
+    if args.report:
+        write_report(results, args.report)
+    ok = sum(1 for r in results if r.ok)
+    print(f"{ok} of {len(results)} students enrolled "
+          f"({sum(len(r.registered) for r in results)} seats, "
+          f"{sum(len(r.waitlisted) for r in results)} waitlisted).")
+    failed = [r for r in results if not r.ok]
+    for r in failed[:20]:
+        print(f"  {r.student_id}: {r.message}")
+    if len(failed) > 20:
+        print(f"  ... and {len(failed) - 20} more (see --report)")
+    sys.exit(0 if ok == len(results) else 1)
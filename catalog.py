@@ -0,0 +1,221 @@
+import sys
+from array import array
+from collections.abc import Mapping, MutableMapping
+from schedule_engine import parse_slots
+from course_codes import CODES, normalize_code
+
+# ==========================================
+#  COMPACT COURSE CATALOG
+# ==========================================
+# get_all_courses_data() builds one dict per course (plus a schedule list and
+# a prerequisites list), which is a lot of small objects for a faculty-wide
+# catalog. Catalog keeps the same data column-wise instead:
+#   - every course code maps to its small integer id in course_codes.CODES
+#     (shared with the prerequisite graph's bitsets)
+#   - credits / capacity / parsed meeting slots / prerequisite ids live in
+#     flat `array` columns indexed by that id
+#   - repeated strings (days, times, rooms) are interned once
+# Catalog["EE201"] returns a tiny CourseView, so existing code that does
+# courses_data[code]["credits"], .get(...), .items() keeps working.
+
+FIELDS = ("name", "credits", "max_capacity", "day", "start_time", "end_time",
+          "room", "schedule", "prerequisites")
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class CourseView(Mapping):
+    """Read-only dict-style view of one course row inside a Catalog."""
+    __slots__ = ("_catalog", "_id")
+
+    def __init__(self, catalog, course_id):
+        self._catalog = catalog
+        self._id = course_id
+
+    def __getitem__(self, key):
+        return self._catalog._field(self._id, key)
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    @property
+    def code(self):
+        return self._catalog.codes[self._id]
+
+    @property
+    def slots(self):
+        """Pre-parsed meeting slots: array('H', [day, start, end, ...])."""
+        return self._catalog.slots_of(self._id)
+
+    def __repr__(self):
+        return f"CourseView({self.code!r}, {dict(self)!r})"
+
+
+class Catalog(MutableMapping):
+    """Course code -> CourseView, stored as parallel columns."""
+
+    def __init__(self, items=()):
+        self.codes = CODES.codes    # id -> code, shared (ids are never reused for another code)
+        self.index = {}             # code -> id, live courses only, in load order
+
+        self.credits = array('h')
+        self.max_capacity = array('i')
+        self.names = []
+        self.days = []
+        self.start_times = []
+        self.end_times = []
+        self.rooms = []
+
+        # Variable-length columns: one flat array + (offset, length) per id
+        self.slot_data = array('H')
+        self.slot_off = array('I')
+        self.slot_len = array('H')
+        self.prereq_data = array('I')
+        self.prereq_off = array('I')
+        self.prereq_len = array('H')
+        self._garbage = 0       # dead entries left in the flat arrays by updates / deletes
+
+        for code, data in items:
+            self.upsert(code, data)
+
+    @classmethod
+    def from_courses_data(cls, courses_data):
+        return cls(courses_data.items())
+
+    # -----------------------------------------------------------
+    def intern(self, code):
+        """Returns the shared integer id of `code`, growing the columns to cover it."""
+        i = CODES.id(code)
+        while len(self.credits) <= i:
+            self.credits.append(0)
+            self.max_capacity.append(0)
+            for column in (self.names, self.days, self.start_times, self.end_times, self.rooms):
+                column.append(None)
+            for column in (self.slot_off, self.slot_len, self.prereq_off, self.prereq_len):
+                column.append(0)
+        return i
+
+    def upsert(self, code, data):
+        """Adds or replaces one course from a get_all_courses_data()-style dict."""
+        i = self.intern(code)
+        self.credits[i] = int(data.get("credits") or 0)
+        self.max_capacity[i] = int(data.get("max_capacity") or 0)
+        self.names[i] = data.get("name")
+        self.days[i] = _intern(data.get("day"))
+        self.start_times[i] = _intern(data.get("start_time"))
+        self.end_times[i] = _intern(data.get("end_time"))
+        self.rooms[i] = _intern(data.get("room"))
+
+        self._garbage += self.slot_len[i] + self.prereq_len[i]
+        slots = getattr(data, "slots", None)
+        if slots is None:
+            slots = parse_slots(data.get("schedule", []))
+        self.slot_off[i] = len(self.slot_data)
+        self.slot_len[i] = len(slots)
+        self.slot_data.extend(slots)
+
+        prereqs = [self.intern(p) for p in data.get("prerequisites", [])]
+        self.prereq_off[i] = len(self.prereq_data)
+        self.prereq_len[i] = len(prereqs)
+        self.prereq_data.extend(prereqs)
+
+        self.index[self.codes[i]] = i     # the shared canonical string, not a second copy
+        self._maybe_compact()
+
+    def id_of(self, code):
+        """Id of a live course; "ee 201" still finds EE201. KeyError if it isn't in the catalog."""
+        i = self.index.get(code)
+        if i is None:
+            i = self.index.get(normalize_code(code)) if isinstance(code, str) else None
+            if i is None:
+                raise KeyError(code)
+        return i
+
+    def remove(self, code):
+        i = self.index.pop(self.codes[self.id_of(code)])
+        self._garbage += self.slot_len[i] + self.prereq_len[i]
+        self.slot_len[i] = self.prereq_len[i] = 0
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        """Rewrites the flat arrays once more than half of them is dead space."""
+        if self._garbage * 2 <= len(self.slot_data) + len(self.prereq_data):
+            return
+        slot_data = array('H')
+        prereq_data = array('I')
+        for i in self.index.values():
+            s, n = self.slot_off[i], self.slot_len[i]
+            self.slot_off[i] = len(slot_data)
+            slot_data.extend(self.slot_data[s:s + n])
+            s, n = self.prereq_off[i], self.prereq_len[i]
+            self.prereq_off[i] = len(prereq_data)
+            prereq_data.extend(self.prereq_data[s:s + n])
+        self.slot_data = slot_data
+        self.prereq_data = prereq_data
+        self._garbage = 0
+
+    # -----------------------------------------------------------
+    def slots_of(self, i):
+        s = self.slot_off[i]
+        return self.slot_data[s:s + self.slot_len[i]]
+
+    def prereq_ids(self, i):
+        s = self.prereq_off[i]
+        return self.prereq_data[s:s + self.prereq_len[i]]
+
+    def _field(self, i, key):
+        if key == "credits":
+            return self.credits[i]
+        if key == "max_capacity":
+            return self.max_capacity[i]
+        if key == "name":
+            return self.names[i]
+        if key == "day":
+            return self.days[i]
+        if key == "start_time":
+            return self.start_times[i]
+        if key == "end_time":
+            return self.end_times[i]
+        if key == "room":
+            return self.rooms[i]
+        if key == "schedule":
+            return [(self.days[i], self.start_times[i], self.end_times[i])]
+        if key == "prerequisites":
+            return [self.codes[p] for p in self.prereq_ids(i)]
+        raise KeyError(key)
+
+    # -----------------------------------------------------------
+    # Dict-style adapter
+    # Every method takes any spelling of a code (see id_of)
+    def __getitem__(self, code):
+        return CourseView(self, self.id_of(code))
+
+    def __setitem__(self, code, data):
+        self.upsert(code, data)
+
+    def __delitem__(self, code):
+        self.remove(code)
+
+    def __contains__(self, code):
+        try:
+            self.id_of(code)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def total_credits(self, codes):
+        """Sum of credits for the given courses (KeyError for an unknown code, like the dict)."""
+        credits = self.credits
+        index = self.index
+        return sum(credits[index[code] if code in index else self.id_of(code)] for code in codes)
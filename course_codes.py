@@ -0,0 +1,70 @@
+import re
+import sys
+import threading
+
+# ==========================================
+#  CANONICAL COURSE CODES
+# ==========================================
+# The same course used to be stored as "EE 201" (Acadmic_history) and "EE201"
+# (CourseFactory), and readers reconciled them by munging strings on every
+# comparison. Every write path now stores normalize_code(code): upper case,
+# no whitespace. Migration 10 rewrote the rows that were already there.
+# Canonical codes are interned, so the same code read from different tables
+# is one string object and dict / set lookups compare by identity first.
+# CODES gives every canonical code one small integer id for the whole process;
+# the catalog columns and the prerequisite bitsets are both indexed by it, so
+# a code's id from one is valid in the other.
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_code(code):
+    """'ee 201' -> 'EE201' (interned). None stays None."""
+    if code is None:
+        return None
+    return sys.intern(_WHITESPACE.sub("", str(code)).upper())
+
+
+def normalize_codes(codes):
+    """normalize_code() for a list, dropping blanks and keeping the first of any repeats."""
+    return list(dict.fromkeys(c for c in map(normalize_code, codes) if c))
+
+
+def intern_codes(codes):
+    """Interns codes read back from the database (already canonical) into a set."""
+    return {sys.intern(c) for c in codes if c is not None}
+
+
+class CodeIndex:
+    """Append-only code <-> id table; ids are never reused, so they can index arrays and bitsets."""
+
+    def __init__(self):
+        self.codes = []         # id -> canonical code
+        self.ids = {}           # code -> id
+        self._lock = threading.Lock()     # allocation only; DataWorker threads build catalogs too
+
+    def id(self, code):
+        """The id of `code`, allocating one the first time its canonical form is seen."""
+        i = self.ids.get(code)
+        if i is None:
+            code = normalize_code(code)
+            with self._lock:
+                i = self.ids.get(code)
+                if i is None:
+                    i = len(self.codes)
+                    self.codes.append(code)
+                    self.ids[code] = i      # published last: a reader that finds the id finds the code
+        return i
+
+    def get(self, code):
+        """The id of `code`, or None if it has never been seen."""
+        i = self.ids.get(code)
+        if i is None and isinstance(code, str):
+            i = self.ids.get(normalize_code(code))
+        return i
+
+    def __len__(self):
+        return len(self.codes)
+
+
+CODES = CodeIndex()
@@ -0,0 +1,215 @@
+"""
+Streaming, transactional course catalog import from CSV.
+
+Columns (header row is skipped):
+    course_code, course_name, credits, day, start_time, end_time, room, max_capacity[, prerequisites]
+`prerequisites` is optional: codes separated by ';' (or spaces). When the
+column is present it REPLACES that course's prerequisites; when it is absent
+the existing prerequisites are left alone.
+
+The file is read lazily and validated a chunk at a time; every write happens
+inside ONE transaction, so a failed import leaves the catalog untouched.
+
+    python course_importer.py catalog.csv                # insert new courses only
+    python course_importer.py catalog.csv --update       # also update existing ones
+    python course_importer.py catalog.csv --dry-run      # validate, write nothing
+    python course_importer.py catalog.csv --diff         # show what would change
+"""
+import argparse
+import csv
+import sys
+from collections import namedtuple
+from itertools import islice
+
+import db_connection
+import users_db
+import prereq_graph
+import course_codes
+import gpa_engine
+
+FIELDS = ("course_name", "credits", "day", "start_time", "end_time", "room", "max_capacity")
+
+# errors: ["Row 3 (EE201): Course 'EE201' already exists.", ...] - same wording as Admin.add_course
+# diff:   [("add", code, None) | ("update", code, {field: (old, new)}) | ("same", code, None), ...]
+ImportResult = namedtuple("ImportResult", "added updated unchanged errors diff")
+
+UPSERT_SQL = """
+    INSERT INTO courses (course_code, course_name, credits, day, start_time, end_time, room, max_capacity)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(course_code) DO UPDATE SET
+        course_name = excluded.course_name, credits = excluded.credits, day = excluded.day,
+        start_time = excluded.start_time, end_time = excluded.end_time, room = excluded.room,
+        max_capacity = excluded.max_capacity
+"""
+
+
+class _DryRun(Exception):
+    """Raised at the end of a dry run so the transaction rolls back."""
+
+
+def _parse_row(row_num, row):
+    """Returns ((code, fields...), prereqs or None) or raises ValueError with the row-level message."""
+    if len(row) < 8:
+        raise ValueError(f"Row {row_num}: Incomplete data.")
+    code, name, credits, day, start, end, room, cap = row[0:8]
+    code = course_codes.normalize_code(code)
+    try:
+        credits = int(credits)
+        cap = int(cap)
+    except ValueError as e:
+        raise ValueError(f"Row {row_num}: {e}")
+    record = (code, name.strip(), credits, day.strip(), str(start).strip(), str(end).strip(), room.strip(), cap)
+    if not all(record):
+        raise ValueError(f"Row {row_num} ({code}): All fields are required.")
+    if credits <= 0:
+        raise ValueError(f"Row {row_num} ({code}): Credits must be positive.")
+    prereqs = None
+    if len(row) > 8:
+        prereqs = course_codes.normalize_codes(row[8].replace(',', ';').split(';'))
+        if code in prereqs:
+            raise ValueError(f"Row {row_num} ({code}): Course '{code}' cannot be its own prerequisite.")
+    return record, prereqs
+
+
+def import_courses(file_path, update_existing=False, dry_run=False, diff=False, chunk_size=1000):
+    """
+    Imports a course CSV. Existing courses are reported as errors unless
+    `update_existing`. `diff` lists every add / field change and implies `dry_run`.
+    Returns an ImportResult.
+    """
+    dry_run = dry_run or diff
+    added = updated = unchanged = 0
+    errors = []            # (row_num, message)
+    changes = []
+    prereq_edits = {}      # course_code -> (row_num, [prereq codes])
+    seen = set()
+    credit_changes = []    # codes whose credits are new or changed: their students' GPAs move
+
+    try:
+        with db_connection.transaction(immediate=True) as con:
+            with open(file_path, newline='', encoding='utf-8') as csvfile:
+                reader = csv.reader(csvfile)
+                next(reader, None)  # Skip header
+                rows = enumerate(reader, start=1)
+                while True:
+                    chunk = list(islice(rows, chunk_size))
+                    if not chunk:
+                        break
+
+                    parsed = []
+                    for row_num, row in chunk:
+                        try:
+                            parsed.append((row_num,) + _parse_row(row_num, row))
+                        except ValueError as e:
+                            errors.append((row_num, str(e)))
+
+                    # One lookup for the whole chunk instead of one per row
+                    codes = [record[0] for _, record, _ in parsed]
+                    existing = {}
+                    for part in users_db._chunks(codes):
+                        marks = ",".join("?" * len(part))
+                        for r in con.execute(f"SELECT course_code, {', '.join(FIELDS)} FROM courses "
+                                             f"WHERE course_code IN ({marks})", part):
+                            existing[r[0]] = r[1:]
+
+                    batch = []
+                    for row_num, record, prereqs in parsed:
+                        code = record[0]
+                        if code in seen or (code in existing and not update_existing):
+                            errors.append((row_num, f"Row {row_num} ({code}): Course '{code}' already exists."))
+                            continue
+                        seen.add(code)
+                        if code in existing:
+                            old = existing[code]
+                            delta = {f: (o, n) for f, o, n in zip(FIELDS, old, record[1:]) if o != n}
+                            if "credits" in delta:
+                                credit_changes.append(code)
+                            if delta:
+                                updated += 1
+                                changes.append(("update", code, delta))
+                                batch.append(record)
+                            else:
+                                unchanged += 1
+                                changes.append(("same", code, None))
+                        else:
+                            added += 1
+                            credit_changes.append(code)
+                            changes.append(("add", code, None))
+                            batch.append(record)
+                        if prereqs is not None:
+                            prereq_edits[code] = (row_num, prereqs)
+                    con.executemany(UPSERT_SQL, batch)
+
+            _apply_prerequisites(con, prereq_edits, errors, changes)
+            gpa_engine.rebuild(con, gpa_engine.students_with_courses(con, credit_changes))
+            if dry_run:
+                raise _DryRun()
+    except _DryRun:
+        pass
+
+    # Same order as the file, whichever pass found the problem
+    errors = [msg for _, msg in sorted(errors, key=lambda e: e[0])]
+    return ImportResult(added, updated, unchanged, errors, changes if diff else [])
+
+
+def _apply_prerequisites(con, prereq_edits, errors, changes):
+    """
+    Replaces the prerequisites of the imported courses. An edit that would make
+    the graph cyclic is skipped (the course keeps its old prerequisites) and
+    reported on its row.
+    """
+    if not prereq_edits:
+        return
+    pairs = [(c, p) for c, p in con.execute("SELECT course_code, prereq_code FROM prerequisites")
+             if c not in prereq_edits]
+    pairs += [(c, p) for c, (_, prereqs) in prereq_edits.items() for p in prereqs]
+    # Drop the edits that close a cycle, one cycle at a time, and report them on their rows
+    while True:
+        cycle = prereq_graph.PrerequisiteGraph(pairs).find_cycle()
+        if not cycle:
+            break
+        culprit = next((c for c in cycle if c in prereq_edits), None)
+        if culprit is None:
+            break   # the cycle is already in the database; nothing this file can fix
+        row_num, prereqs = prereq_edits.pop(culprit)
+        errors.append((row_num, f"Row {row_num} ({culprit}): Prerequisite cycle: " + " -> ".join(cycle)))
+        pairs = [(c, p) for c, p in pairs if c != culprit]
+        pairs += [(culprit, p) for p, in con.execute(
+            "SELECT prereq_code FROM prerequisites WHERE course_code=?", (culprit,))]
+
+    current = {}
+    for part in users_db._chunks(list(prereq_edits)):
+        marks = ",".join("?" * len(part))
+        for c, p in con.execute(f"SELECT course_code, prereq_code FROM prerequisites "
+                                f"WHERE course_code IN ({marks})", part):
+            current.setdefault(c, []).append(p)
+    for code, (_, prereqs) in prereq_edits.items():
+        if sorted(current.get(code, [])) != sorted(prereqs):
+            changes.append(("prerequisites", code, {"prerequisites": (current.get(code, []), prereqs)}))
+    con.executemany("DELETE FROM prerequisites WHERE course_code=?", [(c,) for c in prereq_edits])
+    con.executemany("INSERT INTO prerequisites (course_code, prereq_code) VALUES (?, ?)",
+                    [(c, p) for c, (_, prereqs) in prereq_edits.items() for p in prereqs])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv_file")
+    parser.add_argument("--update", action="store_true", help="update courses that already exist")
+    parser.add_argument("--dry-run", action="store_true", help="validate everything but write nothing")
+    parser.add_argument("--diff", action="store_true", help="list adds and field changes (implies --dry-run)")
+    args = parser.parse_args()
+
+    users_db.setup_database()
+    result = import_courses(args.csv_file, update_existing=args.update, dry_run=args.dry_run, diff=args.diff)
+    for kind, code, detail in result.diff:
+        if kind == "add":
+            print(f"+ {code}")
+        elif kind != "same":
+            for field, (old, new) in detail.items():
+                print(f"~ {code}.{field}: {old!r} -> {new!r}")
+    print(f"{'Would import' if args.dry_run or args.diff else 'Imported'}: "
+          f"{result.added} added, {result.updated} updated, {result.unchanged} unchanged, "
+          f"{len(result.errors)} errors.")
+    for err in result.errors[:50]:
+        print("  " + err)
+    sys.exit(1 if result.errors else 0)
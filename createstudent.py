@@ -1,38 +1,22 @@
 from Student import Student
 import users_db
+import seed_data
 import random
 
-def create_students(number=10):
+def create_students(number=10, seed=None):
     """
     Generates a specified number of random students and adds them to the database.
+    Uses seed_data: ids are picked without collisions and all rows are written
+    in one transaction. Pass `seed` for a reproducible batch.
     """
-    names = ["Abdulilah", "Saeed", "Sulaiman", "Alaa", "Mohtadi", "Baraa",
-             "Faisal", "Omar", "Khalid", "Ahmed", "Rayan", "Hassan"]
-    programs = ["Power", "Comm", "Computer", "Biomedical"] # Corrected typo "Biomedecal"
+    rng = random.Random(seed)
+    ids = seed_data.new_student_ids(rng, number)
+    users, students = seed_data.generate_students(rng, ids)
+    seed_data.insert_students(users, students)
 
     created_students = []
-    for i in range(number):
-        name = random.choice(names)
-        program = random.choice(programs)
-        level = random.randint(1, 4)
-        # Ensure the generated ID is unique
-        while True:
-            try:
-                ID = random.randint(2400000, 2499999)
-                passw = str(random.randint(1234567, 2345678))
-                email = (f"{name.lower()}{ID}@kau.edu.stu.com") # Use ID for unique email
-                
-                # Insert into users table first
-                user = users_db.add_users((ID, name, email, passw, "student"))
-                user.insertData()
-                break # Exit loop if insertion is successful (ID/email was unique)
-            except :
-                continue # Try again with a new ID/email
-
-        # Then, insert into the students table
-        student = Student(ID, name, email, program, level, passw)
-        student.store_data()
-        created_students.append(student)
+    for (ID, name, email, passw, _), (_, _, _, program, level) in zip(users, students):
+        created_students.append(Student(ID, name, email, program, level, passw))
         print(f"Created student: {name}, ID: {ID}, Email: {email}, Password: {passw}")
 
     return created_students
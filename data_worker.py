@@ -0,0 +1,135 @@
+"""
+Background reads for the dashboards.
+
+Dashboard queries run on a small QThreadPool instead of the GUI thread:
+
+    self.worker = DataWorker(self)
+    self.worker.loading.connect(self.on_loading)
+    self.worker.request("students", fetch_students, on_result=self.show_students)
+
+fn(*args) runs on a pool thread (db_connection gives every thread its own
+connection) and on_result(value) is called back on the GUI thread through a
+queued signal. Requests are keyed:
+  - a request for a key that is still queued replaces it, so ten refresh
+    clicks run one query with the latest arguments (coalescing);
+  - a request for a key that is already running supersedes it, and the stale
+    result is dropped when it arrives (cancellation);
+  - loading(key, True / False) brackets every key, for loading states.
+fn must not touch widgets. Writes stay on the GUI thread: they are short
+transactions whose outcome the user waits for anyway.
+"""
+import threading
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class _Signals(QObject):
+    done = pyqtSignal(str, int, object)
+    failed = pyqtSignal(str, int, str)
+
+
+class _Job(QRunnable):
+    """Runs whatever request is queued for `key` when a pool thread picks it up."""
+
+    def __init__(self, worker, key):
+        super().__init__()
+        self.worker = worker
+        self.key = key
+
+    def run(self):
+        taken = self.worker._take(self.key)
+        if taken is None:
+            return      # cancelled while queued
+        generation, fn, args = taken
+        try:
+            result = fn(*args)
+        except Exception:
+            self.worker._emit("failed", self.key, generation, traceback.format_exc())
+        else:
+            self.worker._emit("done", self.key, generation, result)
+
+
+class DataWorker(QObject):
+    loading = pyqtSignal(str, bool)
+
+    def __init__(self, parent=None, max_threads=2):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.pool.setExpiryTimeout(-1)      # keep threads (and their connections) warm
+        self._signals = _Signals(self)
+        self._signals.done.connect(self._on_done)
+        self._signals.failed.connect(self._on_failed)
+        self._lock = threading.Lock()       # _queued and _generation are shared with pool threads
+        self._queued = {}                   # key -> (generation, fn, args), not started yet
+        self._generation = {}               # key -> latest generation; older results are stale
+        self._callbacks = {}                # key -> (on_result, on_error); GUI thread only
+        self._busy = set()
+
+    # -----------------------------------------------------------
+    def request(self, key, fn, *args, on_result, on_error=None):
+        """Runs fn(*args) in the background; on_result(value) / on_error(traceback) on the GUI thread."""
+        with self._lock:
+            generation = self._generation.get(key, 0) + 1
+            self._generation[key] = generation
+            already_queued = key in self._queued
+            self._queued[key] = (generation, fn, args)
+        self._callbacks[key] = (on_result, on_error)
+        if not already_queued:
+            self.pool.start(_Job(self, key))
+        if key not in self._busy:
+            self._busy.add(key)
+            self.loading.emit(key, True)
+
+    def cancel(self, key):
+        """Drops a queued request and ignores the result of a running one."""
+        with self._lock:
+            self._generation[key] = self._generation.get(key, 0) + 1
+            self._queued.pop(key, None)
+        self._finish(key)
+
+    def cancel_all(self):
+        for key in list(self._busy):
+            self.cancel(key)
+
+    def is_loading(self, key):
+        return key in self._busy
+
+    # -----------------------------------------------------------
+    def _take(self, key):
+        with self._lock:
+            return self._queued.pop(key, None)
+
+    def _emit(self, signal, key, generation, value):
+        try:
+            getattr(self._signals, signal).emit(key, generation, value)
+        except RuntimeError:
+            pass    # the dashboard was closed while the query ran
+
+    def _current(self, key, generation):
+        with self._lock:
+            return generation == self._generation.get(key)
+
+    def _finish(self, key):
+        if key in self._busy:
+            self._busy.discard(key)
+            self.loading.emit(key, False)
+
+    def _on_done(self, key, generation, result):
+        if not self._current(key, generation):
+            return
+        self._finish(key)
+        on_result, _ = self._callbacks.get(key, (None, None))
+        if on_result:
+            on_result(result)
+
+    def _on_failed(self, key, generation, error):
+        if not self._current(key, generation):
+            return
+        self._finish(key)
+        _, on_error = self._callbacks.get(key, (None, None))
+        if on_error:
+            on_error(error)
+        else:
+            print(f"Load Error ({key}): {error}")
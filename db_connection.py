@@ -0,0 +1,165 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# ==========================================
+#  SHARED SQLITE CONNECTION PROVIDER
+# ==========================================
+# Every module gets its connection from here instead of calling
+# sqlite3.connect('User.db') itself. Each thread keeps ONE long-lived
+# connection, so we stop paying connect/close + schema parsing on every query.
+
+DB_PATH = 'User.db'
+
+# How many prepared statements sqlite3 keeps per connection (Python default is 128)
+CACHED_STATEMENTS = 256
+
+# ==========================================
+#  PERFORMANCE PROFILES
+# ==========================================
+# A profile is the set of pragmas applied once, right after a connection is opened.
+# All profiles use WAL so dashboard readers are never blocked by a registration write.
+#   safe      -> fsync on every commit (survives power loss), modest cache
+#   fast      -> default; fsync only at checkpoints (still crash-safe for the app)
+#   bulk-load -> seeding / imports only; no fsync at all, big cache
+PROFILES = {
+    "safe": {
+        "journal_mode": "WAL",
+        "busy_timeout": 10000,
+        "synchronous": "FULL",
+        "cache_size": -8000,          # negative = KiB, so ~8 MB
+        "temp_store": "DEFAULT",
+        "mmap_size": 0,
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "busy_timeout": 5000,
+        "synchronous": "NORMAL",
+        "cache_size": -32000,
+        "temp_store": "MEMORY",
+        "mmap_size": 268435456,       # 256 MB
+    },
+    "bulk-load": {
+        "journal_mode": "WAL",
+        "busy_timeout": 30000,
+        "synchronous": "OFF",
+        "cache_size": -262144,
+        "temp_store": "MEMORY",
+        "mmap_size": 1073741824,
+    },
+}
+
+# The profile can be picked without code changes: USER_DB_PROFILE=safe python Login_Window.py
+PROFILE = os.environ.get("USER_DB_PROFILE", "fast")
+if PROFILE not in PROFILES:
+    raise ValueError(f"Unknown database profile '{PROFILE}'. Choose from: {', '.join(PROFILES)}")
+PRAGMAS = dict(PROFILES[PROFILE])
+
+_local = threading.local()
+_config_lock = threading.Lock()
+_generation = 0
+
+
+def configure(db_path=None, cached_statements=None, pragmas=None, profile=None):
+    """
+    Changes the database settings used for new connections.
+    `profile` selects one of PROFILES; `pragmas` overrides individual values on top of it.
+    Existing thread connections are re-opened the next time they are requested.
+    """
+    global DB_PATH, CACHED_STATEMENTS, PRAGMAS, PROFILE, _generation
+    with _config_lock:
+        if db_path is not None:
+            DB_PATH = db_path
+        if cached_statements is not None:
+            CACHED_STATEMENTS = cached_statements
+        if profile is not None:
+            if profile not in PROFILES:
+                raise ValueError(f"Unknown database profile '{profile}'. Choose from: {', '.join(PROFILES)}")
+            PROFILE = profile
+            PRAGMAS = dict(PROFILES[profile])
+        if pragmas is not None:
+            PRAGMAS.update(pragmas)
+        _generation += 1
+
+
+def apply_pragmas(con, pragmas=None):
+    """Applies a pragma set (default: the active profile) to an open connection."""
+    for name, value in (pragmas if pragmas is not None else PRAGMAS).items():
+        con.execute(f"PRAGMA {name}={value}")
+
+
+def current_settings(con=None):
+    """Reads back the pragmas actually in effect, e.g. to confirm WAL is on."""
+    con = con or get_connection()
+    return {name: con.execute(f"PRAGMA {name}").fetchone()[0] for name in PROFILES["safe"]}
+
+
+def _open_connection():
+    con = sqlite3.connect(DB_PATH, cached_statements=CACHED_STATEMENTS)
+    apply_pragmas(con)
+    return con
+
+
+def get_connection():
+    """
+    Returns the connection owned by the calling thread, opening it on first use.
+    Do NOT close it; use `with con:` to commit / roll back a unit of work.
+    """
+    con = getattr(_local, "con", None)
+    # A forked child process must never reuse its parent's connection
+    if con is not None and (_local.generation != _generation or _local.pid != os.getpid()):
+        if _local.pid == os.getpid():
+            con.close()
+        con = None
+
+    if con is None:
+        con = _open_connection()
+        _local.con = con
+        _local.generation = _generation
+        _local.pid = os.getpid()
+    return con
+
+
+def close_connection():
+    """Closes the calling thread's connection (e.g. when a worker thread finishes)."""
+    con = getattr(_local, "con", None)
+    if con is not None:
+        if _local.pid == os.getpid():
+            con.close()
+        _local.con = None
+
+
+
+@contextmanager
+def transaction(immediate=False):
+    """
+    Runs a block as ONE transaction on the calling thread's connection.
+    immediate=True takes the write lock up front (BEGIN IMMEDIATE), so a
+    read-then-write sequence cannot interleave with another writer.
+    Nested calls simply join the outer transaction.
+    """
+    con = get_connection()
+    depth = getattr(_local, "tx_depth", 0)
+    if depth:
+        _local.tx_depth = depth + 1
+        try:
+            yield con
+        finally:
+            _local.tx_depth = depth
+        return
+
+    if con.in_transaction:
+        # Flush a pending implicit transaction so it isn't swallowed by ours
+        con.commit()
+    con.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    _local.tx_depth = 1
+    try:
+        yield con
+    except BaseException:
+        con.rollback()
+        raise
+    else:
+        con.commit()
+    finally:
+        _local.tx_depth = 0
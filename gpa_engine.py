@@ -0,0 +1,182 @@
+"""
+GPA and academic standing from cached per-student aggregates.
+
+student_gpa (cumulative) and student_term_gpa (one row per term) hold quality
+points and credit totals (migration 9), so reading a GPA is one primary-key
+lookup. They are kept current by users_db.upsert_grades, which rebuilds the
+affected students inside the grade write's own transaction. recompute_all()
+rebuilds every student in one set-based pass, for dean's-list and probation
+runs or after bulk changes made outside upsert_grades.
+
+GPA is on the 5.00 scale. A term GPA counts every graded course of that term;
+the cumulative GPA counts only the latest attempt of a retaken course.
+
+    python gpa_engine.py --recompute
+    python gpa_engine.py --deans-list [--term 2025-3]
+    python gpa_engine.py --probation
+"""
+import argparse
+
+import db_connection
+
+GRADE_POINTS = {"A+": 5.00, "A": 4.75, "B+": 4.50, "B": 4.00, "C+": 3.50,
+                "C": 3.00, "D+": 2.50, "D": 2.00, "F": 1.00}
+
+DEANS_LIST_GPA = 4.50
+DEANS_LIST_CREDITS = 12     # graded credits in the term
+PROBATION_GPA = 2.00
+
+_POINTS_SQL = "CASE UPPER(t.grade) " + " ".join(
+    f"WHEN '{grade}' THEN {points}" for grade, points in GRADE_POINTS.items()) + " END"
+_GRADED_SQL = "UPPER(t.grade) IN (" + ", ".join(f"'{grade}'" for grade in GRADE_POINTS) + ")"
+
+_TERM_SELECT = f"""
+    SELECT t.student_id, t.term, SUM({_POINTS_SQL} * c.credits), SUM(c.credits)
+    FROM transcripts t JOIN courses c ON c.course_code = t.course_code
+    WHERE {_GRADED_SQL} {{where}}
+    GROUP BY t.student_id, t.term"""
+
+# Latest attempt only: no row of the same course in a later term
+_CUMULATIVE_SELECT = f"""
+    SELECT t.student_id, SUM({_POINTS_SQL} * c.credits), SUM(c.credits)
+    FROM transcripts t JOIN courses c ON c.course_code = t.course_code
+    WHERE {_GRADED_SQL} {{where}}
+      AND NOT EXISTS (SELECT 1 FROM transcripts x
+                      WHERE x.student_id = t.student_id AND x.course_code = t.course_code AND x.term > t.term)
+    GROUP BY t.student_id"""
+
+
+def _chunks(items, size=500):
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# ==========================================
+#  MAINTENANCE
+# ==========================================
+def rebuild(con, student_ids=None):
+    """
+    Recomputes the cached aggregates of `student_ids` (None: everyone) on `con`.
+    The caller owns the transaction, so this can run inside a grade write.
+    """
+    if student_ids is None:
+        con.execute("DELETE FROM student_term_gpa")
+        con.execute("DELETE FROM student_gpa")
+        con.execute("INSERT INTO student_term_gpa (student_id, term, points, credits) "
+                    + _TERM_SELECT.format(where=""))
+        con.execute("INSERT INTO student_gpa (student_id, points, credits) "
+                    + _CUMULATIVE_SELECT.format(where=""))
+        return
+    for chunk in _chunks(set(student_ids)):
+        marks = ",".join("?" * len(chunk))
+        con.execute(f"DELETE FROM student_term_gpa WHERE student_id IN ({marks})", chunk)
+        con.execute(f"DELETE FROM student_gpa WHERE student_id IN ({marks})", chunk)
+        where = f"AND t.student_id IN ({marks})"
+        con.execute("INSERT INTO student_term_gpa (student_id, term, points, credits) "
+                    + _TERM_SELECT.format(where=where), chunk)
+        con.execute("INSERT INTO student_gpa (student_id, points, credits) "
+                    + _CUMULATIVE_SELECT.format(where=where), chunk)
+
+
+def refresh_students(student_ids):
+    """Rebuilds a few students' aggregates in their own transaction (or the caller's)."""
+    with db_connection.transaction(immediate=True) as con:
+        rebuild(con, student_ids)
+
+
+def students_with_courses(con, course_codes):
+    """Ids of every student with a transcript row for one of `course_codes` (e.g. after a credit change)."""
+    course_codes = set(course_codes)
+    if not course_codes:
+        return set()
+    if len(course_codes) > 500:
+        # A big catalog import: one pass over transcripts beats many IN scans
+        return {sid for sid, code in con.execute("SELECT student_id, course_code FROM transcripts")
+                if code in course_codes}
+    marks = ",".join("?" * len(course_codes))
+    return {row[0] for row in con.execute(
+        f"SELECT DISTINCT student_id FROM transcripts WHERE course_code IN ({marks})", list(course_codes))}
+
+
+def refresh_courses(course_codes):
+    """Rebuilds every student who took one of `course_codes`; call after their credits change."""
+    with db_connection.transaction(immediate=True) as con:
+        rebuild(con, students_with_courses(con, course_codes))
+
+
+def recompute_all():
+    """Batch mode: rebuilds every student's aggregates in one pass. Returns the number of students."""
+    with db_connection.transaction(immediate=True) as con:
+        rebuild(con)
+        return con.execute("SELECT COUNT(*) FROM student_gpa").fetchone()[0]
+
+
+# ==========================================
+#  READING
+# ==========================================
+def get_gpa(student_id):
+    """(cumulative GPA, graded credits); (0.0, 0) without graded courses."""
+    row = db_connection.get_connection().execute(
+        "SELECT points, credits FROM student_gpa WHERE student_id=?", (student_id,)).fetchone()
+    return (row[0] / row[1], row[1]) if row and row[1] else (0.0, 0)
+
+
+def get_term_gpa(student_id, term):
+    """(GPA of one term, graded credits in it); (0.0, 0) if nothing was graded."""
+    row = db_connection.get_connection().execute(
+        "SELECT points, credits FROM student_term_gpa WHERE student_id=? AND term=?", (student_id, term)).fetchone()
+    return (row[0] / row[1], row[1]) if row and row[1] else (0.0, 0)
+
+
+def standing(gpa, credits):
+    """Academic standing for a cumulative GPA."""
+    if not credits:
+        return "Regular"
+    if gpa < PROBATION_GPA:
+        return "Probation"
+    if gpa >= DEANS_LIST_GPA:
+        return "Dean's List"
+    return "Regular"
+
+
+def deans_list(term, min_gpa=DEANS_LIST_GPA, min_credits=DEANS_LIST_CREDITS):
+    """[(student_id, term GPA, credits), ...] for one term, best first."""
+    return db_connection.get_connection().execute("""
+        SELECT student_id, points / credits, credits FROM student_term_gpa
+        WHERE term = ? AND credits >= ? AND points >= ? * credits
+        ORDER BY points / credits DESC, student_id""", (term, min_credits, min_gpa)).fetchall()
+
+
+def probation_list(max_gpa=PROBATION_GPA):
+    """[(student_id, cumulative GPA, credits), ...] below `max_gpa`, worst first."""
+    return db_connection.get_connection().execute("""
+        SELECT student_id, points / credits, credits FROM student_gpa
+        WHERE credits > 0 AND points < ? * credits
+        ORDER BY points / credits, student_id""", (max_gpa,)).fetchall()
+
+
+if __name__ == "__main__":
+    import users_db
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recompute", action="store_true", help="rebuild every student's cached GPA")
+    parser.add_argument("--deans-list", action="store_true")
+    parser.add_argument("--probation", action="store_true")
+    parser.add_argument("--term", default=None, help="term for --deans-list (default: current term)")
+    args = parser.parse_args()
+
+    users_db.setup_database()
+    if args.recompute:
+        print(f"Recomputed GPA for {recompute_all()} students.")
+    if args.deans_list:
+        term = args.term or users_db.CURRENT_TERM
+        rows = deans_list(term)
+        print(f"Dean's list {term}: {len(rows)} students")
+        for sid, gpa, credits in rows:
+            print(f"  {sid}  {gpa:.2f}  ({credits} credits)")
+    if args.probation:
+        rows = probation_list()
+        print(f"On probation: {len(rows)} students")
+        for sid, gpa, credits in rows:
+            print(f"  {sid}  {gpa:.2f}  ({credits} credits)")
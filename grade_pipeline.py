@@ -0,0 +1,222 @@
+"""
+Bulk grade import and transcript export.
+
+Grade sheets are CSV (student_id,course_code,grade[,term]; header optional)
+or JSON (an array of {"student_id", "course_code", "grade", "term"} objects, or
+one object per line). The term defaults to users_db.CURRENT_TERM; a blank
+grade clears that attempt, like the dashboard. CSV and
+JSON Lines sheets are streamed; every sheet is validated a batch at a time
+and upserted through the transcript key with executemany, all in one
+transaction.
+
+Exports stream straight from the cursor to CSV, JSON or JSON Lines, so memory
+use does not grow with the number of transcripts.
+
+    python grade_pipeline.py import fall_grades.csv [--dry-run]
+    python grade_pipeline.py export transcripts.csv [--student 2400001 ...]
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import namedtuple
+from itertools import islice
+
+import course_codes
+import db_connection
+import users_db
+
+VALID_GRADES = ("A+", "A", "B+", "B", "C+", "C", "D+", "D", "F", "IP")
+EXPORT_FIELDS = ("student_id", "course_code", "course_name", "credits", "term", "attempt", "grade")
+
+# errors: ["Row 12: Unknown course 'EE999'.", ...]
+GradeImportResult = namedtuple("GradeImportResult", "saved removed errors")
+
+
+class _DryRun(Exception):
+    """Raised at the end of a dry run so the transaction rolls back."""
+
+
+# ==========================================
+#  READING GRADE SHEETS
+# ==========================================
+def _json_lines(f):
+    """(line_num, object) per non-blank line; a line that doesn't parse gives (line_num, JSONDecodeError)."""
+    for n, line in enumerate(f, start=1):
+        if line.strip():
+            try:
+                yield n, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield n, e
+
+
+def read_sheet(file_path):
+    """
+    Yields (row_num, student_id, course_code, grade, term) as raw strings, one sheet row at a time.
+    A row that can't be read yields student_id None and the reason (or None) in place of the course code.
+    """
+    with open(file_path, newline='', encoding='utf-8') as f:
+        if os.path.splitext(file_path)[1].lower() in (".json", ".jsonl"):
+            first = f.read(1)
+            while first.isspace():
+                first = f.read(1)
+            f.seek(0)
+            if first == "[":
+                try:
+                    entries = enumerate(json.load(f), start=1)
+                except json.JSONDecodeError as e:
+                    yield e.lineno, None, f"Invalid JSON ({e.msg}).", None, None
+                    return
+            else:
+                entries = _json_lines(f)
+            for n, entry in entries:
+                if isinstance(entry, json.JSONDecodeError):
+                    yield n, None, f"Invalid JSON ({entry.msg}).", None, None
+                    continue
+                if not isinstance(entry, dict):
+                    yield n, None, None, None, None
+                    continue
+                yield (n, str(entry.get("student_id", "")), str(entry.get("course_code", "")),
+                       str(entry.get("grade") or ""), str(entry.get("term") or ""))
+        else:
+            for n, row in enumerate(csv.reader(f), start=1):
+                if n == 1 and row and not row[0].strip().isdigit():
+                    continue    # header line
+                if not row:
+                    continue
+                row += [""] * (4 - len(row))
+                yield n, row[0], row[1], row[2], row[3]
+
+
+# ==========================================
+#  IMPORT
+# ==========================================
+def import_grades(file_path, batch_size=5000, dry_run=False, term=None):
+    """
+    Imports a grade sheet. Rows with an unknown student or course, a grade
+    outside VALID_GRADES or a malformed term are reported and skipped; the rest
+    are written. Rows without a term go to `term` (default: the current term).
+    Returns a GradeImportResult.
+    """
+    term = term or users_db.CURRENT_TERM
+    saved = removed = 0
+    errors = []            # (row_num, message)
+    rows = read_sheet(file_path)
+    try:
+        with db_connection.transaction(immediate=True) as con:
+            courses = {row[0] for row in con.execute("SELECT course_code FROM courses")}
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                parsed = []
+                for n, sid, code, grade, row_term in batch:
+                    if sid is None:
+                        errors.append((n, f"Row {n}: {code or 'Not a grade entry.'}"))
+                        continue
+                    sid, code, grade = sid.strip(), course_codes.normalize_code(code), grade.strip().upper()
+                    row_term = row_term.strip() or term
+                    if not sid.isdigit() or not code:
+                        errors.append((n, f"Row {n}: Student id and course code are required."))
+                    elif code not in courses:
+                        errors.append((n, f"Row {n}: Unknown course '{code}'."))
+                    elif grade and grade not in VALID_GRADES:
+                        errors.append((n, f"Row {n}: Invalid grade '{grade}'."))
+                    elif not users_db.TERM_PATTERN.match(row_term):
+                        errors.append((n, f"Row {n}: Invalid term '{row_term}' (expected YYYY-n)."))
+                    else:
+                        parsed.append((n, int(sid), code, row_term, grade))
+
+                known = set()
+                ids = list({sid for _, sid, _, _, _ in parsed})
+                for part in users_db._chunks(ids):
+                    marks = ",".join("?" * len(part))
+                    known.update(r[0] for r in con.execute(f"SELECT id FROM students WHERE id IN ({marks})", part))
+                good = []
+                for n, sid, code, row_term, grade in parsed:
+                    if sid in known:
+                        good.append((sid, code, row_term, grade))
+                    else:
+                        errors.append((n, f"Row {n}: Unknown student {sid}."))
+                s, r = users_db.upsert_grades(good)
+                saved += s
+                removed += r
+            if dry_run:
+                raise _DryRun()
+    except _DryRun:
+        pass
+    errors = [msg for _, msg in sorted(errors, key=lambda e: e[0])]
+    return GradeImportResult(saved, removed, errors)
+
+
+# ==========================================
+#  EXPORT
+# ==========================================
+def iter_transcripts(student_ids=None):
+    """Yields EXPORT_FIELDS tuples in key order (student, course, term), straight off the cursor."""
+    sql = """
+        SELECT t.student_id, t.course_code, c.course_name, c.credits, t.term, t.attempt, t.grade
+        FROM transcripts t LEFT JOIN courses c ON c.course_code = t.course_code"""
+    con = db_connection.get_connection()
+    if student_ids is None:
+        yield from con.execute(sql + " ORDER BY t.student_id, t.course_code, t.term")
+        return
+    for sid in sorted(set(student_ids)):
+        yield from con.execute(sql + " WHERE t.student_id = ? ORDER BY t.course_code, t.term", (sid,))
+
+
+def export_transcripts(file_path, student_ids=None, fmt=None):
+    """
+    Writes transcripts to `file_path` as csv, json or jsonl (default: from the
+    file extension, else csv). Returns the number of rows written.
+    """
+    fmt = fmt or os.path.splitext(file_path)[1].lower().lstrip(".") or "csv"
+    if fmt not in ("csv", "json", "jsonl"):
+        raise ValueError(f"Unsupported export format '{fmt}'.")
+    count = 0
+    with open(file_path, "w", newline='', encoding='utf-8') as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_FIELDS)
+            for row in iter_transcripts(student_ids):
+                writer.writerow(row)
+                count += 1
+            return count
+        if fmt == "json":
+            f.write("[")
+        for row in iter_transcripts(student_ids):
+            text = json.dumps(dict(zip(EXPORT_FIELDS, row)))
+            if fmt == "json":
+                f.write(("," if count else "") + "\n" + text)
+            else:
+                f.write(text + "\n")
+            count += 1
+        if fmt == "json":
+            f.write("\n]\n")
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="upsert a CSV/JSON grade sheet")
+    imp.add_argument("file")
+    imp.add_argument("--batch-size", type=int, default=5000)
+    imp.add_argument("--term", help="term for rows without one (default: current term, YYYY-n)")
+    imp.add_argument("--dry-run", action="store_true", help="validate everything but write nothing")
+    exp = sub.add_parser("export", help="write transcripts to .csv / .json / .jsonl")
+    exp.add_argument("file")
+    exp.add_argument("--student", type=int, nargs="*", help="only these student ids")
+    args = parser.parse_args()
+
+    users_db.setup_database()
+    if args.command == "import":
+        result = import_grades(args.file, args.batch_size, args.dry_run, args.term)
+        print(f"{'Would save' if args.dry_run else 'Saved'} {result.saved} grades, "
+              f"removed {result.removed}, {len(result.errors)} errors.")
+        for err in result.errors[:50]:
+            print("  " + err)
+        sys.exit(1 if result.errors else 0)
+    else:
+        print(f"Exported {export_transcripts(args.file, args.student)} transcript rows to {args.file}.")
@@ -0,0 +1,399 @@
+import re
+import sys
+import db_connection
+
+# ==========================================
+#  VERSIONED SCHEMA MIGRATIONS
+# ==========================================
+# setup_database() creates the original tables; every change after that is a
+# numbered step here. Each step runs once, inside its own explicit
+# BEGIN IMMEDIATE transaction together with its schema_version row, so a step
+# that fails half-way (DDL included: sqlite3's `with con:` does not wrap
+# ALTER TABLE) leaves nothing behind and is simply retried on the next run.
+# To change the schema, APPEND a step: never edit or reorder one that has
+# already shipped. Steps only use SQL and helpers frozen in this file, never
+# the live modules (gpa_engine, course_codes, ...), so a later change there
+# can't change what an old step does to a fresh database.
+
+
+def _m001_hot_lookup_indexes(con):
+    con.execute("CREATE INDEX IF NOT EXISTS idx_transcripts_student ON transcripts(student_id)")
+    con.execute("CREATE INDEX IF NOT EXISTS idx_registration_course ON registration(course_code)")
+    con.execute("CREATE INDEX IF NOT EXISTS idx_waitlist_course_time ON waitlist(course_code, timestamp)")
+    con.execute("CREATE INDEX IF NOT EXISTS idx_prerequisites_course ON prerequisites(course_code)")
+    con.execute("CREATE INDEX IF NOT EXISTS idx_students_program ON students(program)")
+
+
+def _m002_catalog_version(con):
+    # Single-row counter bumped by triggers on every catalog write (courses,
+    # prerequisites, program plans), whichever code path made the change.
+    con.execute("""CREATE TABLE IF NOT EXISTS catalog_version(
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL)""")
+    con.execute("INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0)")
+    for table in ("courses", "prerequisites", "program_plans"):
+        for action in ("INSERT", "UPDATE", "DELETE"):
+            con.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_{table}_{action.lower()}_catalog_version
+                AFTER {action} ON {table}
+                BEGIN
+                    UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+                END""")
+
+
+def _m003_catalog_change_log(con):
+    # Append-only log of catalog edits so RegistrationSystem can apply just the
+    # deltas instead of rebuilding courses_data / program_plan from scratch.
+    #   entity 'course'  : action 'upsert' / 'delete'
+    #   entity 'prereq'  : action 'add' / 'remove', related_code = prereq_code
+    #   entity 'plan'    : action 'add' / 'remove', program + level set
+    con.execute("""CREATE TABLE IF NOT EXISTS catalog_changes(
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        entity TEXT NOT NULL,
+        action TEXT NOT NULL,
+        course_code TEXT,
+        related_code TEXT,
+        program TEXT,
+        level INTEGER)""")
+
+    log = "INSERT INTO catalog_changes (entity, action, course_code, related_code, program, level) VALUES "
+    triggers = {
+        "courses_insert": ("AFTER INSERT ON courses",
+                           log + "('course', 'upsert', NEW.course_code, NULL, NULL, NULL);"),
+        "courses_update": ("AFTER UPDATE ON courses",
+                           log + "('course', 'delete', OLD.course_code, NULL, NULL, NULL);" +
+                           log + "('course', 'upsert', NEW.course_code, NULL, NULL, NULL);"),
+        "courses_delete": ("AFTER DELETE ON courses",
+                           log + "('course', 'delete', OLD.course_code, NULL, NULL, NULL);"),
+        "prerequisites_insert": ("AFTER INSERT ON prerequisites",
+                                 log + "('prereq', 'add', NEW.course_code, NEW.prereq_code, NULL, NULL);"),
+        "prerequisites_update": ("AFTER UPDATE ON prerequisites",
+                                 log + "('prereq', 'remove', OLD.course_code, OLD.prereq_code, NULL, NULL);" +
+                                 log + "('prereq', 'add', NEW.course_code, NEW.prereq_code, NULL, NULL);"),
+        "prerequisites_delete": ("AFTER DELETE ON prerequisites",
+                                 log + "('prereq', 'remove', OLD.course_code, OLD.prereq_code, NULL, NULL);"),
+        "program_plans_insert": ("AFTER INSERT ON program_plans",
+                                 log + "('plan', 'add', NEW.course_code, NULL, NEW.program, NEW.level);"),
+        "program_plans_update": ("AFTER UPDATE ON program_plans",
+                                 log + "('plan', 'remove', OLD.course_code, NULL, OLD.program, OLD.level);" +
+                                 log + "('plan', 'add', NEW.course_code, NULL, NEW.program, NEW.level);"),
+        "program_plans_delete": ("AFTER DELETE ON program_plans",
+                                 log + "('plan', 'remove', OLD.course_code, NULL, OLD.program, OLD.level);"),
+    }
+    for name, (event, body) in triggers.items():
+        con.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{name}_change_log {event} BEGIN {body} END")
+
+
+def _m004_course_enrollment_counts(con):
+    # Materialized per-course seat counts, kept exact by triggers on registration,
+    # so capacity checks and dashboards read one row instead of COUNT(*)-ing.
+    con.execute("""CREATE TABLE IF NOT EXISTS course_enrollment(
+        course_code TEXT PRIMARY KEY,
+        enrolled INTEGER NOT NULL DEFAULT 0) WITHOUT ROWID""")
+    con.execute("DELETE FROM course_enrollment")
+    con.execute("""INSERT INTO course_enrollment (course_code, enrolled)
+        SELECT course_code, COUNT(*) FROM registration GROUP BY course_code""")
+
+    inc = ("INSERT INTO course_enrollment (course_code, enrolled) VALUES (NEW.course_code, 1) "
+           "ON CONFLICT(course_code) DO UPDATE SET enrolled = enrolled + 1;")
+    dec = "UPDATE course_enrollment SET enrolled = enrolled - 1 WHERE course_code = OLD.course_code;"
+    triggers = {
+        "registration_insert": ("AFTER INSERT ON registration", inc),
+        "registration_delete": ("AFTER DELETE ON registration", dec),
+        "registration_update": ("AFTER UPDATE OF course_code ON registration", dec + inc),
+    }
+    for name, (event, body) in triggers.items():
+        con.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{name}_enrollment {event} BEGIN {body} END")
+
+
+def _m005_waitlist_counts(con):
+    # Same idea as migration 4 for the waitlist: course_enrollment.waitlisted
+    # is kept exact by triggers on waitlist.
+    con.execute("ALTER TABLE course_enrollment ADD COLUMN waitlisted INTEGER NOT NULL DEFAULT 0")
+    con.execute("""INSERT INTO course_enrollment (course_code, waitlisted)
+        SELECT course_code, COUNT(*) FROM waitlist GROUP BY course_code
+        ON CONFLICT(course_code) DO UPDATE SET waitlisted = excluded.waitlisted""")
+
+    inc = ("INSERT INTO course_enrollment (course_code, waitlisted) VALUES (NEW.course_code, 1) "
+           "ON CONFLICT(course_code) DO UPDATE SET waitlisted = waitlisted + 1;")
+    dec = "UPDATE course_enrollment SET waitlisted = waitlisted - 1 WHERE course_code = OLD.course_code;"
+    triggers = {
+        "waitlist_insert": ("AFTER INSERT ON waitlist", inc),
+        "waitlist_delete": ("AFTER DELETE ON waitlist", dec),
+        "waitlist_update": ("AFTER UPDATE OF course_code ON waitlist", dec + inc),
+    }
+    for name, (event, body) in triggers.items():
+        con.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{name}_counts {event} BEGIN {body} END")
+
+
+def _m006_waitlist_sequence(con):
+    # Queue order is a per-course sequence number instead of the join timestamp
+    # (one-second resolution, so students who joined in the same second tied).
+    # New rows get MAX(seq) + 1 for their course from the (course_code, seq) index;
+    # leaving or being promoted just deletes a row, nothing is renumbered.
+    con.execute("ALTER TABLE waitlist ADD COLUMN seq INTEGER")
+    con.execute("""UPDATE waitlist SET seq = (
+        SELECT COUNT(*) FROM waitlist w
+        WHERE w.course_code = waitlist.course_code
+          AND (w.timestamp < waitlist.timestamp
+               OR (w.timestamp = waitlist.timestamp AND w.rowid <= waitlist.rowid)))""")
+    con.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_waitlist_course_seq ON waitlist(course_code, seq)")
+    con.execute("DROP INDEX IF EXISTS idx_waitlist_course_time")
+    con.execute("""CREATE TRIGGER IF NOT EXISTS trg_waitlist_insert_seq
+        AFTER INSERT ON waitlist WHEN NEW.seq IS NULL
+        BEGIN
+            UPDATE waitlist SET seq = (
+                SELECT COALESCE(MAX(seq), 0) + 1 FROM waitlist WHERE course_code = NEW.course_code)
+            WHERE rowid = NEW.rowid;
+        END""")
+
+
+def _m007_transcript_unique_key(con):
+    # One grade per (student, course) so grade writes can upsert instead of
+    # SELECT-then-UPDATE-or-INSERT. Of any duplicates the most recently written
+    # row wins. The unique index also serves every student_id lookup, so the
+    # old single-column index goes.
+    con.execute("""DELETE FROM transcripts WHERE rowid NOT IN (
+        SELECT MAX(rowid) FROM transcripts GROUP BY student_id, course_code)""")
+    con.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_transcripts_student_course "
+                "ON transcripts(student_id, course_code)")
+    con.execute("DROP INDEX IF EXISTS idx_transcripts_student")
+
+
+def _m008_transcript_terms(con):
+    # Transcripts become one row per attempt: the key is (student_id,
+    # course_code, term) and `attempt` numbers a student's attempts at a course
+    # in term order (retakes). Rows from before terms were recorded get term ''
+    # (sorts first, attempt 1). Triggers renumber a course's attempts only when
+    # the student has taken it in another term, so first attempts cost nothing.
+    con.execute("ALTER TABLE transcripts ADD COLUMN term TEXT NOT NULL DEFAULT ''")
+    con.execute("ALTER TABLE transcripts ADD COLUMN attempt INTEGER NOT NULL DEFAULT 1")
+    con.execute("""DELETE FROM transcripts WHERE rowid NOT IN (
+        SELECT MAX(rowid) FROM transcripts GROUP BY student_id, course_code, term)""")
+    con.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_transcripts_key ON transcripts(student_id, course_code, term)")
+    con.execute("DROP INDEX IF EXISTS idx_transcripts_student_course")
+
+    renumber = """UPDATE transcripts SET attempt = (
+            SELECT COUNT(*) FROM transcripts t
+            WHERE t.student_id = transcripts.student_id AND t.course_code = transcripts.course_code
+              AND t.term <= transcripts.term)
+        WHERE student_id = {row}.student_id AND course_code = {row}.course_code;"""
+    retaken = """EXISTS (SELECT 1 FROM transcripts
+        WHERE student_id = {row}.student_id AND course_code = {row}.course_code AND term <> {row}.term)"""
+    triggers = {
+        "insert": ("AFTER INSERT ON transcripts", "NEW"),
+        "delete": ("AFTER DELETE ON transcripts", "OLD"),
+        "update": ("AFTER UPDATE OF term ON transcripts", "NEW"),
+    }
+    for name, (event, row) in triggers.items():
+        con.execute(f"CREATE TRIGGER IF NOT EXISTS trg_transcripts_{name}_attempt {event} "
+                    f"WHEN {retaken.format(row=row)} BEGIN {renumber.format(row=row)} END")
+
+
+# gpa_engine's grade scale and aggregate queries as of migration 9
+_M009_POINTS_SQL = ("CASE UPPER(t.grade) WHEN 'A+' THEN 5.0 WHEN 'A' THEN 4.75 WHEN 'B+' THEN 4.5 "
+                    "WHEN 'B' THEN 4.0 WHEN 'C+' THEN 3.5 WHEN 'C' THEN 3.0 WHEN 'D+' THEN 2.5 "
+                    "WHEN 'D' THEN 2.0 WHEN 'F' THEN 1.0 END")
+_M009_GRADED_SQL = "UPPER(t.grade) IN ('A+', 'A', 'B+', 'B', 'C+', 'C', 'D+', 'D', 'F')"
+
+
+def _m009_fill_gpa(con):
+    """Recomputes student_gpa / student_term_gpa for everyone, as migration 9 defined them."""
+    con.execute("DELETE FROM student_term_gpa")
+    con.execute("DELETE FROM student_gpa")
+    con.execute(f"""INSERT INTO student_term_gpa (student_id, term, points, credits)
+        SELECT t.student_id, t.term, SUM({_M009_POINTS_SQL} * c.credits), SUM(c.credits)
+        FROM transcripts t JOIN courses c ON c.course_code = t.course_code
+        WHERE {_M009_GRADED_SQL}
+        GROUP BY t.student_id, t.term""")
+    # Cumulative: latest attempt only (no row of the same course in a later term)
+    con.execute(f"""INSERT INTO student_gpa (student_id, points, credits)
+        SELECT t.student_id, SUM({_M009_POINTS_SQL} * c.credits), SUM(c.credits)
+        FROM transcripts t JOIN courses c ON c.course_code = t.course_code
+        WHERE {_M009_GRADED_SQL}
+          AND NOT EXISTS (SELECT 1 FROM transcripts x
+                          WHERE x.student_id = t.student_id AND x.course_code = t.course_code AND x.term > t.term)
+        GROUP BY t.student_id""")
+
+
+def _m009_gpa_aggregates(con):
+    # Cached quality points / credits per student (cumulative) and per term,
+    # maintained by gpa_engine on every grade write; filled once here.
+    con.execute("""CREATE TABLE IF NOT EXISTS student_gpa(
+        student_id INTEGER PRIMARY KEY,
+        points REAL NOT NULL,
+        credits INTEGER NOT NULL)""")
+    con.execute("""CREATE TABLE IF NOT EXISTS student_term_gpa(
+        student_id INTEGER NOT NULL,
+        term TEXT NOT NULL,
+        points REAL NOT NULL,
+        credits INTEGER NOT NULL,
+        PRIMARY KEY (student_id, term)) WITHOUT ROWID""")
+    con.execute("CREATE INDEX IF NOT EXISTS idx_student_term_gpa_term ON student_term_gpa(term)")
+    _m009_fill_gpa(con)
+
+
+def _m010_canonical_code(code):
+    """course_codes.normalize_code() as of migration 10: upper case, no whitespace."""
+    return None if code is None else re.sub(r"\s+", "", str(code)).upper()
+
+
+def _m010_canonical_course_codes(con):
+    # Rewrites every stored course code to course_codes.normalize_code() form.
+    # Where the canonical row already exists ("EE201" next to "EE 201"), the
+    # canonical row wins and the duplicate is dropped. Counter triggers see the
+    # renames, so enrollment / waitlist counts stay exact.
+    con.create_function("canonical_code", 1, _m010_canonical_code, deterministic=True)
+    stale = "course_code <> canonical_code(course_code)"
+
+    for table in ("courses", "program_plans", "registration", "transcripts"):
+        con.execute(f"UPDATE OR IGNORE {table} SET course_code = canonical_code(course_code) WHERE {stale}")
+        con.execute(f"DELETE FROM {table} WHERE {stale}")
+
+    con.execute(f"""UPDATE prerequisites SET course_code = canonical_code(course_code),
+                                             prereq_code = canonical_code(prereq_code)
+                    WHERE {stale} OR prereq_code <> canonical_code(prereq_code)""")
+    con.execute("""DELETE FROM prerequisites WHERE course_code = prereq_code OR rowid NOT IN (
+        SELECT MIN(rowid) FROM prerequisites GROUP BY course_code, prereq_code)""")
+
+    # Waitlist entries move to the back of the canonical course's queue, in their old order
+    for sid, code in con.execute(f"SELECT student_id, course_code FROM waitlist WHERE {stale} "
+                                 "ORDER BY course_code, seq").fetchall():
+        canonical = _m010_canonical_code(code)
+        if con.execute("SELECT 1 FROM waitlist WHERE student_id=? AND course_code=?", (sid, canonical)).fetchone():
+            con.execute("DELETE FROM waitlist WHERE student_id=? AND course_code=?", (sid, code))
+        else:
+            con.execute("""UPDATE waitlist SET course_code = ?,
+                seq = (SELECT COALESCE(MAX(seq), 0) + 1 FROM waitlist WHERE course_code = ?)
+                WHERE student_id = ? AND course_code = ?""", (canonical, canonical, sid, code))
+    con.execute(f"DELETE FROM course_enrollment WHERE {stale} AND enrolled = 0 AND waitlisted = 0")
+
+    # Merged transcripts: renumber retake attempts and rebuild the cached GPAs
+    con.execute("""UPDATE transcripts SET attempt = (
+        SELECT COUNT(*) FROM transcripts t
+        WHERE t.student_id = transcripts.student_id AND t.course_code = transcripts.course_code
+          AND t.term <= transcripts.term)""")
+    _m009_fill_gpa(con)
+
+    # Code lookups that used to scan: students of a course, courses requiring a course
+    con.execute("CREATE INDEX IF NOT EXISTS idx_transcripts_course ON transcripts(course_code)")
+    con.execute("CREATE INDEX IF NOT EXISTS idx_prerequisites_prereq ON prerequisites(prereq_code)")
+
+
+# (version, description, function(con))
+MIGRATIONS = [
+    (1, "Indexes for hot lookup columns", _m001_hot_lookup_indexes),
+    (2, "Catalog version counter", _m002_catalog_version),
+    (3, "Catalog change log", _m003_catalog_change_log),
+    (4, "Materialized per-course enrollment counts", _m004_course_enrollment_counts),
+    (5, "Materialized per-course waitlist counts", _m005_waitlist_counts),
+    (6, "Per-course waitlist sequence numbers", _m006_waitlist_sequence),
+    (7, "Unique transcript key per student and course", _m007_transcript_unique_key),
+    (8, "Transcript terms and retake attempts", _m008_transcript_terms),
+    (9, "Cached GPA aggregates", _m009_gpa_aggregates),
+    (10, "Canonical course codes", _m010_canonical_course_codes),
+]
+
+
+def get_schema_version(con=None):
+    con = con or db_connection.get_connection()
+    con.execute("""CREATE TABLE IF NOT EXISTS schema_version(
+        version INTEGER PRIMARY KEY,
+        description TEXT,
+        applied_at DATETIME DEFAULT CURRENT_TIMESTAMP)""")
+    return con.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def migrate(con=None):
+    """Applies every pending migration in order. Returns the list of versions applied."""
+    con = con or db_connection.get_connection()
+    with con:
+        current = get_schema_version(con)
+
+    applied = []
+    for version, description, step in MIGRATIONS:
+        if version <= current:
+            continue
+        if con.in_transaction:
+            con.commit()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have applied it while we waited for the write lock
+            if get_schema_version(con) >= version:
+                con.rollback()
+                continue
+            step(con)
+            con.execute("INSERT INTO schema_version (version, description) VALUES (?, ?)", (version, description))
+        except BaseException:
+            con.rollback()
+            raise
+        con.commit()
+        applied.append(version)
+        print(f"Applied migration {version}: {description}")
+    return applied
+
+
+# ==========================================
+#  QUERY PLAN CHECK
+# ==========================================
+# The queries the dashboards run on every refresh. If any of them goes back to
+# a full table scan (e.g. an index was dropped), check_query_plans() reports it.
+HOT_QUERIES = [
+    ("get_completed_courses",
+     "SELECT course_code FROM transcripts WHERE student_id=?", (1,)),
+    ("get_current_enrollments",
+     "SELECT course_code, enrolled FROM course_enrollment WHERE enrolled > 0", ()),
+    ("enrollment count per course",
+     "SELECT enrolled FROM course_enrollment WHERE course_code=?", ("EE201",)),
+    ("waitlist positions of a student",
+     """SELECT w.course_code, (SELECT COUNT(*) FROM waitlist x
+                               WHERE x.course_code = w.course_code AND x.seq <= w.seq)
+        FROM waitlist w WHERE w.student_id = ?""", (1,)),
+    ("next student on a waitlist",
+     "SELECT student_id FROM waitlist WHERE course_code=? ORDER BY seq LIMIT 1", ("EE201",)),
+    ("prerequisites of a course",
+     "SELECT prereq_code FROM prerequisites WHERE course_code=?", ("EE201",)),
+    ("cumulative GPA of a student",
+     "SELECT points, credits FROM student_gpa WHERE student_id=?", (1,)),
+    ("dean's list of a term",
+     "SELECT student_id FROM student_term_gpa WHERE term=? AND credits >= 12", ("2025-3",)),
+    ("students who took a course",
+     "SELECT DISTINCT student_id FROM transcripts WHERE course_code=?", ("EE201",)),
+    ("courses requiring a course",
+     "SELECT course_code FROM prerequisites WHERE prereq_code=?", ("EE250",)),
+    ("students in a program",
+     "SELECT id FROM students WHERE program=?", ("Computer",)),
+]
+
+
+# Counter tables hold one small row per course and are meant to be read whole
+ALLOWED_SCANS = ("course_enrollment",)
+
+
+def check_query_plans(con=None):
+    """Returns a list of (query name, plan line) for every hot query that scans a whole table."""
+    con = con or db_connection.get_connection()
+    failures = []
+    for name, sql, params in HOT_QUERIES:
+        for row in con.execute("EXPLAIN QUERY PLAN " + sql, params):
+            detail = row[-1]
+            # "SCAN registration USING COVERING INDEX ..." walks an index, which is fine
+            if detail.startswith("SCAN") and "INDEX" not in detail and detail.split()[1] not in ALLOWED_SCANS:
+                failures.append((name, detail))
+    return failures
+
+
+if __name__ == "__main__":
+    import users_db
+    users_db.setup_database()
+    if "--check" in sys.argv:
+        problems = check_query_plans()
+        for name, detail in problems:
+            print(f"FULL SCAN in '{name}': {detail}")
+        if problems:
+            sys.exit(1)
+        print("All hot queries use an index.")
+    if "--rebuild-counters" in sys.argv:
+        fixed = users_db.rebuild_enrollment_counters()
+        for code, enrolled, waitlisted in fixed:
+            print(f"Repaired {code} (was enrolled={enrolled}, waitlisted={waitlisted})")
+        print(f"Enrollment counters rebuilt; {len(fixed)} course(s) had drifted.")
@@ -1,5 +1,5 @@
-import sqlite3
 import users_db
+import db_connection
 
 def populate_all_plans():
     """Assigns ALL existing courses to ALL programs (Level 1) for testing."""
@@ -14,7 +14,7 @@ def populate_all_plans():
     
     print("--- Populating Program Plans ---")
     
-    with sqlite3.connect('User.db') as con:
+    with db_connection.get_connection() as con:
         cur = con.cursor()
         
         for course in all_courses:
@@ -0,0 +1,172 @@
+from collections import deque
+
+from course_codes import CODES, normalize_code
+
+# ==========================================
+#  PREREQUISITE GRAPH (DAG)
+# ==========================================
+# Built from the flat prerequisites(course_code, prereq_code) rows.
+# Every course is addressed by its shared id from course_codes.CODES (the same
+# id the Catalog columns use); each course's prerequisites are kept as a
+# bitset (Python int), so "which courses can this student take?" is a
+# bitwise check against the student's completed-course bitset.
+
+
+class PrerequisiteGraph:
+    def __init__(self, pairs=(), codes=()):
+        """`pairs` are (course_code, prereq_code); `codes` adds courses that have no prerequisites."""
+        self.codes = CODES.codes    # id -> code, shared
+        self.index = {}             # code -> id, courses in this graph
+        self.direct = []            # direct[i]  = bitset of i's own prerequisites (0 for ids not in the graph)
+        for code in codes:
+            self._id(code)
+        for course, prereq in pairs:
+            i = self._id(course)
+            j = self._id(prereq)
+            self.direct[i] |= 1 << j
+        self._compute()
+
+    @classmethod
+    def from_courses_data(cls, courses_data):
+        pairs = [(code, p) for code, d in courses_data.items() for p in d.get("prerequisites", [])]
+        return cls(pairs, courses_data.keys())
+
+    def _id(self, code):
+        i = self.index.get(code)
+        if i is None:
+            i = CODES.id(code)
+            self.index[code] = i
+            if len(self.direct) <= i:
+                self.direct.extend([0] * (i + 1 - len(self.direct)))
+        return i
+
+    def _compute(self):
+        """Topological order (Kahn), transitive closure and unlock depth."""
+        n = len(self.direct)
+        dependents = [[] for _ in range(n)]
+        indegree = [0] * n
+        for i, m in enumerate(self.direct):
+            while m:
+                low = m & -m
+                dependents[low.bit_length() - 1].append(i)
+                indegree[i] += 1
+                m ^= low
+
+        order = []
+        queue = deque(i for i in range(n) if indegree[i] == 0)
+        while queue:
+            i = queue.popleft()
+            order.append(i)
+            for d in dependents[i]:
+                indegree[d] -= 1
+                if indegree[d] == 0:
+                    queue.append(d)
+
+        # closure[i] = every course that must be passed (directly or indirectly) before i
+        # depth[i]   = length of the longest prerequisite chain below i (0 = no prerequisites)
+        self.closure = [0] * n
+        self.depth = [0] * n
+        for i in order:
+            m = self.direct[i]
+            closure = m
+            depth = 0
+            while m:
+                low = m & -m
+                j = low.bit_length() - 1
+                closure |= self.closure[j]
+                depth = max(depth, self.depth[j] + 1)
+                m ^= low
+            self.closure[i] = closure
+            self.depth[i] = depth
+        members = set(self.index.values())
+        self.order = [self.codes[i] for i in order if i in members]
+        # Anything Kahn could not order sits on (or behind) a cycle
+        self.cyclic = {self.codes[i] for i in range(n) if indegree[i] > 0}
+
+    # -----------------------------------------------------------
+    def find_cycle(self):
+        """Returns one cycle as [A, B, ..., A] (A requires B requires ... A), or None."""
+        if not self.cyclic:
+            return None
+        cyclic = {self.index[c] for c in self.cyclic}
+        start = next(iter(cyclic))
+        # Every node left in `cyclic` has a prerequisite inside it, so walking always closes a loop
+        path = []
+        seen = {}
+        i = start
+        while i not in seen:
+            seen[i] = len(path)
+            path.append(i)
+            m = self.direct[i]
+            while m:
+                low = m & -m
+                j = low.bit_length() - 1
+                if j in cyclic:
+                    i = j
+                    break
+                m ^= low
+        loop = path[seen[i]:] + [i]
+        return [self.codes[k] for k in loop]
+
+    # -----------------------------------------------------------
+    def mask(self, codes):
+        m = 0
+        for code in codes:
+            i = self.index.get(code)
+            if i is not None:
+                m |= 1 << i
+        return m
+
+    def missing_mask(self, code, completed_mask):
+        """
+        Bitset of the direct prerequisites of `code` not inside `completed_mask` (0 = eligible).
+        Raises KeyError for a course the graph doesn't know, rather than calling it eligible.
+        """
+        i = self.index.get(code)
+        if i is None:
+            i = self.index.get(normalize_code(code))    # "ee 201" is still EE201
+            if i is None:
+                raise KeyError(f"Unknown course {code}")
+        return self.direct[i] & ~completed_mask
+
+    def missing(self, code, completed):
+        """Direct prerequisites of `code` that are not in `completed`."""
+        lacking = self.missing_mask(code, self.mask(completed))
+        return [self.codes[j] for j in range(lacking.bit_length()) if lacking >> j & 1]
+
+    def eligible_mask(self, completed_mask):
+        """Bitset of every course whose direct prerequisites are all inside `completed_mask`."""
+        result = 0
+        direct = self.direct
+        for i in set(self.index.values()):
+            if not direct[i] & ~completed_mask:
+                result |= 1 << i
+        return result
+
+    def eligible(self, completed, candidates=None):
+        """Set of course codes (optionally limited to `candidates`) the student may take now."""
+        m = self.eligible_mask(self.mask(completed))
+        pool = self.index if candidates is None else candidates
+        return {c for c in pool if c in self.index and m >> self.index[c] & 1}
+
+    def all_prerequisites(self, code):
+        """Transitive closure: every course needed, directly or indirectly, before `code`."""
+        i = self.index.get(code)
+        if i is None:
+            return set()
+        m = self.closure[i]
+        return {self.codes[j] for j in range(m.bit_length()) if m >> j & 1}
+
+    def unlock_depth(self, code):
+        i = self.index.get(code)
+        return self.depth[i] if i is not None else 0
+
+
+def find_cycle_after_edit(pairs, course_code, new_prereqs):
+    """
+    Would replacing `course_code`'s prerequisites with `new_prereqs` create a cycle?
+    `pairs` are the current (course_code, prereq_code) rows. Returns the cycle or None.
+    """
+    kept = [(c, p) for c, p in pairs if c != course_code]
+    graph = PrerequisiteGraph(kept + [(course_code, p) for p in new_prereqs])
+    return graph.find_cycle()
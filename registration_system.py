@@ -1,6 +1,12 @@
 from typing import List, Tuple
+import sqlite3
 import users_db
 from registration_validator import RegistrationValidator
+from schedule_engine import ScheduleIndex, ConflictMatrix
+from prereq_graph import PrerequisiteGraph
+import waitlist_promotion
+import db_connection
+import course_codes
 from Student import Student
 
 
@@ -13,214 +19,144 @@ class RegistrationSystem:
     """
 
     def __init__(self, max_credits: int = 18, min_credits: int = 0):
-        # Load course and program data once (can be refreshed later if needed)
-        self.courses_data = users_db.get_all_courses_data()
+        # Load course and program data once; refresh_data() only reloads when
+        # the catalog version in the database has moved on.
+        # (Version is read BEFORE loading so a change made during the load is not missed.)
+        self.catalog_version = users_db.get_catalog_version()
+        self.change_seq = users_db.get_catalog_change_seq()
+        # Compact column-wise catalog; still reads like the old dict of dicts
+        self.courses_data = users_db.get_catalog()
         self.program_plan = users_db.get_full_program_plan()
+        # Meeting slots parsed once per catalog load, shared by the validator and the GUI
+        self.schedule = ScheduleIndex(self.courses_data)
+        # Pairwise conflict bits, built lazily once per catalog version (see conflict_matrix())
+        self._conflicts = None
+        # Prerequisite DAG (closure + bitsets), rebuilt whenever the catalog changes
+        self.prereqs = PrerequisiteGraph.from_courses_data(self.courses_data)
 
         # Create a validator instance that will be reused
         self.validator = RegistrationValidator(
             self.courses_data,
             self.program_plan,
             max_credits=max_credits,
-            min_credits=min_credits
+            min_credits=min_credits,
+            schedule=self.schedule,
+            prereqs=self.prereqs
         )
 
     # ------------------------------------------------------------------
-    def refresh_data(self):
+    def refresh_data(self, force: bool = False) -> bool:
         """
-        Reloads course and program data from the database.
-        Call this if the admin updates courses or program plans.
+        Reloads course and program data, but only if the catalog changed
+        (admin edited courses, prerequisites or program plans) since the last load.
+        Returns True if a reload happened.
         """
-        self.courses_data = users_db.get_all_courses_data()
-        self.program_plan = users_db.get_full_program_plan()
-        self.validator.courses_data = self.courses_data
-        self.validator.program_plan = self.program_plan
+        version = users_db.get_catalog_version()
+        if not force and version is not None and version == self.catalog_version:
+            return False
+
+        self.catalog_version = version
+        self._conflicts = None
+        self.validator.conflicts = None
+        if force or not self.apply_catalog_changes():
+            self.change_seq = users_db.get_catalog_change_seq()
+            self.courses_data = users_db.get_catalog()
+            self.program_plan = users_db.get_full_program_plan()
+            self.schedule = ScheduleIndex(self.courses_data)
+            self.validator.courses_data = self.courses_data
+            self.validator.program_plan = self.program_plan
+            self.validator.schedule = self.schedule
+        # Building the graph is linear in the number of prerequisite rows
+        self.prereqs = PrerequisiteGraph.from_courses_data(self.courses_data)
+        self.validator.prereqs = self.prereqs
+        return True
 
     # ------------------------------------------------------------------
-    def register_courses_for_student(
-        self,
-        student: Student,
-        selected_courses: List[str]
-    ) -> Tuple[bool, str]:
+    def conflict_matrix(self) -> ConflictMatrix:
         """
-        High-level registration flow:
-        1) Load student completed courses + current enrollments.
-        2) Run all validation checks through RegistrationValidator.
-        3) If OK → insert into registration table, or waitlist if full.
-        4) Return (status, message) for GUI / caller.
-
-        This is the "Execution System", not the validator itself.
+        Returns the course x course conflict bitsets for the current catalog.
+        Loaded from the file saved next to the database when its fingerprint matches
+        the schedule index, otherwise built from the index and saved for the next session.
         """
+        if self._conflicts is None:
+            matrix = ConflictMatrix.load_or_build(db_connection.DB_PATH + ".conflicts.json", self.schedule)
+            self._conflicts = matrix
+            self.validator.conflicts = matrix
+        return self._conflicts
 
-        if not selected_courses:
-            return False, "No courses selected."
-
-        # Make sure data is up-to-date (optional, but safer)
-        self.refresh_data()
-
-        student_id = student.user_id
-
-        # Load student's completed courses from transcripts
-        completed_courses = users_db.get_completed_courses(student_id)
-
-        # Current enrollments per course (for capacity / schedule checks)
-        current_enrollments = users_db.get_current_enrollments()
-
-        # 1) Run validation using RegistrationValidator
-        is_valid, message = self.validator.validate_registration(
-            selected_courses=selected_courses,
-            completed_courses=completed_courses,
-            student_program=student.program,
-            student_level=student.level,
-            current_enrollments=current_enrollments
-        )
-
-        if not is_valid:
-            # Validation failed → do NOT touch the database
-            return False, message
-
-        # 2) Execute registration (DB changes)
-        registered = []
-        waitlisted = []
-
-        # Refresh enrollments just before writing, to be extra safe
-        current_enrollments = users_db.get_current_enrollments()
+    def has_conflict_matrix(self) -> bool:
+        return self._conflicts is not None
 
-        for course_code in selected_courses:
-            course_info = self.courses_data.get(course_code, {})
-            max_cap = course_info.get("max_capacity", 0)
-            enrolled_now = current_enrollments.get(course_code, 0)
-
-            if enrolled_now < max_cap:
-                # Seat available → register student
-                users_db.register_course_for_student(student_id, course_code)
-                registered.append(course_code)
-                current_enrollments[course_code] = enrolled_now + 1
-            else:
-                # Course is full → add to waitlist
-                users_db.add_to_waitlist(student_id, course_code)
-                waitlisted.append(course_code)
-
-        # 3) Build final message
-        if registered and waitlisted:
-            msg = (
-                f"Registered in: {', '.join(registered)}. "
-                f"Added to waitlist for: {', '.join(waitlisted)}."
-            )
-        elif registered:
-            msg = f"Registered in: {', '.join(registered)}."
-        elif waitlisted:
-            msg = (
-                "All selected courses are full. "
-                f"Added to waitlist for: {', '.join(waitlisted)}."
-            )
-        else:
-            msg = "No changes were made."
-
-        return True, msg
-
-    # ------------------------------------------------------------------
-    def drop_course_for_student(
-        self,
-        student: Student,
-        course_code: str
-    ) -> Tuple[bool, str]:
+    def conflict_matrix_job(self):
         """
-        Drops a course for the given student.
-        Optionally, it can move the next student from the waitlist into the course.
+        (key, fn, args) to load or build the matrix on a DataWorker instead:
+        fn(*args) only reads a copy of the schedule, so it is safe off the GUI thread.
+        Pass the key and fn's result to install_conflict_matrix() on the GUI thread.
         """
-
-        student_id = student.user_id
-
-        # First, remove the registration entry for this student
-        users_db.drop_course_for_student(student_id, course_code)
-
-        # Try to move the next student from waitlist to registration
-        import sqlite3
-        moved_from_waitlist = False
-        next_student_id = None
-
-        with sqlite3.connect('User.db') as con:
-            cur = con.cursor()
-
-            # Find the earliest student in waitlist for that course
-            cur.execute(
-                """
-                SELECT student_id 
-                FROM waitlist 
-                WHERE course_code = ? 
-                ORDER BY timestamp ASC 
-                LIMIT 1
-                """,
-                (course_code,)
-            )
-            row = cur.fetchone()
-
-            if row:
-                next_student_id = row[0]
-                # Register that student
-                users_db.register_course_for_student(next_student_id, course_code)
-
-                # Remove them from waitlist
-                cur.execute(
-                    "DELETE FROM waitlist WHERE student_id = ? AND course_code = ?",
-                    (next_student_id, course_code)
-                )
-                con.commit()
-                moved_from_waitlist = True
-
-        if moved_from_waitlist:
-            return True, (
-                f"Dropped {course_code} for student {student_id}. "
-                f"Next student from waitlist ({next_student_id}) was registered."
-            )
-
-        return True, f"Dropped {course_code} for student {student_id}. No one on waitlist."
+        key = (self.catalog_version, self.change_seq)
+        return key, ConflictMatrix.load_or_build, (db_connection.DB_PATH + ".conflicts.json", self.schedule.copy())
+
+    def install_conflict_matrix(self, key, matrix: ConflictMatrix) -> bool:
+        """Adopts a matrix from conflict_matrix_job(), unless the catalog moved on while it was built."""
+        if self._conflicts is not None or key != (self.catalog_version, self.change_seq):
+            return False
+        matrix.schedule = self.schedule     # fall back to the live index for codes added later
+        self._conflicts = matrix
+        self.validator.conflicts = matrix
+        return True
 
     # ------------------------------------------------------------------
-    def get_student_registered_courses(self, student: Student) -> List[str]:
+    def apply_catalog_changes(self) -> bool:
         """
-        Returns a set/list of course codes the student is currently registered in.
-        Can be used by Student Dashboard to display the timetable.
+        Applies only the catalog edits logged since our last sequence number
+        to courses_data and program_plan (in place, so the validator sees them too).
+        Returns False if the change log cannot bring us up to date
+        (not migrated, or pruned past our position) and a full reload is needed.
         """
-        return list(users_db.get_registered_courses(student.user_id))
-from typing import List, Tuple
-import users_db
-from registration_validator import RegistrationValidator
-from Student import Student
-
-
-class RegistrationSystem:
-    """
-    Executes the actual registration logic after validation.
-    - Talks to the database (registration & waitlist tables).
-    - Uses RegistrationValidator for all business rules.
-    - Returns clear status messages to the GUI layer.
-    """
-
-    def __init__(self, max_credits: int = 18, min_credits: int = 0):
-        # Load course and program data once (can be refreshed later if needed)
-        self.courses_data = users_db.get_all_courses_data()
-        self.program_plan = users_db.get_full_program_plan()
-
-        # Create a validator instance that will be reused
-        self.validator = RegistrationValidator(
-            self.courses_data,
-            self.program_plan,
-            max_credits=max_credits,
-            min_credits=min_credits
-        )
-
-    # ------------------------------------------------------------------
-    def refresh_data(self):
-        """
-        Reloads course and program data from the database.
-        Call this if the admin updates courses or program plans.
-        """
-        self.courses_data = users_db.get_all_courses_data()
-        self.program_plan = users_db.get_full_program_plan()
-        self.validator.courses_data = self.courses_data
-        self.validator.program_plan = self.program_plan
+        if self.change_seq is None:
+            return False
+        oldest, changes = users_db.get_catalog_changes_since(self.change_seq)
+        if not changes:
+            return True
+        if oldest > self.change_seq + 1:
+            return False
+
+        # Courses whose row / prerequisites must be re-read, and courses that are gone
+        dirty = set()
+        removed = set()
+        for seq, entity, action, code, related, program, level in changes:
+            if entity == "course" and action == "delete":
+                removed.add(code)
+                dirty.discard(code)
+            elif entity in ("course", "prereq"):
+                dirty.add(code)
+                removed.discard(code)
+            elif entity == "plan":
+                levels = self.program_plan[program][level]
+                if action == "add" and code not in levels:
+                    levels.append(code)
+                elif action == "remove" and code in levels:
+                    levels.remove(code)
+                if not levels:
+                    del self.program_plan[program][level]
+                if not self.program_plan[program]:
+                    del self.program_plan[program]
+
+        for code in removed:
+            self.courses_data.pop(code, None)
+            self.schedule.remove(code)
+        if dirty:
+            fresh = users_db.get_all_courses_data(dirty)
+            for code in dirty:
+                if code in fresh:
+                    self.courses_data[code] = fresh[code]
+                    self.schedule.update(code, fresh[code])
+                else:
+                    self.courses_data.pop(code, None)
+                    self.schedule.remove(code)
+
+        self.change_seq = changes[-1][0]
+        return True
 
     # ------------------------------------------------------------------
     def register_courses_for_student(
@@ -236,11 +172,14 @@ class RegistrationSystem:
         4) Return (status, message) for GUI / caller.
         """
 
+        # Same canonical codes the validator checks are the ones written
+        selected_courses = course_codes.normalize_codes(selected_courses)
         if not selected_courses:
             return False, "No courses selected."
 
-        # Ensure data is up-to-date
+        # Cheap when nothing changed: one lookup of the catalog version
         self.refresh_data()
+        self.conflict_matrix()
 
         student_id = student.user_id
 
@@ -267,25 +206,15 @@ class RegistrationSystem:
         # -----------------------------
         # EXECUTION (write to DB)
         # -----------------------------
-        registered = []
-        waitlisted = []
-
-        current_enrollments = users_db.get_current_enrollments()
-
-        for course_code in selected_courses:
-            course_info = self.courses_data.get(course_code, {})
-            max_cap = course_info.get("max_capacity", 0)
-            enrolled_now = current_enrollments.get(course_code, 0)
-
-            if enrolled_now < max_cap:
-                # Seat available → register student
-                users_db.register_course_for_student(student_id, course_code)
-                registered.append(course_code)
-                current_enrollments[course_code] = enrolled_now + 1
-            else:
-                # Course full → send to waitlist
-                users_db.add_to_waitlist(student_id, course_code)
-                waitlisted.append(course_code)
+        # One transaction for the whole selection: the seat check happens inside
+        # the INSERT itself, full courses fall back to the waitlist, and any
+        # failure leaves the database untouched.
+        try:
+            registered, waitlisted = users_db.register_courses_atomic(student_id, selected_courses)
+        except ValueError as e:
+            return False, str(e)
+        except sqlite3.Error as e:
+            return False, f"Database Error: {e}"
 
         # -----------------------------
         # FINAL MESSAGE TO STUDENT
@@ -319,52 +248,47 @@ class RegistrationSystem:
         """
 
         student_id = student.user_id
+        course_code = course_codes.normalize_code(course_code)
 
-        users_db.drop_course_for_student(student_id, course_code)
-
-        import sqlite3
-        moved_from_waitlist = False
-        next_student_id = None
-
-        with sqlite3.connect('User.db') as con:
-            cur = con.cursor()
-
-            # Get earliest waitlisted student
-            cur.execute(
-                """
-                SELECT student_id 
-                FROM waitlist 
-                WHERE course_code = ? 
-                ORDER BY timestamp ASC 
-                LIMIT 1
-                """,
-                (course_code,)
-            )
-            row = cur.fetchone()
-
-            if row:
-                next_student_id = row[0]
-
-                # Register that student
-                users_db.register_course_for_student(next_student_id, course_code)
-
-                # Remove them from waitlist
-                cur.execute(
-                    "DELETE FROM waitlist WHERE student_id = ? AND course_code = ?",
-                    (next_student_id, course_code)
-                )
-                con.commit()
-
-                moved_from_waitlist = True
-
-        if moved_from_waitlist:
+        # Drop + promotion of the next eligible waitlisted student(s) happen in one transaction
+        self.refresh_data()
+        self.conflict_matrix()
+        with db_connection.transaction(immediate=True) as con:
+            if con.execute("DELETE FROM registration WHERE student_id=? AND course_code=?",
+                           (student_id, course_code)).rowcount == 0:
+                return False, f"You are not registered in {course_code}."
+            # Only a freed seat can be handed to the waitlist
+            result = waitlist_promotion.promote_waitlisted(self.validator, [course_code])
+
+        if result.promoted:
+            ids = ", ".join(str(sid) for sid, _ in result.promoted)
             return True, (
                 f"Dropped {course_code}. "
-                f"Waitlisted student ({next_student_id}) has now been registered."
+                f"Waitlisted student ({ids}) has now been registered."
             )
 
         return True, f"Dropped {course_code}. No waitlisted students."
 
+    # ------------------------------------------------------------------
+    def promote_waitlisted(self, course_codes: List[str] = None) -> waitlist_promotion.PromotionResult:
+        """
+        Fills every free seat (all courses, or just `course_codes`) from the
+        waitlists in one transaction, skipping students who would now fail validation.
+        """
+        self.refresh_data()
+        self.conflict_matrix()
+        return waitlist_promotion.promote_waitlisted(self.validator, course_codes)
+
+    # ------------------------------------------------------------------
+    def drop_courses(self, drops: List[Tuple[int, str]]) -> Tuple[int, waitlist_promotion.PromotionResult]:
+        """
+        Add/drop storm: drops every (student_id, course_code) and promotes into
+        all the freed seats as ONE transaction. Returns (dropped, PromotionResult).
+        """
+        self.refresh_data()
+        self.conflict_matrix()
+        return waitlist_promotion.drop_many(self.validator, drops)
+
     # ------------------------------------------------------------------
     def get_student_registered_courses(self, student: Student) -> List[str]:
         """
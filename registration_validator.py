@@ -1,23 +1,38 @@
+from course_codes import normalize_code, normalize_codes
+from schedule_engine import ScheduleIndex, format_hard
+from prereq_graph import PrerequisiteGraph
+
+
 class RegistrationValidator:
-    def __init__(self, courses_data, program_plan, max_credits=18, min_credits=0):
+    def __init__(self, courses_data, program_plan, max_credits=18, min_credits=0, schedule=None, prereqs=None):
         self.courses_data = courses_data
         self.program_plan = program_plan
         self.max_credits = max_credits
         self.min_credits = min_credits
+        # Pre-parsed meeting slots; RegistrationSystem keeps it in sync with the catalog
+        self.schedule = schedule if schedule is not None else ScheduleIndex(courses_data)
+        # Optional ConflictMatrix for the current catalog (set by RegistrationSystem)
+        self.conflicts = None
+        # Prerequisite DAG as bitsets; RegistrationSystem rebuilds it with the catalog
+        self.prereqs = prereqs if prereqs is not None else PrerequisiteGraph.from_courses_data(courses_data)
 
     # -----------------------------------------------------------
     # check that all prerequisites for selected courses are completed
     # -----------------------------------------------------------
     def check_prerequisites(self, selected_courses, completed_courses):
-        # Check if the course exists in the system.
-        for course in selected_courses: 
-            if course not in self.courses_data:
+        # Check if the course exists in the system (under its canonical code).
+        selected_courses = [normalize_code(course) for course in selected_courses]
+        for course in selected_courses:
+            if course not in self.courses_data or course not in self.prereqs.index:
                 return False, f"Course {course} does not exist."
-            
-            prereqs = self.courses_data[course].get("prerequisites", [])
-            for prereq in prereqs:
-                if prereq not in completed_courses:
-                    return False, f"Cannot register for {course}: prerequisite {prereq} not completed."
+
+        # One bitwise test per course against the completed-course bitset
+        completed_mask = self.prereqs.mask(normalize_code(course) for course in completed_courses)
+        for course in selected_courses:
+            lacking = self.prereqs.missing_mask(course, completed_mask)
+            if lacking:
+                prereq = self.prereqs.codes[(lacking & -lacking).bit_length() - 1]
+                return False, f"Cannot register for {course}: prerequisite {prereq} not completed."
         return True, "Prerequisites OK."
     
     # -----------------------------------------------------------
@@ -56,68 +71,38 @@ class RegistrationValidator:
     # Check Schedule Conflicts
     # -----------------------------------------------------------
     def check_schedule_conflicts(self, selected_courses):
-        # Helper to convert HH:MM to minutes
-        def to_minutes(t_str):
-            try:
-                h, m = map(int, t_str.split(':'))
-                return h * 60 + m
-            except:
-                return 0
-
-        # 1. Build a list of time slots for all selected courses
-        course_slots = {}
-        
-        for course in selected_courses:
-            schedule_list = self.courses_data[course].get("schedule", [])
-            slots = []
-            for item in schedule_list:
-                # item is (DaysString, StartStr, EndStr) -> e.g., ('Sun/Tue', '10:00', '11:20')
-                if len(item) < 3: continue
-                days_str, start_str, end_str = item
-                
-                # Normalize separator and split
-                individual_days = days_str.replace('/', ',').split(',')
-                
-                start_min = to_minutes(start_str)
-                end_min = to_minutes(end_str)
-
-                for day in individual_days:
-                    day = day.strip() 
-                    if day:
-                        slots.append((day, start_min, end_min))
-            
-            course_slots[course] = slots
-
-        # 2. Compare every course against every other course
-        courses_list = list(course_slots.keys())
-        for i in range(len(courses_list)):
-            for j in range(i + 1, len(courses_list)):
-                c1 = courses_list[i]
-                c2 = courses_list[j]
-                
-                for slot1 in course_slots[c1]:
-                    for slot2 in course_slots[c2]:
-                        # Check Day Match
-                        if slot1[0] == slot2[0]:
-                            # Check Time Overlap: (StartA < EndB) and (StartB < EndA)
-                            if slot1[1] < slot2[2] and slot2[1] < slot1[2]:
-                                return False, f"Conflict: {c1} overlaps with {c2} on {slot1[0]}."
+        # Fast path: a few bitwise ANDs against the precomputed matrix, when it knows every course
+        if (self.conflicts is not None and self.conflicts.covers(selected_courses)
+                and not self.conflicts.has_hard_conflict(selected_courses)):
+            return True, "No schedule conflicts."
 
+        # Slots were parsed once when the catalog loaded; this is a per-day sort-and-sweep.
+        # Every overlap is reported, not just the first one.
+        hard, _ = self.schedule.find_conflicts(selected_courses)
+        if hard:
+            return False, " ".join(format_hard(c) for c in hard)
         return True, "No schedule conflicts."
 
     # -----------------------------------------------------------
     # MAIN VALIDATION FUNCTION
     # -----------------------------------------------------------
     def validate_registration(self, selected_courses, completed_courses, student_program, student_level, current_enrollments):
+        # Canonical codes once, up front: every check below looks them up in
+        # courses_data, the plan, the prerequisite graph and the conflict matrix
+        selected_courses = normalize_codes(selected_courses)
+        completed_courses = normalize_codes(completed_courses)
+        # Run in order and stop at the first failure: the later checks assume
+        # check_prerequisites has already rejected codes that are not in the catalog
         checks = [
-            self.check_prerequisites(selected_courses, completed_courses),
-            self.check_credit_hours(selected_courses),
-            self.check_program_plan(selected_courses, student_program, student_level),
-            self.check_schedule_conflicts(selected_courses)
+            lambda: self.check_prerequisites(selected_courses, completed_courses),
+            lambda: self.check_credit_hours(selected_courses),
+            lambda: self.check_program_plan(selected_courses, student_program, student_level),
+            lambda: self.check_schedule_conflicts(selected_courses)
             # REMOVED check_capacity FROM HERE
             # We let the RegistrationSystem handle capacity so it can trigger the waitlist.
         ]
-        for result, msg in checks:
+        for check in checks:
+            result, msg = check()
             if result == False:
                 return False, msg
         return True, "Validation successful!"
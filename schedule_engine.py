@@ -0,0 +1,330 @@
+import hashlib
+import json
+import os
+import tempfile
+from array import array
+from collections import namedtuple
+
+# ==========================================
+#  SHARED SCHEDULE CONFLICT ENGINE
+# ==========================================
+# Each course's meeting slots are parsed ONCE (when the catalog loads) into a
+# flat integer array: day, start minute, end minute, day, start, end, ...
+# Conflict checks then sort the slots of each day and sweep them, instead of
+# re-parsing "HH:MM" strings and comparing every pair of courses.
+
+# Fixed tables, never modified at run time: slots and matrix fingerprints
+# built on any thread mean the same days everywhere
+DAY_NAMES = ("Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat")
+DAY_INDEX = {name.lower(): i for i, name in enumerate(DAY_NAMES)}
+DAY_INDEX.update({"sunday": 0, "monday": 1, "tuesday": 2, "wednesday": 3,
+                  "thursday": 4, "friday": 5, "saturday": 6})
+
+# Back-to-back classes in different rooms with at most this gap are a "soft" conflict
+SOFT_GAP_MINUTES = 10
+
+HardConflict = namedtuple("HardConflict", "course_a course_b day start end")
+SoftConflict = namedtuple("SoftConflict", "first second day first_end second_start first_room second_room")
+
+
+def to_minutes(t_str):
+    """'HH:MM' -> minutes after midnight, or None if it can't be parsed."""
+    try:
+        h, m = map(int, str(t_str).split(':'))
+        return h * 60 + m
+    except (ValueError, TypeError):
+        return None
+
+
+def day_index(name):
+    """Maps a day name ('Sun', 'sunday', ...) to 0-6, or None if it isn't a day of the week."""
+    return DAY_INDEX.get(name.strip().lower())
+
+
+def parse_slots(schedule_list):
+    """
+    [('Sun/Tue', '10:00', '11:20'), ...] -> array('H', [0, 600, 680, 2, 600, 680, ...]).
+    Days may be separated by '/' or ','. Unparseable entries and unknown day names are skipped.
+    """
+    slots = array('H')
+    for item in schedule_list or []:
+        if len(item) < 3 or not item[0]:
+            continue
+        days_str, start_str, end_str = item[0], item[1], item[2]
+        start = to_minutes(start_str)
+        end = to_minutes(end_str)
+        if start is None or end is None:
+            continue
+        for day in str(days_str).replace('/', ',').split(','):
+            day = day_index(day)
+            if day is not None:
+                slots.extend((day, start, end))
+    return slots
+
+
+def _fmt(minutes):
+    return f"{minutes // 60}:{minutes % 60:02d}"
+
+
+class ScheduleIndex:
+    """Pre-parsed meeting slots + rooms for every course in the catalog."""
+
+    def __init__(self, courses_data=None):
+        self.slots = {}
+        self.rooms = {}
+        for code, data in (courses_data or {}).items():
+            self.update(code, data)
+
+    def update(self, code, data):
+        """(Re)parses one course, e.g. after an admin edit."""
+        # A catalog.CourseView already holds its parsed slots
+        slots = getattr(data, "slots", None)
+        self.slots[code] = slots if slots is not None else parse_slots(data.get("schedule", []))
+        self.rooms[code] = data.get("room", "Unknown")
+
+    def remove(self, code):
+        self.slots.pop(code, None)
+        self.rooms.pop(code, None)
+
+    def copy(self):
+        """Snapshot for a background thread (slot arrays are replaced on update, never changed in place)."""
+        snapshot = ScheduleIndex()
+        snapshot.slots = dict(self.slots)
+        snapshot.rooms = dict(self.rooms)
+        return snapshot
+
+    def fingerprint(self):
+        """Hash of every course's code, meeting slots (day, start, end) and room."""
+        h = hashlib.sha1()
+        for code in sorted(self.slots):
+            h.update(f"{code}\0{self.rooms.get(code)}\0".encode())
+            h.update(array('H', self.slots[code]).tobytes())
+            h.update(b"\n")
+        return h.hexdigest()
+
+    def _by_day(self, codes):
+        """{day: [(start, end, code), ...] sorted by start} for the given courses."""
+        days = {}
+        for code in dict.fromkeys(codes):
+            s = self.slots.get(code)
+            if not s:
+                continue
+            for i in range(0, len(s), 3):
+                days.setdefault(s[i], []).append((s[i + 1], s[i + 2], code))
+        for items in days.values():
+            items.sort()
+        return days
+
+    # -----------------------------------------------------------
+    def find_conflicts(self, codes, soft_gap=SOFT_GAP_MINUTES):
+        """
+        Returns (hard, soft) lists with EVERY conflict among `codes`:
+        - hard: two courses overlap in time on the same day
+        - soft: one course ends and another starts within `soft_gap` minutes, in a different room
+        """
+        hard = []
+        soft = []
+        seen_hard = set()
+        seen_soft = set()
+        for day, items in sorted(self._by_day(codes).items()):
+            active = []    # slots still running at the current start time
+            for start, end, code in items:
+                still_active = []
+                for a_start, a_end, a_code in active:
+                    if a_end > start:
+                        still_active.append((a_start, a_end, a_code))
+                        key = (a_code, code, day) if a_code < code else (code, a_code, day)
+                        if a_code != code and key not in seen_hard:
+                            seen_hard.add(key)
+                            hard.append(HardConflict(a_code, code, DAY_NAMES[day], max(start, a_start), min(end, a_end)))
+                    elif start - a_end <= soft_gap:
+                        # Ended just before this one starts: keep it around for the soft check
+                        still_active.append((a_start, a_end, a_code))
+                    # anything that ended earlier can never matter again on this day
+                for a_start, a_end, a_code in still_active:
+                    if a_end <= start and a_code != code and self.rooms.get(a_code) != self.rooms.get(code):
+                        key = (a_code, code, day)
+                        if key not in seen_soft:
+                            seen_soft.add(key)
+                            soft.append(SoftConflict(a_code, code, DAY_NAMES[day], a_end, start,
+                                                     self.rooms.get(a_code), self.rooms.get(code)))
+                still_active.append((start, end, code))
+                active = still_active
+        return hard, soft
+
+    # -----------------------------------------------------------
+    def conflicts_with(self, schedule_codes, candidate_codes=None):
+        """
+        Bulk check in one sweep: which candidate courses (default: whole catalog)
+        overlap something in `schedule_codes`? Returns {candidate: set(clashing schedule codes)}.
+        """
+        schedule_codes = set(schedule_codes)
+        if candidate_codes is None:
+            candidate_codes = self.slots.keys()
+        candidates = [c for c in candidate_codes if c not in schedule_codes]
+
+        events = {}
+        for code in schedule_codes:
+            s = self.slots.get(code, ())
+            for i in range(0, len(s), 3):
+                events.setdefault(s[i], []).append((s[i + 1], s[i + 2], 0, code))
+        for code in candidates:
+            s = self.slots.get(code, ())
+            for i in range(0, len(s), 3):
+                events.setdefault(s[i], []).append((s[i + 1], s[i + 2], 1, code))
+
+        result = {}
+        for items in events.values():
+            items.sort()
+            active = ([], [])    # running schedule slots, running candidate slots
+            for start, end, kind, code in items:
+                for group in active:
+                    group[:] = [x for x in group if x[0] > start]
+                for other_end, other_code in active[1 - kind]:
+                    cand, sched = (other_code, code) if kind == 0 else (code, other_code)
+                    result.setdefault(cand, set()).add(sched)
+                active[kind].append((end, code))
+        return result
+
+
+def format_hard(conflict):
+    return f"Conflict: {conflict.course_a} overlaps with {conflict.course_b} on {conflict.day}."
+
+
+def format_soft(conflict):
+    return (
+        f"Tight Transition ({conflict.day}): {conflict.first} ends at "
+        f"{_fmt(conflict.first_end)} in {conflict.first_room}, "
+        f"but {conflict.second} starts immediately in {conflict.second_room}."
+    )
+
+
+# ==========================================
+#  PRECOMPUTED PAIRWISE CONFLICT MATRIX
+# ==========================================
+class ConflictMatrix:
+    """
+    course index x course index conflict bits for one set of meeting slots.
+    Row i of `hard` / `soft` is a Python int whose bit j is set when course i
+    overlaps / has a tight back-to-back transition with course j, so checking
+    any selection is a handful of bitwise ANDs.
+    Saved next to the database (User.db.conflicts.json) and reused while the
+    schedule fingerprint (codes, slots and rooms) still matches. The catalog
+    version counter is not enough: it restarts when the database is rebuilt.
+    Codes the matrix was not built with are checked with the schedule's sweep.
+    """
+
+    def __init__(self, codes, hard, soft, fingerprint=None, schedule=None):
+        self.codes = list(codes)
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        self.hard = list(hard)
+        self.soft = list(soft)
+        self.fingerprint = fingerprint
+        self.schedule = schedule    # ScheduleIndex the matrix was built from, for the fallback
+
+    @classmethod
+    def build(cls, schedule):
+        codes = sorted(schedule.slots)
+        index = {code: i for i, code in enumerate(codes)}
+        hard = [0] * len(codes)
+        soft = [0] * len(codes)
+        hard_pairs, soft_pairs = schedule.find_conflicts(codes)
+        for c in hard_pairs:
+            a, b = index[c.course_a], index[c.course_b]
+            hard[a] |= 1 << b
+            hard[b] |= 1 << a
+        for c in soft_pairs:
+            a, b = index[c.first], index[c.second]
+            soft[a] |= 1 << b
+            soft[b] |= 1 << a
+        return cls(codes, hard, soft, schedule.fingerprint(), schedule)
+
+    # -----------------------------------------------------------
+    def mask(self, codes):
+        """Bitset of the given course codes (unknown codes are ignored)."""
+        m = 0
+        for code in codes:
+            i = self.index.get(code)
+            if i is not None:
+                m |= 1 << i
+        return m
+
+    def covers(self, codes):
+        """True if every code has a row in the matrix."""
+        return all(code in self.index for code in codes)
+
+    def _any(self, rows, codes, soft):
+        if not self.covers(codes):
+            # A code added after the build: the bits can't answer, sweep instead
+            # (with no schedule to sweep, report a possible conflict so the caller checks)
+            if self.schedule is None:
+                return True
+            hard, soft_pairs = self.schedule.find_conflicts(codes)
+            return bool(soft_pairs if soft else hard)
+        selected = self.mask(codes)
+        m = selected
+        while m:
+            low = m & -m
+            i = low.bit_length() - 1
+            if rows[i] & selected:
+                return True
+            m ^= low
+        return False
+
+    def has_hard_conflict(self, codes):
+        return self._any(self.hard, codes, False)
+
+    def has_soft_conflict(self, codes):
+        return self._any(self.soft, codes, True)
+
+    def clashing_with(self, schedule_codes, soft=False):
+        """Every catalog course that hard-conflicts (or soft-conflicts) with the given schedule."""
+        rows = self.soft if soft else self.hard
+        schedule_mask = self.mask(schedule_codes)
+        return {code for i, code in enumerate(self.codes) if rows[i] & schedule_mask}
+
+    # -----------------------------------------------------------
+    def save(self, path):
+        """Writes a temp file next to `path` and renames it over, so readers never see half a file."""
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({
+                    "fingerprint": self.fingerprint,
+                    "codes": self.codes,
+                    "hard": [format(r, "x") for r in self.hard],
+                    "soft": [format(r, "x") for r in self.soft],
+                }, f)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def load_or_build(cls, path, schedule):
+        """The matrix saved at `path` if it matches `schedule`, otherwise a fresh one (saved when possible)."""
+        matrix = cls.load(path, schedule)
+        if matrix is None:
+            matrix = cls.build(schedule)
+            try:
+                matrix.save(path)
+            except OSError:
+                pass    # read-only folder: keep the in-memory copy
+        return matrix
+
+    @classmethod
+    def load(cls, path, schedule):
+        """Returns the saved matrix, or None if it is missing, unreadable or was built from other slots."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                raw = json.load(f)
+            fingerprint = schedule.fingerprint()
+            if raw.get("fingerprint") != fingerprint:
+                return None
+            return cls(raw["codes"], [int(r, 16) for r in raw["hard"]], [int(r, 16) for r in raw["soft"]],
+                       fingerprint, schedule)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
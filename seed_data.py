@@ -0,0 +1,182 @@
+"""
+Fast, reproducible synthetic data for development, demos and benchmarks.
+
+Generates courses, prerequisites, program plans, student accounts and
+transcripts with executemany, ONE transaction per table. Student ids are
+drawn without collisions (existing ids are skipped), and the same --seed
+always produces the same data.
+
+    python seed_data.py --students 100000 --sections 2000 --seed 1
+    python seed_data.py --students 10 --no-catalog      # just add students
+"""
+import argparse
+import random
+import time
+
+import course_codes
+import db_connection
+import users_db
+
+NAMES = ["Abdulilah", "Saeed", "Sulaiman", "Alaa", "Mohtadi", "Baraa",
+         "Faisal", "Omar", "Khalid", "Ahmed", "Rayan", "Hassan"]
+PROGRAMS = {"Power": "PWR", "Comm": "COM", "Computer": "CPE", "Biomedical": "BME"}    # program -> code prefix
+LEVELS = [1, 2, 3, 4]
+DAYS = ["Sun", "Mon", "Tue", "Wed", "Thu", "Sun/Tue", "Mon/Wed"]
+GRADES = ["A+", "A", "B+", "B", "C+", "C", "D+", "D", "F"]
+
+# Same id range createstudent.py always used
+STUDENT_ID_RANGE = (2400000, 2499999)
+
+
+# ==========================================
+#  WRITING
+# ==========================================
+def insert_rows(sql, rows):
+    """executemany inside one transaction; returns the number of rows written."""
+    with db_connection.transaction(immediate=True) as con:
+        con.executemany(sql, rows)
+    return len(rows)
+
+
+def insert_courses(rows, ignore_existing=False):
+    """rows: (course_code, course_name, credits, day, start_time, end_time, room, max_capacity)."""
+    rows = [(course_codes.normalize_code(row[0]),) + tuple(row[1:]) for row in rows]
+    verb = "INSERT OR IGNORE" if ignore_existing else "INSERT"
+    return insert_rows(f"{verb} INTO courses (course_code, course_name, credits, day, start_time, end_time, "
+                       "room, max_capacity) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+
+def insert_students(users, students):
+    """Student accounts and profiles; both tables in one transaction so they never get out of step."""
+    with db_connection.transaction(immediate=True):
+        insert_rows("INSERT INTO users (id, name, email, password, membership) VALUES (?, ?, ?, ?, ?)", users)
+        insert_rows("INSERT INTO students (id, name, email, program, level) VALUES (?, ?, ?, ?, ?)", students)
+    return len(students)
+
+
+def past_term(years_back, season=3):
+    """The term `years_back` years before users_db.CURRENT_TERM (default: its Fall)."""
+    year = int(users_db.CURRENT_TERM.split("-")[0])
+    return f"{year - years_back}-{season}"
+
+
+# ==========================================
+#  GENERATORS
+# ==========================================
+def new_student_ids(rng, count, id_range=STUDENT_ID_RANGE):
+    """
+    `count` distinct ids that no user or student has yet, drawn from `id_range`
+    (widened upwards when the range is too small to stay sparse, e.g. 100k students).
+    """
+    low, high = id_range
+    high = max(high, low + 2 * count)
+    con = db_connection.get_connection()
+    taken = {row[0] for row in con.execute(
+        "SELECT id FROM users WHERE id BETWEEN ? AND ? UNION SELECT id FROM students WHERE id BETWEEN ? AND ?",
+        (low, high, low, high))}
+    if count > high - low + 1 - len(taken):
+        raise ValueError(f"Only {high - low + 1 - len(taken)} free ids left in {low}-{high}.")
+    picked = [i for i in rng.sample(range(low, high + 1), min(high - low + 1, count + len(taken))) if i not in taken]
+    return picked[:count]
+
+
+def generate_catalog(rng, sections):
+    """
+    Returns (courses, prerequisites, plans, by_group) for `sections` courses
+    spread evenly over every program and level. Level n courses may require a
+    level n-1 course of the same program.
+    """
+    groups = [(p, l) for p in PROGRAMS for l in LEVELS]
+    per_group = max(1, sections // len(groups))
+    courses, prereqs, plans = [], [], []
+    by_group = {}
+    for program, level in groups:
+        codes = []
+        for n in range(per_group):
+            code = f"{PROGRAMS[program]}{level}{n:03d}"
+            start = 8 * 60 + 30 * rng.randrange(20)
+            end = start + rng.choice((50, 80))
+            courses.append((code, f"{program} L{level} #{n}", rng.choice((2, 3, 3, 4)), rng.choice(DAYS),
+                            f"{start // 60:02d}:{start % 60:02d}", f"{end // 60:02d}:{end % 60:02d}",
+                            f"B{rng.randrange(40)}-{rng.randrange(100, 140)}", rng.choice((30, 40, 50, 60))))
+            plans.append((program, level, code))
+            if level > 1 and rng.random() < 0.6:
+                prereqs.append((code, rng.choice(by_group[(program, level - 1)])))
+            codes.append(code)
+        by_group[(program, level)] = codes
+    return courses, prereqs, plans, by_group
+
+
+def generate_students(rng, ids):
+    """Returns (users rows, students rows) for the given ids (plain-text passwords, like the app)."""
+    users, students = [], []
+    for sid in ids:
+        name = rng.choice(NAMES)
+        email = f"{name.lower()}{sid}@kau.edu.stu.com"
+        users.append((sid, name, email, str(rng.randint(1234567, 2345678)), "student"))
+        students.append((sid, name, email, rng.choice(list(PROGRAMS)), rng.choice(LEVELS)))
+    return users, students
+
+
+def generate_transcripts(rng, students, by_group, per_level=6):
+    """
+    `per_level` courses from every lower level of the student's program, with
+    random grades, as (student_id, course_code, term, grade): level n courses
+    were taken in the Fall n levels ago.
+    """
+    rows = []
+    for sid, _, _, program, level in students:
+        for lower in range(1, level):
+            codes = by_group.get((program, lower), ())
+            term = past_term(level - lower)
+            for code in rng.sample(codes, min(per_level, len(codes))):
+                rows.append((sid, code, term, rng.choice(GRADES)))
+    return rows
+
+
+# ==========================================
+#  ONE-SHOT SEEDING
+# ==========================================
+def seed(students=1000, sections=400, seed_value=1, with_catalog=True, with_transcripts=True):
+    """
+    Seeds the configured database. Returns {table: rows written} plus the
+    generated students rows under "student_rows".
+    """
+    rng = random.Random(seed_value)
+    counts = {}
+    by_group = {}
+    if with_catalog:
+        courses, prereqs, plans, by_group = generate_catalog(rng, sections)
+        counts["courses"] = insert_courses(courses)
+        counts["prerequisites"] = insert_rows(
+            "INSERT INTO prerequisites (course_code, prereq_code) VALUES (?, ?)", prereqs)
+        counts["program_plans"] = insert_rows(
+            "INSERT INTO program_plans (program, level, course_code) VALUES (?, ?, ?)", plans)
+
+    ids = new_student_ids(rng, students)
+    users, student_rows = generate_students(rng, ids)
+    counts["students"] = insert_students(users, student_rows)
+    if with_transcripts and by_group:
+        counts["transcripts"] = users_db.upsert_grades(generate_transcripts(rng, student_rows, by_group))[0]
+    counts["student_rows"] = student_rows
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--sections", type=int, default=400)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-catalog", action="store_true", help="only add students (no courses / plans / transcripts)")
+    parser.add_argument("--db", help="database file (default: User.db)")
+    parser.add_argument("--profile", default="bulk-load", help="database profile while seeding")
+    args = parser.parse_args()
+
+    if args.db:
+        db_connection.configure(db_path=args.db)
+    users_db.setup_database(profile=args.profile)
+    started = time.perf_counter()
+    result = seed(args.students, args.sections, args.seed, with_catalog=not args.no_catalog)
+    result.pop("student_rows")
+    print(", ".join(f"{n} {table}" for table, n in result.items()) +
+          f" in {time.perf_counter() - started:.2f}s")
@@ -1,5 +1,5 @@
 import sys
-import sqlite3
+from collections import namedtuple
 from PyQt5.QtWidgets import (QMainWindow, QApplication, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QPushButton, QTableWidget, 
                              QTableWidgetItem, QHeaderView, QFrame, QStackedWidget,
@@ -11,6 +11,26 @@ from PyQt5.QtGui import QFont, QColor, QBrush, QPixmap
 from registration_system import RegistrationSystem
 from Student import Student
 import users_db
+import db_connection
+import gpa_engine
+from schedule_engine import ScheduleIndex, format_soft
+from data_worker import DataWorker
+from table_models import RowTableModel, make_table_view, source_row, selected_row
+
+# =============================================================================
+# BACKGROUND QUERY
+# =============================================================================
+# Everything the tabs show for one student, read in one go on the DataWorker
+# pool; refresh_ui() requests it and the tabs draw from dashboard.state.
+StudentState = namedtuple("StudentState", "catalog_version completed registered enrollments waitlist gpa credits transcript")
+
+def fetch_student_state(user_id):
+    con = db_connection.get_connection()
+    gpa, creds = gpa_engine.get_gpa(user_id)
+    transcript = con.execute("SELECT t.course_code, c.course_name, c.credits, t.term, t.grade FROM transcripts t LEFT JOIN courses c ON t.course_code=c.course_code WHERE student_id=? ORDER BY t.term, t.course_code", (user_id,)).fetchall()
+    return StudentState(users_db.get_catalog_version(), users_db.get_completed_courses(user_id),
+                        list(users_db.get_registered_courses(user_id)), users_db.get_current_enrollments(),
+                        users_db.get_waitlist_positions(user_id), gpa, creds, transcript)
 
 
 class SimulationLogic:
@@ -19,63 +39,15 @@ class SimulationLogic:
     Checks for 'softer conflicts' like back-to-back classes in different rooms.
     """
     @staticmethod
-    def check_soft_conflicts(courses_data, selected_codes):
-        warnings = []
-        
-        # 1. Gather Schedule Details for selected courses
-        schedule_points = []
-        
-        for code in selected_codes:
-            data = courses_data.get(code, {})
-            room = data.get('room', 'Unknown')
-            schedule_list = data.get('schedule', [])
-            
-            for item in schedule_list:
-                days_str, start_str, end_str = item
-                # Handle "Sun/Tue" or "Sun, Tue"
-                days = days_str.replace('/', ',').split(',')
-                
-                # Convert times to minutes for comparison
-                try:
-                    s_h, s_m = map(int, start_str.split(':'))
-                    e_h, e_m = map(int, end_str.split(':'))
-                    start_min = s_h * 60 + s_m
-                    end_min = e_h * 60 + e_m
-                    
-                    for day in days:
-                        schedule_points.append({
-                            'day': day.strip(),
-                            'start': start_min,
-                            'end': end_min,
-                            'room': room,
-                            'code': code
-                        })
-                except:
-                    continue
-
-        # 2. Sort by Day, then by Start Time
-        schedule_points.sort(key=lambda x: (x['day'], x['start']))
-
-        # 3. Check for Back-to-Back (End Time A == Start Time B)
-        for i in range(len(schedule_points) - 1):
-            curr = schedule_points[i]
-            next_c = schedule_points[i+1]
-            
-            # Must be same day
-            if curr['day'] == next_c['day']:
-                # Check for tight transition (0 to 10 minutes gap)
-                gap = next_c['start'] - curr['end']
-                
-                if 0 <= gap <= 10:
-                    # Ignore if it's the same room
-                    if curr['room'] != next_c['room']:
-                        warnings.append(
-                            f"Tight Transition ({curr['day']}): {curr['code']} ends at "
-                            f"{curr['end']//60}:{curr['end']%60:02d} in {curr['room']}, "
-                            f"but {next_c['code']} starts immediately in {next_c['room']}."
-                        )
-
-        return warnings
+    def check_soft_conflicts(courses_data, selected_codes, schedule=None, conflicts=None):
+        # Precomputed matrix answers "any soft conflict at all?" with bitwise ANDs
+        if conflicts is not None and not conflicts.has_soft_conflict(selected_codes):
+            return []
+        # Uses the slots pre-parsed by RegistrationSystem when available
+        if schedule is None:
+            schedule = ScheduleIndex(courses_data)
+        _, soft = schedule.find_conflicts(selected_codes)
+        return [format_soft(c) for c in soft]
 
 # =============================================================================
 # TAB 1: OVERVIEW (GPA & Stats)
@@ -120,25 +92,10 @@ class OverviewTab(QWidget):
 
     def refresh(self):
         try:
-            con = sqlite3.connect("User.db")
-            cur = con.cursor()
-            cur.execute("SELECT course_code, grade FROM transcripts WHERE student_id = ? AND grade != 'IP'", (self.dash.user_id,))
-            rows = cur.fetchall()
-            con.close()
-
-            pts = 0; creds = 0
-            pmap = {"A+":5.00, "A":4.75, "B+":4.50, "B":4.00, "C+":3.50, "C":3.00, "D+":2.50, "D":2.00, "F":1.00}
-            
-            for code, grade in rows:
-                if grade.upper() in pmap:
-                    c_cred = 0
-                    for db_code, data in self.dash.logic_system.courses_data.items():
-                        if str(db_code).replace(" ","").upper() == str(code).replace(" ","").upper():
-                            c_cred = data.get('credits', 0); break
-                    if c_cred: pts += pmap[grade.upper()] * c_cred; creds += c_cred
-            
-            gpa = pts / creds if creds > 0 else 0.0
+            # Cached aggregates (gpa_engine): one primary-key lookup, whatever the transcript size
+            gpa, creds = self.dash.state.gpa, self.dash.state.credits
             self.card_gpa.layout().itemAt(1).widget().setText(f"{gpa:.2f}")
+            self.card_status.layout().itemAt(1).widget().setText(gpa_engine.standing(gpa, creds))
         except: pass
 
 # =============================================================================
@@ -162,11 +119,10 @@ class RegistrationTab(QWidget):
         h.addWidget(btn)
         layout.addLayout(h)
 
-        self.table = QTableWidget(0, 7)
-        self.table.setHorizontalHeaderLabels(["Code", "Name", "Credits", "Time", "Room", "Prereqs", "Cap"])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        # Greyed-out rows and their tooltips are worked out per painted cell (decorate)
+        self.clashing, self.eligible, self.completed = set(), set(), set()
+        self.model = RowTableModel(["Code", "Name", "Credits", "Time", "Room", "Prereqs", "Cap"], self, decorate=self.decorate)
+        self.table = make_table_view(self.model)
         layout.addWidget(self.table)
 
         btn_reg = QPushButton("Register Selected")
@@ -174,14 +130,24 @@ class RegistrationTab(QWidget):
         btn_reg.clicked.connect(self.register)
         layout.addWidget(btn_reg, alignment=Qt.AlignRight)
 
+    def decorate(self, row, column, role):
+        code = row[0]
+        if role == Qt.ForegroundRole and (code in self.clashing or code not in self.eligible):
+            return QBrush(QColor("#95a5a6"))
+        if role == Qt.ToolTipRole:
+            if code in self.clashing: return "Clashes with a course you are already registered in."
+            if code not in self.eligible:
+                try:
+                    return "Missing prerequisites: " + ", ".join(self.dash.logic_system.prereqs.missing(code, self.completed))
+                except KeyError:
+                    return "Course is no longer in the catalog."
+        return None
+
     def refresh(self):
-        self.table.setRowCount(0)
         if not self.dash.student_obj: return
 
         courses = self.dash.logic_system.courses_data
-        
-        try: completed = users_db.get_completed_courses(self.dash.user_id)
-        except: completed = set()
+        completed = self.dash.state.completed
 
         user_program = self.dash.student_obj.program
         plan_dict = self.dash.logic_system.program_plan.get(user_program, {})
@@ -189,6 +155,23 @@ class RegistrationTab(QWidget):
         for level_list in plan_dict.values():
             for code in level_list: allowed_courses.add(code)
 
+        # Courses that overlap the current timetable are greyed out (bitset lookup, no time parsing).
+        # Until the matrix has been built on the worker, one sweep over the catalog gives the same answer.
+        registered = self.dash.state.registered
+        system = self.dash.logic_system
+        if system.has_conflict_matrix():
+            self.clashing = system.conflict_matrix().clashing_with(registered)
+        else:
+            self.clashing = set(system.schedule.conflicts_with(registered))
+            self.dash.build_conflict_matrix()
+        self.completed = completed
+        # Prerequisite eligibility for the whole catalog in one pass over the DAG bitsets
+        prereqs = self.dash.logic_system.prereqs
+        self.eligible = prereqs.eligible(completed, allowed_courses)
+        # Live seat counts for every course (trigger-maintained counter table)
+        enrolled = self.dash.state.enrollments
+
+        rows = []
         for c, d in courses.items():
             if c in completed: continue
             if c not in allowed_courses: continue
@@ -205,22 +188,14 @@ class RegistrationTab(QWidget):
             elif d.get('day') and d.get('start_time'): 
                 time = f"{d['day']} {d['start_time']}" + (f"-{d['end_time']}" if d.get('end_time') else "")
 
-            curr = 0
-            try:
-                con = sqlite3.connect("User.db")
-                curr = con.execute("SELECT COUNT(*) FROM registration WHERE course_code=?", (c,)).fetchone()[0]
-                con.close()
-            except: pass
-
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            for i, txt in enumerate([c, name, creds, time, room, prereq, f"{curr}/{cap}"]):
-                self.table.setItem(row, i, QTableWidgetItem(str(txt)))
+            curr = enrolled.get(c, 0)
+            rows.append((c, name, creds, time, room, prereq, f"{curr}/{cap}"))
+        self.model.set_rows(rows)
 
     def register(self):
-        r = self.table.currentRow()
-        if r < 0: return QMessageBox.warning(self, "Warning", "Select a course.")
-        code = self.table.item(r, 0).text()
+        row = selected_row(self.table)
+        if row is None: return QMessageBox.warning(self, "Warning", "Select a course.")
+        code = row[0]
         
         current_registered = self.dash.logic_system.get_student_registered_courses(self.dash.student_obj)
         if code in current_registered:
@@ -231,7 +206,9 @@ class RegistrationTab(QWidget):
         simulated_schedule.append(code)
         warnings = SimulationLogic.check_soft_conflicts(
             self.dash.logic_system.courses_data, 
-            simulated_schedule
+            simulated_schedule,
+            self.dash.logic_system.schedule,
+            self.dash.logic_system.conflict_matrix()
         )
         if warnings:
             msg_text = "Soft Scheduling Conflict Detected:\n\n" + "\n".join(warnings) + "\n\nDo you still want to proceed?"
@@ -271,10 +248,8 @@ class ScheduleTab(QWidget):
         lbl_reg.setProperty("class", "section-title")
         layout.addWidget(lbl_reg)
         
-        self.list = QTableWidget(0, 4)
-        self.list.setHorizontalHeaderLabels(["Code", "Name", "Time", "Room"])
-        self.list.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.list.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.list_model = RowTableModel(["Code", "Name", "Time", "Room"], self)
+        self.list = make_table_view(self.list_model)
         self.list.setFixedHeight(100)
         layout.addWidget(self.list)
         
@@ -287,10 +262,8 @@ class ScheduleTab(QWidget):
         lbl_wait.setProperty("class", "section-title")
         layout.addWidget(lbl_wait)
         
-        self.wait = QTableWidget(0, 4)
-        self.wait.setHorizontalHeaderLabels(["Code", "Name", "Requested", "Position"])
-        self.wait.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.wait.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.wait_model = RowTableModel(["Code", "Name", "Requested", "Position"], self)
+        self.wait = make_table_view(self.wait_model)
         self.wait.setFixedHeight(100)
         layout.addWidget(self.wait)
         
@@ -301,16 +274,15 @@ class ScheduleTab(QWidget):
 
     def refresh(self):
         self.cal.clearContents()
-        self.list.setRowCount(0)
-        self.wait.setRowCount(0)
         if not self.dash.student_obj: return
 
-        my_codes = self.dash.logic_system.get_student_registered_courses(self.dash.student_obj)
+        my_codes = self.dash.state.registered
         data = self.dash.logic_system.courses_data
         colors = ["#e74c3c", "#3498db", "#2ecc71", "#9b59b6", "#f1c40f", "#e67e22"]
         d_map = {"Sunday":0, "Monday":1, "Tuesday":2, "Wednesday":3, "Thursday":4, 
                  "Sun":0, "Mon":1, "Tue":2, "Wed":3, "Thu":4}
         color_i = 0; tot_creds = 0
+        listed = []
 
         for c in my_codes:
             d = data.get(c, {})
@@ -321,12 +293,7 @@ class ScheduleTab(QWidget):
             start = d.get('start_time')
             end = d.get('end_time')
 
-            r = self.list.rowCount()
-            self.list.insertRow(r)
-            self.list.setItem(r, 0, QTableWidgetItem(str(c)))
-            self.list.setItem(r, 1, QTableWidgetItem(name))
-            self.list.setItem(r, 2, QTableWidgetItem(f"{raw_day_str} {start}"))
-            self.list.setItem(r, 3, QTableWidgetItem(room))
+            listed.append((c, name, f"{raw_day_str} {start}", room))
 
             if start and end:
                 normalized_days = raw_day_str.replace('/', ',')
@@ -349,36 +316,29 @@ class ScheduleTab(QWidget):
                                     if row_s + i < 11: self.cal.setItem(row_s + i, col, QTableWidgetItem(item))
                         except: pass
                 color_i += 1
+        self.list_model.set_rows(listed)
         
         try:
             self.dash.tab_overview.card_credits.layout().itemAt(1).widget().setText(f"{tot_creds} / 18")
         except: pass
 
-        con = sqlite3.connect("User.db")
-        cur = con.cursor()
-        cur.execute("SELECT course_code, timestamp FROM waitlist WHERE student_id=?", (self.dash.user_id,))
-        for c, ts in cur.fetchall():
-            pos = con.execute("SELECT COUNT(*) FROM waitlist WHERE course_code=? AND timestamp <= ?", (c, ts)).fetchone()[0]
-            name = data.get(c, {}).get('name', 'Unknown')
-            r = self.wait.rowCount()
-            self.wait.insertRow(r)
-            for i, txt in enumerate([c, name, ts, f"#{pos}"]): self.wait.setItem(r, i, QTableWidgetItem(str(txt)))
-        con.close()
+        # All of this student's queue positions (ordered by per-course sequence number)
+        self.wait_model.set_rows([(c, data.get(c, {}).get('name', 'Unknown'), ts, f"#{pos} of {waiting}")
+                                  for c, ts, pos, waiting in self.dash.state.waitlist])
 
     def drop(self):
-        r = self.list.currentRow()
-        if r < 0: return QMessageBox.warning(self, "Msg", "Select course to drop.")
-        code = self.list.item(r, 0).text()
+        row = selected_row(self.list)
+        if row is None: return QMessageBox.warning(self, "Msg", "Select course to drop.")
+        code = row[0]
         ok, msg = self.dash.logic_system.drop_course_for_student(self.dash.student_obj, code)
         QMessageBox.information(self, "Info", msg)
         self.dash.refresh_ui()
 
     def leave(self):
-        r = self.wait.currentRow()
-        if r < 0: return QMessageBox.warning(self, "Msg", "Select course to leave.")
-        code = self.wait.item(r, 0).text()
-        with sqlite3.connect("User.db") as con:
-            con.execute("DELETE FROM waitlist WHERE student_id=? AND course_code=?", (self.dash.user_id, code))
+        row = selected_row(self.wait)
+        if row is None: return QMessageBox.warning(self, "Msg", "Select course to leave.")
+        code = row[0]
+        users_db.leave_waitlist(self.dash.user_id, code)
         QMessageBox.information(self, "Info", "Left waitlist.")
         self.dash.refresh_ui()
 
@@ -429,13 +389,10 @@ class WhatIfTab(QWidget):
         lbl_list.setStyleSheet("font-weight:bold; color:#7f8c8d;")
         list_layout.addWidget(lbl_list)
 
-        self.table = QTableWidget(0, 3)
-        self.table.setHorizontalHeaderLabels(["Code", "Name", "Status"])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.model = RowTableModel(["Code", "Name", "Status"], self, decorate=self.decorate)
+        self.table = make_table_view(self.model)
         self.table.setMinimumWidth(350)
-        self.table.itemClicked.connect(self.toggle_course_selection)
+        self.table.clicked.connect(self.toggle_course_selection)
         list_layout.addWidget(self.table)
         
         btn_clear = QPushButton("Clear Simulation")
@@ -472,13 +429,19 @@ class WhatIfTab(QWidget):
             self.spin_lvl.setValue(self.dash.student_obj.level)
         self.clear_simulation()
 
+    STATUS_COLORS = {"Missing Prereqs": "red", "Completed": "green", "Registered": "green", "Eligible": "blue"}
+
+    def decorate(self, row, column, role):
+        if role == Qt.BackgroundRole and row[0] in self.simulated_courses:
+            return QBrush(QColor("#fff3e0"))
+        if role == Qt.ForegroundRole and column == 2:
+            return QBrush(QColor(self.STATUS_COLORS.get(row[2], "blue")))
+        return None
+
     def clear_simulation(self):
         self.simulated_courses.clear()
         self.draw_schedule_grid()
-        for r in range(self.table.rowCount()):
-            for c in range(3):
-                item = self.table.item(r, c)
-                if item: item.setBackground(QBrush(Qt.white))
+        self.model.refresh()
 
     def run_simulation_list(self):
         """Populates the list. Resets current simulation."""
@@ -491,53 +454,38 @@ class WhatIfTab(QWidget):
         for level_courses in plan_dict.values():
             for c in level_courses: allowed_courses.add(c)
 
-        completed = users_db.get_completed_courses(self.dash.user_id)
-        current_reg = self.dash.logic_system.get_student_registered_courses(self.dash.student_obj)
+        if not self.dash.state: return
+        completed = self.dash.state.completed
+        current_reg = self.dash.state.registered
         courses_db = self.dash.logic_system.courses_data
+        eligible = self.dash.logic_system.prereqs.eligible(completed, allowed_courses)
 
-        self.table.setRowCount(0)
+        rows = []
         for code in sorted(list(allowed_courses)):
             d = courses_db.get(code, {})
             name = d.get('name', 'Unknown')
-            prereqs = d.get('prerequisites', [])
             
             status = "Eligible"
             if code in completed: status = "Completed"
             elif code in current_reg: status = "Registered"
-            else:
-                missing = [p for p in prereqs if p not in completed]
-                if missing: status = "Missing Prereqs"
-
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(code))
-            self.table.setItem(row, 1, QTableWidgetItem(name))
-            
-            item_status = QTableWidgetItem(status)
-            if "Missing" in status: item_status.setForeground(QBrush(QColor("red")))
-            elif "Completed" in status or "Registered" in status: item_status.setForeground(QBrush(QColor("green")))
-            else: item_status.setForeground(QBrush(QColor("blue")))
-            self.table.setItem(row, 2, item_status)
+            elif code not in eligible: status = "Missing Prereqs"
+            rows.append((code, name, status))
+        self.model.set_rows(rows)
 
-    def toggle_course_selection(self, item):
-        row = item.row()
-        code = self.table.item(row, 0).text()
-        status = self.table.item(row, 2).text()
+    def toggle_course_selection(self, index):
+        code, _, status = self.model.row(source_row(self.table, index))
 
         if "Registered" in status or "Completed" in status: return
 
-        if code in self.simulated_courses:
-            self.simulated_courses.remove(code)
-            for c in range(3): self.table.item(row, c).setBackground(QBrush(Qt.white))
-        else:
-            self.simulated_courses.add(code)
-            for c in range(3): self.table.item(row, c).setBackground(QBrush(QColor("#fff3e0")))
+        if code in self.simulated_courses: self.simulated_courses.remove(code)
+        else: self.simulated_courses.add(code)
+        self.model.refresh()
 
         self.draw_schedule_grid()
 
     def draw_schedule_grid(self):
         self.sim_cal.clearContents()
-        registered_codes = self.dash.logic_system.get_student_registered_courses(self.dash.student_obj)
+        registered_codes = self.dash.state.registered if self.dash.state else []
         courses_to_draw = []
         for c in registered_codes: courses_to_draw.append({"code": c, "color": "#3498db", "type": "actual"})
         for c in self.simulated_courses: courses_to_draw.append({"code": c, "color": "#e67e22", "type": "simulated"})
@@ -583,7 +531,7 @@ class WhatIfTab(QWidget):
         
         current_registered = self.dash.logic_system.get_student_registered_courses(self.dash.student_obj)
         full_plan = list(current_registered) + list(self.simulated_courses)
-        warnings = SimulationLogic.check_soft_conflicts(self.dash.logic_system.courses_data, full_plan)
+        warnings = SimulationLogic.check_soft_conflicts(self.dash.logic_system.courses_data, full_plan, self.dash.logic_system.schedule, self.dash.logic_system.conflict_matrix())
         
         msg = f"Analyzing plan with {len(full_plan)} courses (Actual + Simulated)...\n\n"
         if warnings:
@@ -634,10 +582,9 @@ class SettingsTab(QWidget):
         new_e = self.inp_email.text().strip()
         if not new_e: return
         try:
-            con = sqlite3.connect("User.db")
-            con.execute("UPDATE users SET email=? WHERE id=?", (new_e, self.dash.user_id))
-            con.execute("UPDATE students SET email=? WHERE id=?", (new_e, self.dash.user_id))
-            con.commit(); con.close()
+            with db_connection.get_connection() as con:
+                con.execute("UPDATE users SET email=? WHERE id=?", (new_e, self.dash.user_id))
+                con.execute("UPDATE students SET email=? WHERE id=?", (new_e, self.dash.user_id))
             self.dash.student_obj.email = new_e
             QMessageBox.information(self, "Success", "Email updated.")
         except Exception as e: QMessageBox.warning(self, "Error", str(e))
@@ -646,14 +593,13 @@ class SettingsTab(QWidget):
         old, new = self.inp_old.text(), self.inp_new.text()
         if not old or not new: return QMessageBox.warning(self, "Input", "Fill all fields.")
         try:
-            con = sqlite3.connect("User.db")
+            con = db_connection.get_connection()
             real = con.execute("SELECT password FROM users WHERE id=?", (self.dash.user_id,)).fetchone()[0]
             if real == old:
-                con.execute("UPDATE users SET password=? WHERE id=?", (new, self.dash.user_id))
-                con.commit(); QMessageBox.information(self, "Success", "Password updated.")
+                with con: con.execute("UPDATE users SET password=? WHERE id=?", (new, self.dash.user_id))
+                QMessageBox.information(self, "Success", "Password updated.")
                 self.inp_old.clear(); self.inp_new.clear()
             else: QMessageBox.warning(self, "Error", "Incorrect current password.")
-            con.close()
         except Exception as e: QMessageBox.warning(self, "Error", str(e))
 
 # =============================================================================
@@ -668,6 +614,9 @@ class StudentDashboard(QMainWindow):
         self.resize(1100, 800)
 
         self.logic_system = RegistrationSystem()
+        self.state = None   # StudentState, filled in by the worker
+        self.worker = DataWorker(self)
+        self.worker.loading.connect(self.on_loading)
 
         cw = QWidget(); self.setCentralWidget(cw)
         main_layout = QHBoxLayout(cw); main_layout.setContentsMargins(0,0,0,0); main_layout.setSpacing(0)
@@ -706,12 +655,12 @@ class StudentDashboard(QMainWindow):
         self.tab_trans = QWidget(); tl = QVBoxLayout(self.tab_trans)
         tl.setContentsMargins(30,30,30,30)
         tl_title = QLabel("Transcript"); tl_title.setProperty("class", "page-title"); tl.addWidget(tl_title)
-        self.tbl_trans = QTableWidget(0,4); self.tbl_trans.setHorizontalHeaderLabels(["Code","Name","Credits","Grade"]); self.tbl_trans.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch); tl.addWidget(self.tbl_trans)
+        self.trans_model = RowTableModel(["Code","Name","Credits","Term","Grade"], self, blank="-"); self.tbl_trans = make_table_view(self.trans_model); tl.addWidget(self.tbl_trans)
         
         self.tab_plan = QWidget(); pl = QVBoxLayout(self.tab_plan)
         pl.setContentsMargins(30,30,30,30)
         pl_title = QLabel("Program Plan"); pl_title.setProperty("class", "page-title"); pl.addWidget(pl_title)
-        self.tbl_plan = QTableWidget(0,5); self.tbl_plan.setHorizontalHeaderLabels(["Level","Code","Name","Credits","Status"]); self.tbl_plan.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch); pl.addWidget(self.tbl_plan)
+        self.plan_model = RowTableModel(["Level","Code","Name","Credits","Status"], self, decorate=self.decorate_plan); self.tbl_plan = make_table_view(self.plan_model); pl.addWidget(self.tbl_plan)
 
         self.tab_whatif = WhatIfTab(self)
         self.tab_settings = SettingsTab(self)
@@ -782,54 +731,73 @@ class StudentDashboard(QMainWindow):
 
     def load_data(self):
         try:
-            con = sqlite3.connect("User.db")
+            con = db_connection.get_connection()
             cur = con.cursor()
             row = cur.execute("SELECT name, email, program, level FROM students WHERE id=?", (self.user_id,)).fetchone()
             if not row:
                 u = cur.execute("SELECT name, email FROM users WHERE id=?", (self.user_id,)).fetchone()
                 if u: 
-                    cur.execute("INSERT INTO students VALUES (?,?,?,?,?)", (self.user_id, u[0], u[1], "General Engineering", 1))
-                    con.commit(); row = (u[0], u[1], "General Engineering", 1)
+                    with con: cur.execute("INSERT INTO students VALUES (?,?,?,?,?)", (self.user_id, u[0], u[1], "General Engineering", 1))
+                    row = (u[0], u[1], "General Engineering", 1)
             if row:
                 self.student_obj = Student(self.user_id, row[0], row[1], row[2], row[3], "")
                 self.lbl_user.setText(f"{row[0]}\n{row[2]}")
-            con.close()
         except: pass
 
     def refresh_ui(self):
+        """Queues a reload of the student's data; tab switches and actions while it runs coalesce into one."""
         if not self.student_obj: return
-        self.logic_system.refresh_data()
+        self.worker.request("student", fetch_student_state, self.user_id, on_result=self.apply_state)
+
+    def build_conflict_matrix(self):
+        """Loads or builds the catalog's conflict matrix on the worker, then repaints the course list with it."""
+        key, fn, args = self.logic_system.conflict_matrix_job()
+        def install(matrix):
+            if self.logic_system.install_conflict_matrix(key, matrix) and self.state is not None:
+                self.tab_register.refresh()
+        self.worker.request("conflicts", fn, *args, on_result=install)
+
+    def on_loading(self, key, busy):
+        if key == "conflicts": return   # background work; the tables stay usable
+        for t in (self.tab_register.table, self.tab_schedule.list, self.tab_schedule.wait, self.tbl_trans, self.tbl_plan):
+            t.setEnabled(not busy)
+        self.statusBar().showMessage("Loading..." if busy else "")
+
+    def apply_state(self, state):
+        self.state = state
+        # The catalog is updated in place and read by every tab, so it stays on this thread;
+        # the worker only checked its version, and most refreshes find it unchanged.
+        if state.catalog_version is None or state.catalog_version != self.logic_system.catalog_version:
+            self.logic_system.refresh_data()
         self.tab_overview.refresh()
         self.tab_register.refresh()
         self.tab_schedule.refresh()
         self.tab_whatif.refresh()
         self.tab_settings.refresh()
         
-        self.tbl_trans.setRowCount(0)
-        try:
-            con = sqlite3.connect("User.db")
-            for r_data in con.execute("SELECT t.course_code, c.course_name, c.credits, t.grade FROM transcripts t LEFT JOIN courses c ON t.course_code=c.course_code WHERE student_id=?", (self.user_id,)):
-                row = self.tbl_trans.rowCount(); self.tbl_trans.insertRow(row)
-                for i, d in enumerate(r_data): self.tbl_trans.setItem(row, i, QTableWidgetItem(str(d if d else "-")))
-            con.close()
-        except: pass
+        self.trans_model.set_rows(state.transcript)
 
-        self.tbl_plan.setRowCount(0)
         plan = self.logic_system.program_plan.get(self.student_obj.program, {})
-        comp = set(users_db.get_completed_courses(self.user_id))
-        reg = set(self.logic_system.get_student_registered_courses(self.student_obj))
+        comp = set(state.completed)
+        reg = set(state.registered)
         
+        rows = []
         for lvl in sorted(plan.keys()):
             for code in plan[lvl]:
                 d = self.logic_system.courses_data.get(code, {})
-                st, col = ("Not Started", "#f8d7da")
-                if code in reg: st, col = ("In Progress", "#cce5ff")
-                elif code in comp: st, col = ("Completed", "#d4edda")
-                r = self.tbl_plan.rowCount(); self.tbl_plan.insertRow(r)
-                for i, txt in enumerate([f"Level {lvl}", code, d.get('name','-'), str(d.get('credits','-')), st]):
-                    it = QTableWidgetItem(txt); 
-                    if i==4: it.setBackground(QColor(col)); it.setForeground(QBrush(Qt.black))
-                    self.tbl_plan.setItem(r, i, it)
+                st = "Not Started"
+                if code in reg: st = "In Progress"
+                elif code in comp: st = "Completed"
+                rows.append((f"Level {lvl}", code, d.get('name','-'), str(d.get('credits','-')), st))
+        self.plan_model.set_rows(rows)
+
+    PLAN_COLORS = {"Not Started": "#f8d7da", "In Progress": "#cce5ff", "Completed": "#d4edda"}
+
+    def decorate_plan(self, row, column, role):
+        if column != 4: return None
+        if role == Qt.BackgroundRole: return QBrush(QColor(self.PLAN_COLORS[row[4]]))
+        if role == Qt.ForegroundRole: return QBrush(Qt.black)
+        return None
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
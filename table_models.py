@@ -0,0 +1,211 @@
+"""
+Model/view tables for the dashboards.
+
+RowTableModel serves a list of row tuples to a QTableView: nothing is
+created per cell, data() formats only the cells the view paints, and rows
+are exposed in pages through canFetchMore / fetchMore as the user scrolls,
+so a 50k-row roster opens at once. SortFilterProxy adds header-click sorting
+and a search filter; both run over the Python rows (list.sort on the raw
+values, a substring test on a cached row text) instead of calling data()
+once per comparison.
+
+    self.student_model = RowTableModel(["ID", "Name", ...])
+    self.student_view = make_table_view(self.student_model)
+    self.student_model.set_rows(rows)
+    row = selected_row(self.student_view)      # source row tuple, or None
+"""
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+from PyQt5.QtWidgets import QAbstractItemView, QHeaderView, QTableView
+
+PAGE_SIZE = 1000
+
+
+class RowTableModel(QAbstractTableModel):
+    """
+    Rows are tuples; `editable` columns accept edits (the row becomes a list).
+    decorate(row, column, role) may return a value for any role other than
+    display (foreground, background, tooltip, ...) or None.
+    """
+
+    def __init__(self, headers, parent=None, editable=(), decorate=None, blank="", page_size=PAGE_SIZE):
+        super().__init__(parent)
+        self.headers = list(headers)
+        self.editable = set(editable)
+        self.decorate = decorate
+        self.blank = blank          # shown for None / empty values
+        self.page_size = page_size
+        self._rows = []
+        self._loaded = 0            # rows handed to the view so far
+        self._sort = None           # (column, order) of the last header click, kept across set_rows
+        self._search = None         # lower-cased text of each row, built on the first filter
+
+    # -----------------------------------------------------------
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._search = None
+        if self._sort:
+            self._sort_rows(*self._sort)
+        self._loaded = min(len(self._rows), self.page_size)
+        self.endResetModel()
+
+    def rows(self):
+        """Every row, fetched or not, with edits applied."""
+        return self._rows
+
+    def row(self, r):
+        return self._rows[r]
+
+    def refresh(self):
+        """Repaints every cell, e.g. after state used by decorate() changed."""
+        if self._loaded:
+            self.dataChanged.emit(self.index(0, 0), self.index(self._loaded - 1, len(self.headers) - 1))
+
+    def search_text(self, r):
+        if self._search is None:
+            self._search = [" ".join(self.blank if v is None else str(v) for v in row).lower() for row in self._rows]
+        return self._search[r]
+
+    def _sort_rows(self, column, order):
+        """Sorts the rows; returns the permutation (old row number of each new row)."""
+        rows = self._rows
+        def key(r):
+            return (rows[r][column] is None, rows[r][column])
+        moved = list(range(len(rows)))
+        try:
+            moved.sort(key=key, reverse=order == Qt.DescendingOrder)
+        except TypeError:       # mixed types in one column
+            moved.sort(key=lambda r: str(rows[r][column]), reverse=order == Qt.DescendingOrder)
+        self._rows = [rows[r] for r in moved]
+        self._search = None
+        return moved
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if column < 0:
+            return
+        self.layoutAboutToBeChanged.emit()
+        self._sort = (column, order)
+        old = self.persistentIndexList()
+        moved = self._sort_rows(column, order)
+        # Selection and current index follow their rows to the new positions
+        if old:
+            new_row = [0] * len(moved)
+            for new, r in enumerate(moved):
+                new_row[r] = new
+            self.changePersistentIndexList(old, [self.index(new_row[i.row()], i.column()) for i in old])
+        self.layoutChanged.emit()
+
+    def fetch_all(self):
+        if self.canFetchMore(QModelIndex()):
+            self.beginInsertRows(QModelIndex(), self._loaded, len(self._rows) - 1)
+            self._loaded = len(self._rows)
+            self.endInsertRows()
+
+    # -----------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < len(self._rows)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        end = min(len(self._rows), self._loaded + self.page_size)
+        self.beginInsertRows(QModelIndex(), self._loaded, end - 1)
+        self._loaded = end
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        value = self._rows[index.row()][index.column()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self.blank if value is None or value == "" else str(value)
+        if self.decorate:
+            return self.decorate(self._rows[index.row()], index.column(), role)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        if index.column() in self.editable:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or index.column() not in self.editable:
+            return False
+        row = list(self._rows[index.row()])
+        row[index.column()] = value
+        self._rows[index.row()] = row
+        self._search = None
+        self.dataChanged.emit(index, index)
+        return True
+
+
+class SortFilterProxy(QSortFilterProxyModel):
+    """
+    Header clicks sort the source rows (the proxy keeps source order) and
+    set_filter() keeps rows whose text contains the search string, case
+    insensitive, in any column. Both need every row fetched first.
+    """
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setSourceModel(model)
+        self._needle = ""
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if column >= 0:
+            self.sourceModel().fetch_all()
+            self.sourceModel().sort(column, order)
+
+    def set_filter(self, text):
+        if text:
+            self.sourceModel().fetch_all()
+        self._needle = text.strip().lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return not self._needle or self._needle in self.sourceModel().search_text(source_row)
+
+
+def make_table_view(model, sortable=True, parent=None):
+    """A QTableView over `model` (through a SortFilterProxy if sortable), styled like the old tables."""
+    view = QTableView(parent)
+    if sortable:
+        view.setModel(SortFilterProxy(model, view))
+        view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)  # keep the query's order until a header is clicked
+        view.setSortingEnabled(True)
+    else:
+        view.setModel(model)
+    view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+    view.setSelectionBehavior(QAbstractItemView.SelectRows)
+    view.verticalHeader().setVisible(False)
+    return view
+
+
+def source_row(view, index):
+    """Row number in the source model for a view index (through the proxy, if any)."""
+    model = view.model()
+    if isinstance(model, QSortFilterProxyModel):
+        index = model.mapToSource(index)
+    return index.row()
+
+
+def selected_row(view):
+    """The source row tuple of the view's current row, or None."""
+    index = view.currentIndex()
+    if not index.isValid():
+        return None
+    model = view.model()
+    source = model.sourceModel() if isinstance(model, QSortFilterProxyModel) else model
+    return source.row(source_row(view, index))
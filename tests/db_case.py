@@ -0,0 +1,48 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import db_connection
+import seed_data
+import users_db
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Each test gets a fresh, fully migrated database in a temp folder."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "test.db")
+        db_connection.configure(db_path=self.db_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            users_db.setup_database()
+        self.con = db_connection.get_connection()
+
+    def tearDown(self):
+        db_connection.close_connection()
+        self.tmp.cleanup()
+
+    # -----------------------------------------------------------
+    def add_courses(self, *courses):
+        """(code, capacity) or (code, capacity, day, start, end) for each course, 3 credits each."""
+        rows = []
+        for n, c in enumerate(courses):
+            code, capacity = c[0], c[1]
+            day, start, end = c[2:] if len(c) > 2 else ("Sun", f"{8 + n:02d}:00", f"{8 + n:02d}:50")
+            rows.append((code, code, 3, day, start, end, f"B1-{100 + n}", capacity))
+        seed_data.insert_courses(rows)
+
+    def add_students(self, *ids, program="Computer", level=1):
+        seed_data.insert_students([(sid, "Sim", f"{sid}@kau.edu.stu.com", "1", "student") for sid in ids],
+                                  [(sid, "Sim", f"{sid}@kau.edu.stu.com", program, level) for sid in ids])
+
+    def add_plan(self, *codes, program="Computer", level=1):
+        seed_data.insert_rows("INSERT INTO program_plans (program, level, course_code) VALUES (?, ?, ?)",
+                              [(program, level, code) for code in codes])
+
+    def counters(self, code):
+        row = self.con.execute("SELECT enrolled, waitlisted FROM course_enrollment WHERE course_code=?",
+                               (code,)).fetchone()
+        return tuple(row) if row else (0, 0)
@@ -0,0 +1,60 @@
+import unittest
+
+import analytics
+import gpa_engine
+import seed_data
+import users_db
+from tests.db_case import DatabaseTestCase
+
+
+@unittest.skipUnless(analytics.NUMPY_AVAILABLE, "analytics needs numpy")
+class CohortTest(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.add_courses(("EE201", 30), ("EE202", 30), ("EE301", 30))
+        self.add_plan("EE201", "EE202")
+        self.add_plan("EE301", level=2)
+        self.add_students(2400001, 2400002, level=2)
+        self.add_students(2400003, program="Power")
+        users_db.upsert_grades([(2400001, "EE201", "2023-3", "F"), (2400001, "EE201", "2024-3", "A"),
+                                (2400001, "EE202", "2024-3", "B"),
+                                (2400002, "EE201", "2024-3", "D"), (2400002, "EE202", "2024-3", "W")])
+        users_db.register_courses_atomic(2400001, ["EE301"])
+        users_db.register_courses_atomic(2400003, ["EE201", "EE202"])
+        self.cohort = analytics.Cohort.load()
+
+    def test_grade_histogram_counts_every_row(self):
+        programs, grades, counts = self.cohort.grade_histogram()
+        self.assertEqual(programs, ["Computer", "Power"])
+        computer = dict(zip(grades, counts[0].tolist()))
+        self.assertEqual({g: n for g, n in computer.items() if n}, {"A": 1, "B": 1, "D": 1, "F": 1, "other": 1})
+        self.assertEqual(counts[1].sum(), 0)
+
+    def test_course_rates_and_credit_loads(self):
+        rates = self.cohort.course_rates()
+        self.assertEqual([r[:2] for r in rates], [("EE201", 3), ("EE202", 1)])
+        self.assertAlmostEqual(rates[0][2], 2 / 3)      # one F of three attempts
+        self.assertAlmostEqual(rates[0][3], 2 / 3)      # F and D
+        self.assertEqual(rates[1][2:], (1.0, 0.0))
+        self.assertEqual([r[0] for r in self.cohort.course_rates(min_attempts=2)], ["EE201"])
+        loads, students = self.cohort.credit_loads()
+        self.assertEqual((loads.tolist(), students.tolist()), ([0, 3, 6], [1, 1, 1]))
+
+    def test_plan_progress_counts_latest_passes_below_the_level(self):
+        self.assertEqual(self.cohort.plan_progress(), {("Computer", 2): 0.75})
+
+    def test_gpa_matches_the_gpa_engine_cache(self):
+        seed_data.seed(students=200, sections=64, seed_value=5)
+        cohort = analytics.Cohort.load()
+        gpa, credits = cohort.student_gpa()
+        for sid, g, c in zip(cohort.student_ids.tolist(), gpa.tolist(), credits.tolist()):
+            cached, cached_credits = gpa_engine.get_gpa(sid)
+            self.assertEqual(c, cached_credits, sid)
+            self.assertAlmostEqual(g, cached, places=9, msg=sid)
+        _, _, counts = cohort.gpa_distribution()
+        self.assertEqual(counts.sum(), int((credits > 0).sum()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import csv
+import os
+import unittest
+
+import bulk_enroll
+import users_db
+from registration_system import RegistrationSystem
+from tests.db_case import DatabaseTestCase
+
+
+class BulkEnrollTest(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.add_courses(("EE201", 2), ("EE202", 10))
+        self.add_plan("EE201", "EE202")
+        self.add_students(2400001, 2400002, 2400003, 2400004)
+        self.system = RegistrationSystem()
+
+    def test_seats_in_request_order_then_waitlist(self):
+        requests = [(sid, ["EE201", "EE202"]) for sid in (2400001, 2400002, 2400003)]
+        results = bulk_enroll.bulk_enroll(self.system, requests, chunk_size=2)
+        self.assertEqual([r.ok for r in results], [True, True, True])
+        self.assertEqual([r.registered for r in results], [["EE201", "EE202"], ["EE201", "EE202"], ["EE202"]])
+        self.assertEqual(results[2].waitlisted, ["EE201"])
+        self.assertEqual(self.counters("EE201"), (2, 1))
+        self.assertEqual(self.counters("EE202"), (3, 0))
+
+    def test_one_registered_student_does_not_fail_the_chunk(self):
+        users_db.register_courses_atomic(2400002, ["EE202"])
+        results = bulk_enroll.bulk_enroll(self.system, [(2400001, ["EE202"]), (2400002, ["EE202"]),
+                                                        (2400003, ["EE202"]), (2400999, ["EE202"])])
+        self.assertEqual([r.ok for r in results], [True, False, True, False])
+        self.assertEqual(results[1].message, "Already registered in EE202.")
+        self.assertEqual(results[3].message, "Student not found.")
+        self.assertEqual(self.counters("EE202"), (3, 0))
+
+    def test_codes_are_normalized_before_seats_are_counted(self):
+        results = bulk_enroll.bulk_enroll(self.system, [(2400001, ["ee 202"]), (2400002, ["Ee202 ", "EE202"])])
+        self.assertEqual([r.registered for r in results], [["EE202"], ["EE202"]])
+        self.assertEqual(self.counters("EE202"), (2, 0))
+
+
+    def test_cohort_cache_keeps_prerequisite_history_apart(self):
+        self.add_courses(("EE301", 10))
+        self.add_plan("EE301")
+        self.con.execute("INSERT INTO prerequisites (course_code, prereq_code) VALUES ('EE301', 'EE201')")
+        self.con.execute("INSERT INTO transcripts (student_id, course_code, grade) VALUES (2400002, 'EE201', 'B')")
+        self.con.commit()
+        results = bulk_enroll.bulk_enroll(self.system, [(sid, ["EE301"]) for sid in (2400001, 2400002, 2400003)])
+        self.assertEqual([r.ok for r in results], [False, True, False])
+        self.assertIn("EE201", results[0].message)
+
+    def test_requests_from_csv_and_plan(self):
+        path = os.path.join(self.tmp.name, "cohort.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows([["student_id", "course_code"], ["2400001", "ee 201"], [""],
+                                     ["2400002", "EE202"], ["2400001", "EE202"], ["2400001", "EE201 "]])
+        self.assertEqual(bulk_enroll.requests_from_csv(path),
+                         [(2400001, ["EE201", "EE202"]), (2400002, ["EE202"])])
+        self.assertEqual(sorted(bulk_enroll.requests_from_plan(self.system, "Computer", 1)),
+                         [(sid, ["EE201", "EE202"]) for sid in (2400001, 2400002, 2400003, 2400004)])
+        self.assertEqual(bulk_enroll.requests_from_plan(self.system, "Computer", 9), [])
+
+    def test_report_lists_every_student(self):
+        path = os.path.join(self.tmp.name, "report.csv")
+        results = bulk_enroll.bulk_enroll(self.system, [(2400001, ["EE201"]), (2400999, ["EE201"])])
+        bulk_enroll.write_report(results, path)
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[1:], [["2400001", "OK", "EE201", "", "Registered."],
+                                    ["2400999", "FAILED", "", "", "Student not found."]])
+
+
+if __name__ == "__main__":
+    unittest.main()
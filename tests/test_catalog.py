@@ -0,0 +1,36 @@
+import unittest
+
+from catalog import Catalog
+
+
+def course(credits=3):
+    return {"credits": credits, "prerequisites": [], "schedule": [("Sun", "08:00", "09:20")]}
+
+
+class CatalogSpellingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = Catalog([("EE201", course(3)), ("ee 202", course(4))])
+
+    def test_every_mapping_method_accepts_any_spelling(self):
+        self.assertEqual(list(self.catalog), ["EE201", "EE202"])
+        self.assertIn("ee 201", self.catalog)
+        self.assertNotIn("EE999", self.catalog)
+        self.assertNotIn(None, self.catalog)
+        self.assertEqual(self.catalog["Ee201"]["credits"], 3)
+        self.assertEqual(self.catalog.get("ee202")["credits"], 4)
+        self.assertEqual(self.catalog.total_credits(["EE201", "ee 202"]), 7)
+        self.assertEqual(self.catalog.pop("ee 202")["credits"], 4)
+        del self.catalog["ee 201"]
+        self.assertEqual(len(self.catalog), 0)
+
+    def test_unknown_codes_raise_key_error(self):
+        with self.assertRaises(KeyError):
+            del self.catalog["EE999"]
+        with self.assertRaises(KeyError):
+            self.catalog.total_credits(["EE999"])
+        self.assertIsNone(self.catalog.get("EE999"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+
+import schedule_engine
+from schedule_engine import ConflictMatrix, ScheduleIndex
+
+
+def catalog(**schedules):
+    return {code: {"schedule": [slot], "room": "R1"} for code, slot in schedules.items()}
+
+
+class ConflictMatrixCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "User.db.conflicts.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_saved_matrix_is_reused_only_for_the_same_slots(self):
+        schedule = ScheduleIndex(catalog(EE201=("Sun", "08:00", "09:20"), EE202=("Sun", "09:00", "10:20")))
+        ConflictMatrix.build(schedule).save(self.path)
+        self.assertEqual(os.listdir(self.tmp.name), ["User.db.conflicts.json"])
+
+        loaded = ConflictMatrix.load(self.path, ScheduleIndex(catalog(EE201=("Sun", "08:00", "09:20"),
+                                                                      EE202=("Sun", "09:00", "10:20"))))
+        self.assertIsNotNone(loaded)
+        self.assertTrue(loaded.has_hard_conflict(["EE201", "EE202"]))
+
+        # Rebuilt database: same codes (and possibly the same version counter), different times
+        reseeded = ScheduleIndex(catalog(EE201=("Sun", "08:00", "09:20"), EE202=("Mon", "09:00", "10:20")))
+        self.assertIsNone(ConflictMatrix.load(self.path, reseeded))
+
+    def test_unknown_code_falls_back_to_the_sweep(self):
+        schedule = ScheduleIndex(catalog(EE201=("Sun", "08:00", "09:20")))
+        matrix = ConflictMatrix.build(schedule)
+        schedule.update("EE250", {"schedule": [("Sun", "08:30", "09:00")], "room": "R1"})
+
+        self.assertFalse(matrix.covers(["EE201", "EE250"]))
+        self.assertTrue(matrix.has_hard_conflict(["EE201", "EE250"]))
+        self.assertTrue(ConflictMatrix([], [], []).has_hard_conflict(["EE201"]))
+
+
+class DayParsingTest(unittest.TestCase):
+
+    def test_unknown_days_are_skipped_without_touching_shared_tables(self):
+        before = (schedule_engine.DAY_NAMES, dict(schedule_engine.DAY_INDEX))
+        slots = schedule_engine.parse_slots([("sunday/TBA/Tue", "08:00", "09:20")])
+        self.assertEqual(list(slots), [0, 480, 560, 2, 480, 560])
+        self.assertEqual((schedule_engine.DAY_NAMES, schedule_engine.DAY_INDEX), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+
+import course_codes
+from catalog import Catalog
+from prereq_graph import PrerequisiteGraph
+
+
+class CodeIndexTest(unittest.TestCase):
+
+    def test_spellings_share_one_id(self):
+        index = course_codes.CodeIndex()
+        self.assertEqual(index.id("EE201"), index.id("ee 201"))
+        self.assertEqual(index.get(" Ee201"), 0)
+        self.assertIsNone(index.get("EE999"))
+        self.assertEqual(index.codes, ["EE201"])
+
+    def test_catalog_and_prerequisite_graph_use_the_same_ids(self):
+        catalog = Catalog([("EE301", {"credits": 3, "prerequisites": ["EE201"], "schedule": []}),
+                           ("EE201", {"credits": 3, "prerequisites": [], "schedule": []})])
+        graph = PrerequisiteGraph.from_courses_data(catalog)
+        for code in ("EE201", "EE301"):
+            self.assertEqual(catalog.index[code], graph.index[code])
+            self.assertEqual(catalog.index[code], course_codes.CODES.get(code))
+        self.assertEqual(graph.missing("EE301", []), ["EE201"])
+        self.assertEqual(graph.eligible([]), {"EE201"})
+
+
+if __name__ == "__main__":
+    unittest.main()
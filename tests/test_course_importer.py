@@ -0,0 +1,74 @@
+import csv
+import os
+import unittest
+
+import course_importer
+from tests.db_case import DatabaseTestCase
+
+HEADER = ["course_code", "course_name", "credits", "day", "start_time", "end_time", "room", "max_capacity",
+          "prerequisites"]
+
+
+class ImportCoursesTest(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.add_courses(("EE201", 30), ("EE202", 30))
+        self.con.execute("INSERT INTO prerequisites (course_code, prereq_code) VALUES ('EE202', 'EE201')")
+        self.con.commit()
+        self.path = os.path.join(self.tmp.name, "catalog.csv")
+
+    def write(self, *rows):
+        with open(self.path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows([HEADER] + [list(r) for r in rows])
+
+    def course(self, code):
+        return self.con.execute("SELECT course_name, credits, max_capacity FROM courses WHERE course_code=?",
+                                (code,)).fetchone()
+
+    def prereqs(self, code):
+        return sorted(p for p, in self.con.execute(
+            "SELECT prereq_code FROM prerequisites WHERE course_code=?", (code,)))
+
+    def test_rows_are_checked_across_chunks(self):
+        self.write(("ee 301", "Signals", 3, "Mon", "08:00", "09:20", "B1-1", 40, "EE202"),
+                   ("EE302", "Bad", "x", "Mon", "08:00", "09:20", "B1-1", 40),
+                   ("EE201", "Circuits", 3, "Sun", "08:00", "09:20", "B1-1", 30),
+                   ("EE301", "Again", 3, "Mon", "08:00", "09:20", "B1-1", 40),
+                   ("EE303", "Short", 3))
+        result = course_importer.import_courses(self.path, chunk_size=2)
+        self.assertEqual((result.added, result.updated, result.unchanged), (1, 0, 0))
+        self.assertEqual([e.split(":")[0] for e in result.errors],
+                         ["Row 2", "Row 3 (EE201)", "Row 4 (EE301)", "Row 5"])
+        self.assertEqual(self.course("EE301"), ("Signals", 3, 40))
+        self.assertEqual(self.prereqs("EE301"), ["EE202"])
+
+    def test_update_and_cycle_skip(self):
+        self.write(("EE201", "Circuits I", 4, "Sun", "08:00", "08:50", "B1-100", 30, "EE202"),
+                   ("EE202", "EE202", 3, "Sun", "09:00", "09:50", "B1-101", 45))
+        result = course_importer.import_courses(self.path, update_existing=True)
+        self.assertEqual((result.added, result.updated, result.unchanged), (0, 2, 0))
+        self.assertEqual(len(result.errors), 1)
+        self.assertIn("Row 1 (EE201): Prerequisite cycle", result.errors[0])
+        # The rest of the row and the other rows still land; EE201 keeps its old prerequisites
+        self.assertEqual(self.course("EE201"), ("Circuits I", 4, 30))
+        self.assertEqual(self.course("EE202"), ("EE202", 3, 45))
+        self.assertEqual(self.prereqs("EE201"), [])
+        self.assertEqual(self.prereqs("EE202"), ["EE201"])
+
+    def test_diff_is_a_dry_run(self):
+        self.write(("EE201", "EE201", 3, "Sun", "08:00", "08:50", "B1-100", 30),
+                   ("EE202", "EE202", 3, "Sun", "09:00", "09:50", "B1-101", 60, ""),
+                   ("EE301", "Signals", 3, "Mon", "08:00", "09:20", "B1-1", 40))
+        before = self.con.execute("SELECT * FROM courses ORDER BY 1").fetchall()
+        result = course_importer.import_courses(self.path, update_existing=True, diff=True)
+        self.assertEqual(result.diff, [("same", "EE201", None),
+                                       ("update", "EE202", {"max_capacity": (30, 60)}),
+                                       ("add", "EE301", None),
+                                       ("prerequisites", "EE202", {"prerequisites": (["EE201"], [])})])
+        self.assertEqual(self.con.execute("SELECT * FROM courses ORDER BY 1").fetchall(), before)
+        self.assertEqual(self.prereqs("EE202"), ["EE201"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from data_worker import DataWorker
+
+app = QApplication.instance() or QApplication([])
+
+
+class DataWorkerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.worker = DataWorker(max_threads=1)
+        self.gate = threading.Event()
+        self.calls = []
+        self.results = []
+        self.loading = []
+        self.worker.loading.connect(lambda key, busy: self.loading.append((key, busy)))
+
+    def tearDown(self):
+        self.gate.set()
+        self.worker.pool.waitForDone()
+        app.processEvents()
+
+    def blocked(self, value):
+        self.calls.append(value)
+        self.gate.wait(5)
+        return value
+
+    def record(self, value):
+        self.calls.append(value)
+        return value
+
+    def wait_until(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition() and time.monotonic() < deadline:
+            app.processEvents()
+            time.sleep(0.005)
+
+    def settle(self):
+        """Lets every job finish and delivers whatever they emitted."""
+        self.worker.pool.waitForDone()
+        app.processEvents()
+
+    def test_queued_requests_for_a_key_coalesce(self):
+        self.worker.request("other", self.blocked, "busy", on_result=lambda v: None)    # holds the only thread
+        for n in range(5):
+            self.worker.request("students", self.record, n, on_result=self.results.append)
+        self.gate.set()
+        self.wait_until(lambda: self.results)
+        self.settle()
+        self.assertEqual(self.calls, ["busy", 4])
+        self.assertEqual(self.results, [4])
+        self.assertEqual([e for e in self.loading if e[0] == "students"], [("students", True), ("students", False)])
+
+    def test_running_request_is_superseded(self):
+        self.worker.request("students", self.blocked, "old", on_result=self.results.append)
+        self.wait_until(lambda: self.calls)     # "old" is running now
+        self.worker.request("students", self.record, "new", on_result=self.results.append)
+        self.gate.set()
+        self.wait_until(lambda: self.results)
+        self.settle()
+        self.assertEqual(self.calls, ["old", "new"])
+        self.assertEqual(self.results, ["new"])
+        self.assertEqual(self.loading, [("students", True), ("students", False)])
+
+    def test_cancel_drops_queued_work(self):
+        self.worker.request("other", self.blocked, "busy", on_result=lambda v: None)
+        self.worker.request("students", self.record, 1, on_result=self.results.append)
+        self.worker.cancel("students")
+        self.assertFalse(self.worker.is_loading("students"))
+        self.gate.set()
+        self.wait_until(lambda: not self.worker.is_loading("other"))
+        self.settle()
+        self.assertEqual(self.calls, ["busy"])
+        self.assertEqual(self.results, [])
+
+    def test_errors_go_to_on_error(self):
+        errors = []
+        self.worker.request("students", lambda: 1 / 0, on_result=self.results.append, on_error=errors.append)
+        self.wait_until(lambda: errors)
+        self.settle()
+        self.assertIn("ZeroDivisionError", errors[0])
+        self.assertEqual(self.results, [])
+        self.assertFalse(self.worker.is_loading("students"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import db_connection
+import users_db
+from tests.db_case import DatabaseTestCase
+
+
+class RegistrationCounterTest(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.add_courses(("EE201", 5), ("EE202", 5))
+        self.add_students(2400001, 2400002, 2400003)
+
+    def register(self, *pairs):
+        self.con.executemany("INSERT INTO registration (student_id, course_code) VALUES (?, ?)", pairs)
+        self.con.commit()
+
+    def test_insert_and_delete_keep_the_count(self):
+        self.register((2400001, "EE201"), (2400002, "EE201"), (2400003, "EE202"))
+        self.assertEqual(self.counters("EE201"), (2, 0))
+        self.assertEqual(self.counters("EE202"), (1, 0))
+        self.con.execute("DELETE FROM registration WHERE course_code = 'EE201'")
+        self.con.commit()
+        self.assertEqual(self.counters("EE201"), (0, 0))
+        self.assertEqual(self.counters("EE202"), (1, 0))
+
+    def test_moving_a_registration_moves_the_count(self):
+        self.register((2400001, "EE201"))
+        self.con.execute("UPDATE registration SET course_code = 'EE202' WHERE student_id = 2400001")
+        self.con.commit()
+        self.assertEqual(self.counters("EE201"), (0, 0))
+        self.assertEqual(self.counters("EE202"), (1, 0))
+
+    def test_rolled_back_insert_leaves_the_count(self):
+        self.register((2400001, "EE201"))
+        self.con.execute("INSERT INTO registration (student_id, course_code) VALUES (2400002, 'EE201')")
+        self.con.rollback()
+        self.assertEqual(self.counters("EE201"), (1, 0))
+
+
+
+class WaitlistCounterTest(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.add_courses(("EE201", 1), ("EE202", 1))
+        self.add_students(2400001, 2400002, 2400003)
+        for sid in (2400001, 2400002):
+            users_db.add_to_waitlist(sid, "EE201")
+
+    def test_waitlist_changes_keep_the_count(self):
+        self.assertEqual(self.counters("EE201"), (0, 2))
+        self.assertTrue(users_db.leave_waitlist(2400001, "EE201"))
+        self.assertFalse(users_db.leave_waitlist(2400001, "EE201"))
+        self.con.execute("UPDATE waitlist SET course_code = 'EE202' WHERE student_id = 2400002")
+        self.con.commit()
+        self.assertEqual(self.counters("EE201"), (0, 0))
+        self.assertEqual(self.counters("EE202"), (0, 1))
+
+    def test_rebuild_repairs_drift_and_reports_it(self):
+        users_db.register_courses_atomic(2400003, ["EE202"])
+        self.assertEqual(users_db.rebuild_enrollment_counters(), [])
+
+        self.con.execute("UPDATE course_enrollment SET enrolled = 7 WHERE course_code = 'EE202'")
+        self.con.execute("INSERT INTO course_enrollment (course_code, enrolled, waitlisted) VALUES ('EE999', 1, 1)")
+        self.con.commit()
+        self.assertEqual(users_db.rebuild_enrollment_counters(), [("EE202", 7, 0), ("EE999", 1, 1)])
+        self.assertEqual(self.counters("EE201"), (0, 2))
+        self.assertEqual(self.counters("EE202"), (1, 0))
+        self.assertEqual(self.counters("EE999"), (0, 0))
+
+    def test_rebuild_counters_command(self):
+        self.con.execute("UPDATE course_enrollment SET waitlisted = 0 WHERE course_code = 'EE201'")
+        self.con.commit()
+        db_connection.close_connection()
+        os.replace(self.db_path, os.path.join(self.tmp.name, "User.db"))     # the script uses ./User.db
+
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        out = subprocess.run([sys.executable, os.path.join(root, "migrations.py"), "--rebuild-counters"],
+                             cwd=self.tmp.name, capture_output=True, text=True, check=True).stdout
+        self.assertIn("Repaired EE201 (was enrolled=0, waitlisted=0)", out)
+        self.assertIn("1 course(s) had drifted", out)
+
+        db_connection.configure(db_path=os.path.join(self.tmp.name, "User.db"))
+        self.con = db_connection.get_connection()
+        self.assertEqual(self.counters("EE201"), (0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
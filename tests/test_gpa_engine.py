@@ -0,0 +1,64 @@
+import unittest
+
+import gpa_engine
+import users_db
+from tests.db_case import DatabaseTestCase
+
+
+class GpaCacheTest(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.add_courses(("EE201", 30), ("EE202", 30), ("EE203", 30))
+        self.add_students(2400001, 2400002)
+
+    def cached(self):
+        return (self.con.execute("SELECT * FROM student_gpa ORDER BY 1").fetchall(),
+                self.con.execute("SELECT * FROM student_term_gpa ORDER BY 1, 2").fetchall())
+
+    def assert_cache_matches_a_recompute(self):
+        before = self.cached()
+        gpa_engine.recompute_all()
+        self.assertEqual(self.cached(), before)
+
+    def test_retake_replaces_the_old_grade_in_the_cumulative_gpa(self):
+        users_db.upsert_grades([(2400001, "EE201", "2023-3", "F"), (2400001, "EE202", "2023-3", "B"),
+                                (2400001, "EE201", "2024-3", "A")])
+        self.assertEqual(gpa_engine.get_gpa(2400001), ((4.75 + 4.0) / 2, 6))
+        self.assertEqual(gpa_engine.get_term_gpa(2400001, "2023-3"), ((1.0 + 4.0) / 2, 6))
+        self.assertEqual(gpa_engine.get_term_gpa(2400001, "2024-3"), (4.75, 3))
+        self.assertEqual(self.con.execute("SELECT term, attempt FROM transcripts WHERE course_code = 'EE201' "
+                                          "ORDER BY term").fetchall(), [("2023-3", 1), ("2024-3", 2)])
+        self.assertEqual(users_db.get_latest_grades(2400001)["EE201"], "A")
+        self.assert_cache_matches_a_recompute()
+
+        users_db.upsert_grades([(2400001, "EE201", "2024-3", "")])     # retake removed
+        self.assertEqual(gpa_engine.get_gpa(2400001), ((1.0 + 4.0) / 2, 6))
+        self.assertEqual(gpa_engine.get_term_gpa(2400001, "2024-3"), (0.0, 0))
+        self.assert_cache_matches_a_recompute()
+
+    def test_ungraded_entries_and_credit_changes(self):
+        users_db.upsert_grades([(2400001, "EE201", "2024-3", "b+"), (2400001, "EE202", "2024-3", "W"),
+                                (2400002, "EE203", "2024-3", "A+")])
+        self.assertEqual(gpa_engine.get_gpa(2400001), (4.5, 3))
+        self.assertEqual(gpa_engine.get_gpa(2400099), (0.0, 0))
+
+        self.con.execute("UPDATE courses SET credits = 4 WHERE course_code = 'EE201'")
+        self.con.commit()
+        gpa_engine.refresh_courses(["EE201"])
+        self.assertEqual(gpa_engine.get_gpa(2400001), (4.5, 4))
+        self.assert_cache_matches_a_recompute()
+
+    def test_standing_lists(self):
+        users_db.upsert_grades([(2400001, code, "2024-3", "A+") for code in ("EE201", "EE202", "EE203")] +
+                               [(2400002, "EE201", "2024-3", "D"), (2400002, "EE202", "2024-3", "F")])
+        self.assertEqual(gpa_engine.deans_list("2024-3", min_credits=9), [(2400001, 5.0, 9)])
+        self.assertEqual(gpa_engine.deans_list("2024-3"), [])        # 9 graded credits < 12
+        self.assertEqual(gpa_engine.probation_list(), [(2400002, 1.5, 6)])
+        self.assertEqual(gpa_engine.standing(*gpa_engine.get_gpa(2400001)), "Dean's List")
+        self.assertEqual(gpa_engine.standing(*gpa_engine.get_gpa(2400002)), "Probation")
+        self.assertEqual(gpa_engine.standing(0.0, 0), "Regular")
+
+
+if __name__ == "__main__":
+    unittest.main()
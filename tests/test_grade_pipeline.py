@@ -0,0 +1,44 @@
+import os
+
+import grade_pipeline
+from tests.db_case import DatabaseTestCase
+
+
+class ImportGradesTest(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.add_courses(("EE201", 30), ("EE202", 30))
+        self.add_students(2400001)
+
+    def sheet(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def grades(self):
+        return self.con.execute("SELECT course_code, term, grade FROM transcripts ORDER BY course_code").fetchall()
+
+    def test_malformed_json_line_is_a_row_error(self):
+        path = self.sheet("grades.jsonl",
+                          '{"student_id": 2400001, "course_code": "EE201", "grade": "A", "term": "2025-1"}\n'
+                          '{"student_id": 2400001, "course_code": \n'
+                          '\n'
+                          '{"student_id": 2400001, "course_code": "ee 202", "grade": "B"}\n')
+        result = grade_pipeline.import_grades(path)
+        self.assertEqual(result.saved, 2)
+        self.assertEqual(len(result.errors), 1)
+        self.assertTrue(result.errors[0].startswith("Row 2: Invalid JSON"), result.errors)
+        self.assertEqual(self.grades(), [("EE201", "2025-1", "A"), ("EE202", "2025-3", "B")])
+
+    def test_csv_errors_and_dry_run(self):
+        path = self.sheet("grades.csv", "student_id,course_code,grade,term\n"
+                                        "2400001,EE201,A,2025-1\n2400001,EE999,B,\n2400009,EE202,B,\n"
+                                        "2400001,EE202,Q,\n2400001,EE202,B,25\n")
+        result = grade_pipeline.import_grades(path, dry_run=True)
+        self.assertEqual(result.saved, 1)
+        self.assertEqual([e.split(":")[0] for e in result.errors], ["Row 3", "Row 4", "Row 5", "Row 6"])
+        self.assertEqual(self.grades(), [])
+        self.assertEqual(grade_pipeline.import_grades(path).saved, 1)
+        self.assertEqual(self.grades(), [("EE201", "2025-1", "A")])
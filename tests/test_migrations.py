@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import db_connection
+import gpa_engine
+import migrations
+import users_db
+
+
+class FailedMigrationTest(unittest.TestCase):
+    """A step that fails half-way must leave no trace, so the next run can apply it."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        db_connection.configure(db_path=os.path.join(self.tmp.name, "test.db"))
+
+    def tearDown(self):
+        db_connection.close_connection()
+        self.tmp.cleanup()
+
+    def columns(self, table):
+        return {row[1] for row in db_connection.get_connection().execute(f"PRAGMA table_info({table})")}
+
+    def test_rerun_after_failure_in_step_with_alter_table(self):
+        def broken_m008(con):
+            migrations._m008_transcript_terms(con)   # ALTER TABLE ... ADD COLUMN first
+            raise RuntimeError("injected failure")
+
+        steps = [(v, d, broken_m008 if v == 8 else f) for v, d, f in migrations.MIGRATIONS]
+        with mock.patch.object(migrations, "MIGRATIONS", steps):
+            with self.assertRaises(RuntimeError):
+                users_db.setup_database()
+
+        con = db_connection.get_connection()
+        self.assertEqual(migrations.get_schema_version(con), 7)
+        self.assertNotIn("term", self.columns("transcripts"))
+        self.assertFalse(con.in_transaction)
+
+        applied = migrations.migrate(con)
+        self.assertEqual(applied, [v for v, _, _ in migrations.MIGRATIONS if v >= 8])
+        self.assertEqual(migrations.get_schema_version(con), migrations.MIGRATIONS[-1][0])
+        self.assertTrue({"term", "attempt"} <= self.columns("transcripts"))
+        self.assertEqual(migrations.migrate(con), [])
+
+
+
+class LegacyDataMigrationTest(unittest.TestCase):
+    """Migrations 8-10 on rows written before terms and canonical codes existed."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        db_connection.configure(db_path=os.path.join(self.tmp.name, "test.db"))
+        steps = [step for step in migrations.MIGRATIONS if step[0] <= 7]
+        with mock.patch.object(migrations, "MIGRATIONS", steps):
+            users_db.setup_database()
+        con = db_connection.get_connection()
+        con.executemany("INSERT INTO courses (course_code, course_name, credits, max_capacity) VALUES (?, ?, ?, 30)",
+                        [("EE 201", "Circuits", 3), ("MATH110", "Calculus", 4)])
+        con.executemany("INSERT INTO transcripts (student_id, course_code, grade) VALUES (?, ?, ?)",
+                        [(2400001, "ee 201", "A"), (2400001, "MATH 110", "B"), (2400002, "EE201", "F")])
+        con.commit()
+
+    def tearDown(self):
+        db_connection.close_connection()
+        self.tmp.cleanup()
+
+    def test_codes_canonical_and_gpa_cache_matches_gpa_engine(self):
+        con = db_connection.get_connection()
+        self.assertEqual(migrations.migrate(con), [8, 9, 10])
+        self.assertEqual(con.execute("SELECT course_code FROM courses ORDER BY 1").fetchall(),
+                         [("EE201",), ("MATH110",)])
+        self.assertEqual(con.execute("SELECT student_id, course_code, term, attempt FROM transcripts ORDER BY 1, 2")
+                         .fetchall(), [(2400001, "EE201", "", 1), (2400001, "MATH110", "", 1), (2400002, "EE201", "", 1)])
+        cached = con.execute("SELECT * FROM student_gpa ORDER BY 1").fetchall()
+        self.assertEqual(cached, [(2400001, 3 * 4.75 + 4 * 4.0, 7), (2400002, 3 * 1.0, 3)])
+        # The frozen migration SQL and today's gpa_engine agree
+        gpa_engine.rebuild(con)
+        self.assertEqual(con.execute("SELECT * FROM student_gpa ORDER BY 1").fetchall(), cached)
+        con.commit()
+
+
+if __name__ == "__main__":
+    unittest.main()
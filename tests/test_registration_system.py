@@ -0,0 +1,158 @@
+import unittest
+
+import users_db
+from registration_system import RegistrationSystem
+from Student import Student
+from tests.db_case import DatabaseTestCase
+
+
+class RegistrationSystemTest(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.add_courses(("EE201", 1), ("EE202", 5))
+        self.add_plan("EE201", "EE202")
+        self.add_students(2400001, 2400002)
+        self.system = RegistrationSystem()
+
+    def student(self, sid):
+        return Student(sid, "Sim", "", "Computer", 1, "")
+
+    def test_unknown_code_is_rejected_not_raised(self):
+        ok, msg = self.system.register_courses_for_student(self.student(2400001), ["zz 999"])
+        self.assertFalse(ok)
+        self.assertIn("ZZ999 does not exist", msg)
+        ok, msg = self.system.register_courses_for_student(self.student(2400001), ["ee201", "zz 999"])
+        self.assertFalse(ok)
+        self.assertEqual(self.counters("EE201"), (0, 0))
+
+    def test_drop_accepts_non_canonical_codes(self):
+        self.system.register_courses_for_student(self.student(2400001), ["EE202"])
+        ok, msg = self.system.drop_course_for_student(self.student(2400001), "ee 202")
+        self.assertTrue(ok)
+        self.assertIn("Dropped EE202", msg)
+        self.assertEqual(self.system.get_student_registered_courses(self.student(2400001)), [])
+        self.assertEqual(self.counters("EE202"), (0, 0))
+
+    def test_drop_of_a_course_not_held_promotes_nobody(self):
+        self.system.register_courses_for_student(self.student(2400001), ["EE201"])
+        self.system.register_courses_for_student(self.student(2400002), ["EE201"])     # full: waitlisted
+        self.con.execute("UPDATE courses SET max_capacity = 2 WHERE course_code = 'EE201'")
+        self.con.commit()
+        ok, msg = self.system.drop_course_for_student(self.student(2400002), "EE201")
+        self.assertFalse(ok)
+        self.assertEqual(msg, "You are not registered in EE201.")
+        self.assertEqual(self.counters("EE201"), (1, 1))
+
+    def test_drop_promotes_the_first_waitlisted_student(self):
+        self.system.register_courses_for_student(self.student(2400001), ["EE201"])
+        ok, msg = self.system.register_courses_for_student(self.student(2400002), ["EE201"])
+        self.assertIn("waitlist", msg)
+        ok, msg = self.system.drop_course_for_student(self.student(2400001), "EE201")
+        self.assertTrue(ok)
+        self.assertIn("2400002", msg)
+        self.assertEqual(self.system.get_student_registered_courses(self.student(2400002)), ["EE201"])
+        self.assertEqual(self.counters("EE201"), (1, 0))
+
+    def test_background_matrix_is_dropped_if_the_catalog_moved_on(self):
+        key, fn, args = self.system.conflict_matrix_job()
+        matrix = fn(*args)
+        self.add_courses(("EE203", 5))
+        self.system.refresh_data()
+        self.assertFalse(self.system.install_conflict_matrix(key, matrix))
+        self.assertFalse(self.system.has_conflict_matrix())
+
+        key, fn, args = self.system.conflict_matrix_job()
+        self.assertTrue(self.system.install_conflict_matrix(key, fn(*args)))
+        self.assertIs(self.system.validator.conflicts.schedule, self.system.schedule)
+        self.assertIn("EE203", self.system.conflict_matrix().codes)
+
+
+
+class CatalogDeltaTest(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.add_courses(("EE201", 5), ("EE202", 5), ("EE203", 5))
+        self.add_plan("EE201", "EE202")
+        self.system = RegistrationSystem()
+
+    def assert_matches_a_fresh_load(self):
+        fresh = RegistrationSystem()
+        self.assertEqual(self.system.change_seq, fresh.change_seq)
+        self.assertEqual(sorted(self.system.courses_data), sorted(fresh.courses_data))
+        for code in fresh.courses_data:
+            self.assertEqual(self.system.courses_data[code], fresh.courses_data[code], code)
+        self.assertEqual({p: {lvl: sorted(codes) for lvl, codes in levels.items()}
+                          for p, levels in self.system.program_plan.items()},
+                         {p: {lvl: sorted(codes) for lvl, codes in levels.items()}
+                          for p, levels in fresh.program_plan.items()})
+        self.assertEqual(self.system.schedule.conflicts_with(["EE201"]), fresh.schedule.conflicts_with(["EE201"]))
+
+    def test_edits_are_applied_in_place(self):
+        courses, plan = self.system.courses_data, self.system.program_plan
+        self.con.execute("UPDATE courses SET start_time = '08:30', end_time = '09:20' WHERE course_code = 'EE203'")
+        self.con.execute("INSERT INTO prerequisites (course_code, prereq_code) VALUES ('EE202', 'EE201')")
+        self.con.execute("DELETE FROM program_plans WHERE course_code = 'EE202'")
+        self.con.execute("INSERT INTO program_plans (program, level, course_code) VALUES ('Computer', 2, 'EE203')")
+        self.con.execute("DELETE FROM courses WHERE course_code = 'EE201'")
+        self.con.commit()
+
+        self.assertTrue(self.system.refresh_data())
+        self.assertIs(self.system.courses_data, courses)
+        self.assertIs(self.system.program_plan, plan)
+        self.assert_matches_a_fresh_load()
+        self.assertEqual(self.system.prereqs.missing("EE202", []), ["EE201"])
+        self.assertFalse(self.system.refresh_data())
+
+    def test_pruned_log_falls_back_to_a_full_reload(self):
+        courses = self.system.courses_data
+        self.add_courses(("EE204", 5))
+        self.add_courses(("EE205", 5))
+        users_db.prune_catalog_changes(users_db.get_catalog_change_seq() - 1)
+
+        self.assertTrue(self.system.refresh_data())
+        self.assertIsNot(self.system.courses_data, courses)
+        self.assert_matches_a_fresh_load()
+
+
+
+class BatchPromotionTest(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.add_courses(("EE201", 2), ("EE202", 1, "Sun", "08:00", "08:50"), ("EE203", 1))    # EE201/EE202 clash
+        self.add_plan("EE201", "EE202", "EE203")
+        self.add_students(*range(2400001, 2400007))
+        users_db.register_courses_atomic(2400001, ["EE201"])
+        users_db.register_courses_atomic(2400002, ["EE201"])
+        users_db.register_courses_atomic(2400003, ["EE202"])
+        for sid in (2400003, 2400004, 2400005, 2400006):
+            users_db.add_to_waitlist(sid, "EE201")
+        self.system = RegistrationSystem()
+
+    def waiting(self, code):
+        return [r[0] for r in self.con.execute("SELECT student_id FROM waitlist WHERE course_code=? ORDER BY seq",
+                                               (code,))]
+
+    def test_drop_storm_promotes_in_queue_order_and_skips_invalid_students(self):
+        dropped, result = self.system.drop_courses([(2400001, "EE201"), (2400002, "EE201"), (2400006, "EE203")])
+        self.assertEqual(dropped, 2)
+        self.assertEqual(result.promoted, [(2400004, "EE201"), (2400005, "EE201")])
+        self.assertEqual([(sid, code) for sid, code, _ in result.skipped], [(2400003, "EE201")])
+        self.assertEqual(self.waiting("EE201"), [2400003, 2400006])
+        self.assertEqual(self.counters("EE201"), (2, 2))
+
+    def test_later_courses_in_a_batch_see_the_new_timetable(self):
+        users_db.add_to_waitlist(2400004, "EE202")
+        self.con.execute("UPDATE courses SET max_capacity = 5 WHERE course_code IN ('EE201', 'EE202')")
+        self.con.commit()
+        result = self.system.promote_waitlisted()
+        self.assertEqual(sorted(result.promoted), [(2400004, "EE201"), (2400005, "EE201"), (2400006, "EE201")])
+        self.assertIn((2400004, "EE202"), [(sid, code) for sid, code, _ in result.skipped])
+        self.assertEqual(self.counters("EE201"), (5, 1))
+        self.assertEqual(self.counters("EE202"), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
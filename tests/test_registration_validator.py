@@ -0,0 +1,61 @@
+import unittest
+
+from prereq_graph import PrerequisiteGraph
+from registration_validator import RegistrationValidator
+from schedule_engine import ConflictMatrix
+
+
+def course(prerequisites=(), schedule=(("Sun", "08:00", "09:20"),), credits=3):
+    return {"credits": credits, "prerequisites": list(prerequisites), "schedule": list(schedule), "room": "R1"}
+
+
+class CheckPrerequisitesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.courses = {"EE201": course(), "EE301": course(["EE201"], [("Mon", "08:00", "09:20")])}
+        self.validator = RegistrationValidator(self.courses, {"Computer": {1: ["EE201", "EE301"]}})
+
+    def test_non_canonical_spelling_is_checked_against_its_prerequisites(self):
+        ok, msg = self.validator.check_prerequisites(["ee 301"], [])
+        self.assertFalse(ok)
+        self.assertIn("EE201", msg)
+        self.assertTrue(self.validator.check_prerequisites(["ee 301"], ["EE201"])[0])
+
+    def test_code_unknown_to_the_graph_is_rejected(self):
+        self.validator.prereqs = PrerequisiteGraph([], ["EE201"])    # graph from before EE301 was added
+        ok, msg = self.validator.check_prerequisites(["EE301"], [])
+        self.assertFalse(ok)
+        self.assertIn("does not exist", msg)
+
+    def test_missing_mask_raises_for_unknown_codes(self):
+        with self.assertRaises(KeyError):
+            self.validator.prereqs.missing_mask("EE999", 0)
+
+
+class ValidateRegistrationTest(unittest.TestCase):
+
+    def setUp(self):
+        courses = {"EE201": course(), "EE202": course(schedule=[("Sun", "09:00", "10:20")]),
+                   "EE301": course(["EE201"], [("Mon", "08:00", "09:20")])}
+        self.validator = RegistrationValidator(courses, {"Computer": {1: list(courses)}})
+
+    def validate(self, selected, completed=()):
+        return self.validator.validate_registration(selected, list(completed), "Computer", 1, None)
+
+    def test_selected_and_completed_codes_are_normalized(self):
+        self.assertTrue(self.validate(["ee 301"], ["ee201 "])[0])
+
+    def test_conflict_found_for_non_canonical_codes(self):
+        self.validator.conflicts = ConflictMatrix.build(self.validator.schedule)
+        ok, msg = self.validate(["ee201", "Ee 202"])
+        self.assertFalse(ok)
+        self.assertIn("overlaps", msg)
+
+    def test_unknown_code_stops_at_the_prerequisite_check(self):
+        ok, msg = self.validate(["EE201", "zz 999"])
+        self.assertFalse(ok)
+        self.assertEqual(msg, "Course ZZ999 does not exist.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import contextlib
+import io
+import os
+import random
+import unittest
+
+import db_connection
+import seed_data
+import users_db
+from tests.db_case import DatabaseTestCase
+
+
+class SeedDataTest(DatabaseTestCase):
+
+    def dump(self):
+        tables = ("courses", "prerequisites", "program_plans", "users", "students", "transcripts")
+        return {t: sorted(self.con.execute(f"SELECT * FROM {t}").fetchall()) for t in tables}
+
+    def count(self, table):
+        return self.con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_same_seed_gives_the_same_data(self):
+        seed_data.seed(students=50, sections=32, seed_value=7)
+        first = self.dump()
+        db_connection.close_connection()
+        db_connection.configure(db_path=os.path.join(self.tmp.name, "again.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            users_db.setup_database()
+        self.con = db_connection.get_connection()
+        seed_data.seed(students=50, sections=32, seed_value=7)
+        self.assertEqual(self.dump(), first)
+
+    def test_counts_match_the_rows_written(self):
+        counts = seed_data.seed(students=40, sections=32, seed_value=3)
+        for table in ("courses", "prerequisites", "program_plans", "students", "transcripts"):
+            self.assertEqual(counts[table], self.count(table), table)
+        self.assertEqual(self.count("users"), 40)
+        self.assertEqual(len(counts["student_rows"]), 40)
+        # Only students past level 1 have a history, all of it from their own program's lower levels
+        bad = self.con.execute("""SELECT COUNT(*) FROM transcripts t JOIN students s ON s.id = t.student_id
+                                  JOIN program_plans p ON p.course_code = t.course_code
+                                  WHERE p.program <> s.program OR p.level >= s.level""").fetchone()[0]
+        self.assertEqual(bad, 0)
+
+    def test_reseeding_never_reuses_an_id(self):
+        seed_data.seed(students=30, sections=16, seed_value=1)
+        counts = seed_data.seed(students=30, seed_value=1, with_catalog=False)
+        self.assertEqual(counts["students"], 30)
+        self.assertEqual(self.count("students"), 60)
+        self.assertEqual(self.con.execute("SELECT COUNT(DISTINCT id) FROM users").fetchone()[0], 60)
+
+    def test_exhausted_id_range_is_an_error(self):
+        self.add_students(100, 101)
+        ids = seed_data.new_student_ids(random.Random(1), 2, (100, 101))    # widened to 100-104
+        self.assertEqual(len(set(ids)), 2)
+        self.assertTrue(set(ids) <= {102, 103, 104})
+        self.add_students(102, 103, 104)
+        with self.assertRaises(ValueError):
+            seed_data.new_student_ids(random.Random(1), 2, (100, 101))
+
+
+if __name__ == "__main__":
+    unittest.main()
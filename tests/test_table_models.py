@@ -0,0 +1,39 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QItemSelectionModel, Qt
+from PyQt5.QtWidgets import QApplication
+
+from table_models import RowTableModel, make_table_view, selected_row
+
+app = QApplication.instance() or QApplication([])
+
+
+class SortKeepsSelectionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.model = RowTableModel(["ID", "Name"])
+        self.model.set_rows([(3, "Cara"), (1, "Adam"), (2, "Badr"), (4, None)])
+        self.view = make_table_view(self.model)
+
+    def select(self, row):
+        index = self.view.model().index(row, 0)
+        self.view.selectionModel().setCurrentIndex(
+            index, QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
+
+    def test_selected_row_follows_its_data_after_a_header_sort(self):
+        self.select(0)
+        self.assertEqual(selected_row(self.view), (3, "Cara"))
+        self.view.sortByColumn(0, Qt.AscendingOrder)
+        self.assertEqual(selected_row(self.view), (3, "Cara"))
+        self.assertEqual(self.view.currentIndex().row(), 2)
+        self.view.sortByColumn(1, Qt.DescendingOrder)
+        self.assertEqual(selected_row(self.view), (3, "Cara"))
+        selected = self.view.selectionModel().selectedRows()
+        self.assertEqual([self.view.model().index(i.row(), 0).data() for i in selected], ["3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
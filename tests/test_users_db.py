@@ -0,0 +1,119 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import db_connection
+import seed_data
+import users_db
+from tests.db_case import DatabaseTestCase
+
+
+class UpsertGradesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        db_connection.configure(db_path=os.path.join(self.tmp.name, "test.db"))
+        users_db.setup_database()
+        seed_data.insert_courses([("EE201", "Circuits", 3, "Sun", "08:00", "09:20", "B1-101", 30)])
+        seed_data.insert_students([(2400001, "Sim", "s@kau.edu.stu.com", "1", "student")],
+                                  [(2400001, "Sim", "s@kau.edu.stu.com", "Computer", 1)])
+
+    def tearDown(self):
+        db_connection.close_connection()
+        self.tmp.cleanup()
+
+    def test_removed_counts_rows_actually_deleted(self):
+        self.assertEqual(users_db.upsert_grades([(2400001, "EE201", "2024-3", "B")]), (1, 0))
+        saved, removed = users_db.upsert_grades([
+            (2400001, "ee 201", "2024-3", ""),     # exists
+            (2400001, "EE201", "2024-3", ""),      # already gone
+            (2400001, "EE201", "2023-3", ""),      # never existed
+        ])
+        self.assertEqual((saved, removed), (0, 1))
+
+
+class RegisterCoursesAtomicTest(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.add_courses(("EE201", 1), ("EE202", 3))
+        self.add_students(*range(2400001, 2400009))
+
+    def registrations(self):
+        return self.con.execute("SELECT student_id, course_code FROM registration ORDER BY 1, 2").fetchall()
+
+    def test_full_course_goes_to_the_waitlist_in_the_same_call(self):
+        self.assertEqual(users_db.register_courses_atomic(2400001, ["EE201", "EE202"]), (["EE201", "EE202"], []))
+        self.assertEqual(users_db.register_courses_atomic(2400002, ["EE201", "EE202"]), (["EE202"], ["EE201"]))
+        self.assertEqual(self.counters("EE201"), (1, 1))
+        self.assertEqual(self.counters("EE202"), (2, 0))
+
+    def test_seat_replaces_an_old_waitlist_entry(self):
+        users_db.register_courses_atomic(2400001, ["EE201"])
+        users_db.register_courses_atomic(2400002, ["EE201"])
+        self.con.execute("UPDATE courses SET max_capacity = 2 WHERE course_code = 'EE201'")
+        self.con.commit()
+        self.assertEqual(users_db.register_courses_atomic(2400002, ["EE201"]), (["EE201"], []))
+        self.assertEqual(self.counters("EE201"), (2, 0))
+
+    def test_failure_writes_nothing(self):
+        users_db.register_courses_atomic(2400001, ["EE201"])
+        with self.assertRaises(ValueError):
+            users_db.register_courses_atomic(2400001, ["EE202", "EE201"])
+        self.assertEqual(self.registrations(), [(2400001, "EE201")])
+        self.assertEqual(self.counters("EE202"), (0, 0))
+
+    def test_concurrent_students_never_overbook(self):
+        db_connection.close_connection()    # every thread opens its own connection
+        results = {}
+
+        def register(sid):
+            try:
+                results[sid] = users_db.register_courses_atomic(sid, ["EE202"])
+            finally:
+                db_connection.close_connection()
+
+        threads = [threading.Thread(target=register, args=(sid,)) for sid in range(2400001, 2400009)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.con = db_connection.get_connection()
+        self.assertEqual(sum(1 for got, _ in results.values() if got), 3)
+        self.assertEqual(sum(1 for _, waiting in results.values() if waiting), 5)
+        self.assertEqual(self.counters("EE202"), (3, 5))
+
+
+
+class WaitlistOrderTest(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.add_courses(("EE201", 1), ("EE202", 1))
+        self.add_students(2400001, 2400002, 2400003, 2400004)
+        users_db.register_courses_atomic(2400004, ["EE201", "EE202"])
+        for sid in (2400001, 2400002, 2400003):
+            users_db.add_to_waitlist(sid, "EE201")
+        users_db.add_to_waitlist(2400003, "EE202")
+
+    def test_positions_follow_join_order_and_close_gaps(self):
+        self.assertEqual([(code, pos, n) for code, _, pos, n in users_db.get_waitlist_positions(2400003)],
+                         [("EE201", 3, 3), ("EE202", 1, 1)])
+        users_db.leave_waitlist(2400002, "EE201")
+        self.assertEqual([(code, pos, n) for code, _, pos, n in users_db.get_waitlist_positions(2400003)],
+                         [("EE201", 2, 2), ("EE202", 1, 1)])
+        users_db.add_to_waitlist(2400002, "EE201")
+        self.assertEqual(users_db.get_waitlist_positions(2400002)[0][2:], (3, 3))
+
+    def test_promotion_follows_the_sequence_not_the_clock(self):
+        # Same-second joins (or a skewed clock) must not reorder the queue
+        self.con.execute("UPDATE waitlist SET timestamp = '2024-01-01 00:00:00' WHERE student_id = 2400003")
+        self.con.execute("UPDATE waitlist SET timestamp = '2024-01-01 00:00:01' WHERE student_id <> 2400003")
+        self.con.commit()
+        self.assertEqual(users_db.drop_course_and_promote(2400004, "EE201"), 2400001)
+        self.assertEqual(self.counters("EE201"), (1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
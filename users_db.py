@@ -1,12 +1,22 @@
-import sqlite3 
+import re
+import sqlite3
+import db_connection
+import migrations
+import catalog
+import gpa_engine
+import course_codes
  
 
-def setup_database():
+def setup_database(profile=None):
     """
     Connects to the database and creates all necessary tables if they don't exist.
     This function should be called once when the application starts.
+    `profile` picks the performance profile ("safe", "fast", "bulk-load"); see db_connection.PROFILES.
     """
-    with sqlite3.connect('User.db') as con:
+    if profile is not None:
+        db_connection.configure(profile=profile)
+    con = db_connection.get_connection()
+    with con:
         info = con.cursor()
         #___________________________________________________________________________________
         # CREAT TABLE FOR USERS
@@ -70,7 +80,10 @@ def setup_database():
             timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
             PRIMARY KEY (student_id, course_code)
         )""")
-    print("Database setup complete.")
+    # Indexes and every later schema change live in migrations.py
+    migrations.migrate(con)
+    settings = db_connection.current_settings(con)
+    print(f"Database setup complete (profile: {db_connection.PROFILE}, journal: {settings['journal_mode']}).")
 
 
 #TODO: We should work on removing unnecessary classes and try to make the code more efficient
@@ -84,11 +97,9 @@ class student_db:
         self.userinfo = (ID, name, email, program, level)
 
     def insertData(self):
-        con_user = sqlite3.connect('User.db')
-        info = con_user.cursor()
-        info.execute("INSERT INTO students (id, name, email, program, level) VALUES (?, ?, ?, ?, ?)", self.userinfo)
-        con_user.commit()
-        con_user.close()
+        con_user = db_connection.get_connection()
+        with con_user:
+            con_user.execute("INSERT INTO students (id, name, email, program, level) VALUES (?, ?, ?, ?, ?)", self.userinfo)
 
 
 
@@ -96,11 +107,9 @@ class add_users:
     def __init__(self,userinfo):
         self.userinfo= userinfo
     def insertData(self):
-        con_user = sqlite3.connect('User.db')
-        info = con_user.cursor()
-        info.execute("INSERT INTO users (id, name, email, password, membership) VALUES (?, ?, ?, ?, ?)", self.userinfo)
-        con_user.commit()
-        con_user.close()
+        con_user = db_connection.get_connection()
+        with con_user:
+            con_user.execute("INSERT INTO users (id, name, email, password, membership) VALUES (?, ?, ?, ?, ?)", self.userinfo)
 #The comment is for future use if we decide to add student through this class
     # def insertStudent(self):
     #     self.info.execute("INSERT INTO students VALUES (?, ?, ?, ?, ?, ?, ?)", self.userinfo)
@@ -114,11 +123,12 @@ class courses_db:
         self.courseinfo = courseinfo
 
     def course_insert(self):
-        con_user = sqlite3.connect('User.db')
-        info = con_user.cursor()
-        info.execute("INSERT OR REPLACE INTO courses (id, course_code, course_name, credits, day, start_time, end_time, room, max_capacity) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",self.courseinfo)
-        con_user.commit()
-        con_user.close()
+        info = list(self.courseinfo)
+        info[1] = course_codes.normalize_code(info[1])
+        self.courseinfo = tuple(info)
+        con_user = db_connection.get_connection()
+        with con_user:
+            con_user.execute("INSERT OR REPLACE INTO courses (id, course_code, course_name, credits, day, start_time, end_time, room, max_capacity) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",self.courseinfo)
 
 
 
@@ -132,8 +142,7 @@ class search:
         self.parameter = parameter
 
     def fetch(self):
-        con_user = sqlite3.connect('User.db')
-        info = con_user.cursor()
+        info = db_connection.get_connection().cursor()
 
         # -------- USERS --------
         if self.table == "users":
@@ -175,7 +184,7 @@ class search:
             raise ValueError("Invalid table name")
 
         result = info.fetchone()
-        con_user.close()
+        info.close()
         return result
 
 
@@ -183,69 +192,140 @@ class search:
 
 def add_to_waitlist(student_id, course_code):
     """Adds a student to the waitlist for a specific course."""
-    with sqlite3.connect('User.db') as con:
+    with db_connection.get_connection() as con:
         # We use INSERT OR IGNORE to prevent crashing if they are already on the waitlist
         con.execute("INSERT OR IGNORE INTO waitlist (student_id, course_code) VALUES (?, ?)", 
                     (student_id, course_code))
         con.commit()
-def get_all_courses_data():
+def _chunks(items, size=500):
+    """Splits a list so each IN (...) stays under SQLite's bound-parameter limit."""
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def _iter_courses(course_codes=None):
     """
-    Fetches all course data required for the Student Dashboard.
-    Fixes the 'TBA' issue by explicitly fetching room and schedule info.
+    Yields (course_code, course dict) for every course (or just `course_codes`).
+    Shared by get_all_courses_data() and get_catalog().
     """
-    with sqlite3.connect('User.db') as con:
-        con.row_factory = sqlite3.Row  # This allows us to use column names
+    con = db_connection.get_connection()
+    with con:
         cur = con.cursor()
-        
-        # 1. Fetch ALL columns we need (including Room and Time)
-        cur.execute("""
+        cur.row_factory = sqlite3.Row  # This allows us to use column names
+
+        course_sql = """
             SELECT c.course_code, c.course_name, c.credits, c.max_capacity, 
                    c.day, c.start_time, c.end_time, c.room
             FROM courses c
-        """)
-        rows = cur.fetchall()
-        
-        # 2. Get Prerequisites
-        cur.execute("SELECT course_code, prereq_code FROM prerequisites")
+        """
+        prereq_sql = "SELECT course_code, prereq_code FROM prerequisites"
+
+        # 1. Get Prerequisites
+        if course_codes is None:
+            prereq_rows = cur.execute(prereq_sql).fetchall()
+        else:
+            prereq_rows = []
+            for chunk in _chunks(course_codes):
+                marks = ",".join("?" * len(chunk))
+                prereq_rows += cur.execute(prereq_sql + f" WHERE course_code IN ({marks})", chunk).fetchall()
+
         prereqs_map = {}
-        for r in cur.fetchall():
+        for r in prereq_rows:
             if r['course_code'] not in prereqs_map:
                 prereqs_map[r['course_code']] = []
             prereqs_map[r['course_code']].append(r['prereq_code'])
 
-        courses_data = {}
-        for row in rows:
-            code = row['course_code']
-            
-            # 3. Format Time (e.g., convert 8 to "08:00")
-            s_time = row['start_time']
-            e_time = row['end_time']
-            try:
-                if isinstance(s_time, int) or (isinstance(s_time, str) and s_time.isdigit()):
-                    s_time = f"{int(s_time):02d}:00"
-                if isinstance(e_time, int) or (isinstance(e_time, str) and e_time.isdigit()):
-                    e_time = f"{int(e_time):02d}:00"
-            except: 
-                pass 
-
-            # 4. Build the Dictionary with ALL keys
-            courses_data[code] = {
-                "name": row['course_name'],
-                "credits": row['credits'],
-                "max_capacity": row['max_capacity'],
-                "day": row['day'],
-                "start_time": s_time,
-                "end_time": e_time,
-                "room": row['room'],  # <--- This is the missing piece!
-                "schedule": [(row['day'], s_time, e_time)],
-                "prerequisites": prereqs_map.get(code, [])
-            }
-        return courses_data
+        # 2. Fetch ALL columns we need (including Room and Time), one row at a time
+        if course_codes is None:
+            batches = [cur.execute(course_sql)]
+        else:
+            batches = []
+            for chunk in _chunks(course_codes):
+                marks = ",".join("?" * len(chunk))
+                batches.append(cur.execute(course_sql + f" WHERE c.course_code IN ({marks})", chunk).fetchall())
+
+        for rows in batches:
+            for row in rows:
+                code = row['course_code']
+
+                # 3. Format Time (e.g., convert 8 to "08:00")
+                s_time = row['start_time']
+                e_time = row['end_time']
+                try:
+                    if isinstance(s_time, int) or (isinstance(s_time, str) and s_time.isdigit()):
+                        s_time = f"{int(s_time):02d}:00"
+                    if isinstance(e_time, int) or (isinstance(e_time, str) and e_time.isdigit()):
+                        e_time = f"{int(e_time):02d}:00"
+                except: 
+                    pass 
+
+                # 4. Build the Dictionary with ALL keys
+                yield code, {
+                    "name": row['course_name'],
+                    "credits": row['credits'],
+                    "max_capacity": row['max_capacity'],
+                    "day": row['day'],
+                    "start_time": s_time,
+                    "end_time": e_time,
+                    "room": row['room'],  # <--- This is the missing piece!
+                    "schedule": [(row['day'], s_time, e_time)],
+                    "prerequisites": prereqs_map.get(code, [])
+                }
+
+def get_all_courses_data(course_codes=None):
+    """
+    Fetches all course data required for the Student Dashboard.
+    Fixes the 'TBA' issue by explicitly fetching room and schedule info.
+    Pass `course_codes` to fetch only those courses (used for incremental catalog updates).
+    """
+    return dict(_iter_courses(course_codes))
+
+def get_catalog():
+    """Same data as get_all_courses_data(), streamed into a compact catalog.Catalog."""
+    return catalog.Catalog(_iter_courses())
+
+def get_catalog_change_seq():
+    """
+    Returns the newest sequence number in the catalog change log (0 if empty).
+    None if the database has not been migrated yet.
+    """
+    try:
+        row = db_connection.get_connection().execute("SELECT COALESCE(MAX(seq), 0) FROM catalog_changes").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0]
+
+def get_catalog_changes_since(seq):
+    """
+    Returns (oldest_seq_kept, changes) where changes are the change-log rows after `seq`:
+    (seq, entity, action, course_code, related_code, program, level).
+    """
+    con = db_connection.get_connection()
+    oldest = con.execute("SELECT COALESCE(MIN(seq), 0) FROM catalog_changes").fetchone()[0]
+    rows = con.execute("""
+        SELECT seq, entity, action, course_code, related_code, program, level
+        FROM catalog_changes WHERE seq > ? ORDER BY seq""", (seq,)).fetchall()
+    return oldest, rows
+
+def prune_catalog_changes(keep_after_seq):
+    """Deletes change-log rows up to `keep_after_seq` (consumers older than that do a full reload)."""
+    execute_query("DELETE FROM catalog_changes WHERE seq <= ?", (keep_after_seq,))
+
+def get_catalog_version():
+    """
+    Returns the catalog version counter (bumped on every course / prerequisite / plan change).
+    None if the database has not been migrated yet.
+    """
+    try:
+        row = db_connection.get_connection().execute("SELECT version FROM catalog_version WHERE id = 1").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
 
 def get_full_program_plan():
     """Fetches the entire program plan for the RegistrationValidator."""
     from collections import defaultdict
-    with sqlite3.connect('User.db') as con:
+    with db_connection.get_connection() as con:
         cur = con.cursor()
         cur.execute("SELECT program, level, course_code FROM program_plans")
         program_plan = defaultdict(lambda: defaultdict(list))
@@ -255,35 +335,141 @@ def get_full_program_plan():
 
 def get_current_enrollments():
     """Fetches a dictionary of current enrollments for each course."""
-    with sqlite3.connect('User.db') as con:
+    # course_enrollment is kept up to date by triggers on registration (migration 4)
+    with db_connection.get_connection() as con:
+        cur = con.cursor()
+        cur.execute("SELECT course_code, enrolled FROM course_enrollment WHERE enrolled > 0")
+        return {row[0]: row[1] for row in cur.fetchall()}
+
+def get_waitlist_counts():
+    """Number of students waiting for each course (only courses with a waitlist)."""
+    with db_connection.get_connection() as con:
         cur = con.cursor()
-        cur.execute("SELECT course_code, COUNT(student_id) FROM registration GROUP BY course_code")
+        cur.execute("SELECT course_code, waitlisted FROM course_enrollment WHERE waitlisted > 0")
         return {row[0]: row[1] for row in cur.fetchall()}
 
+def get_waitlist_positions(student_id):
+    """
+    Every waitlist entry of one student in a single query:
+    [(course_code, joined_at, position, queue_length), ...].
+    Position is the number of entries with a sequence number <= the student's
+    (counted on the (course_code, seq) index), so gaps left by leavers are fine.
+    """
+    con = db_connection.get_connection()
+    return con.execute("""
+        SELECT w.course_code, w.timestamp,
+               (SELECT COUNT(*) FROM waitlist x WHERE x.course_code = w.course_code AND x.seq <= w.seq),
+               COALESCE(e.waitlisted, 0)
+        FROM waitlist w LEFT JOIN course_enrollment e ON e.course_code = w.course_code
+        WHERE w.student_id = ?
+        ORDER BY w.course_code""", (student_id,)).fetchall()
+
+def leave_waitlist(student_id, course_code):
+    """Removes one waitlist entry; the rest of the queue keeps its sequence numbers."""
+    with db_connection.get_connection() as con:
+        return con.execute("DELETE FROM waitlist WHERE student_id=? AND course_code=?",
+                           (student_id, course_code)).rowcount == 1
+
+def rebuild_enrollment_counters():
+    """
+    Consistency repair: recomputes every course_enrollment row from the
+    registration and waitlist tables. Returns the list of
+    (course_code, enrolled, waitlisted) rows that had drifted, before the fix.
+    """
+    actual_sql = """
+        SELECT course_code, SUM(enrolled), SUM(waitlisted) FROM (
+            SELECT course_code, COUNT(*) AS enrolled, 0 AS waitlisted FROM registration GROUP BY course_code
+            UNION ALL
+            SELECT course_code, 0, COUNT(*) FROM waitlist GROUP BY course_code
+        ) GROUP BY course_code"""
+    with db_connection.transaction(immediate=True) as con:
+        actual = {code: (e, w) for code, e, w in con.execute(actual_sql)}
+        stored = {code: (e, w) for code, e, w in
+                  con.execute("SELECT course_code, enrolled, waitlisted FROM course_enrollment")}
+        drifted = [(code,) + stored.get(code, (0, 0))
+                   for code in set(actual) | set(stored)
+                   if stored.get(code, (0, 0)) != actual.get(code, (0, 0))]
+        if drifted:
+            con.execute("DELETE FROM course_enrollment")
+            con.executemany("INSERT INTO course_enrollment (course_code, enrolled, waitlisted) VALUES (?, ?, ?)",
+                            [(code, e, w) for code, (e, w) in actual.items()])
+    return sorted(drifted)
+
+def get_enrollment_count(course_code):
+    """Live number of students registered in one course (a single primary-key lookup)."""
+    row = db_connection.get_connection().execute(
+        "SELECT enrolled FROM course_enrollment WHERE course_code=?", (course_code,)).fetchone()
+    return row[0] if row else 0
+
 def get_registered_courses(student_id):
     """Fetches all course codes a student is registered for."""
-    with sqlite3.connect('User.db') as con:
+    with db_connection.get_connection() as con:
         cur = con.cursor()
         cur.execute("SELECT course_code FROM registration WHERE student_id=?", (student_id,))
-        return {row[0] for row in cur.fetchall()}
+        return course_codes.intern_codes(row[0] for row in cur.fetchall())
 
 def get_plan_courses(program, level):
     """Fetches all course codes for a given program and level."""
-    with sqlite3.connect('User.db') as con:
+    with db_connection.get_connection() as con:
         cur = con.cursor()
         cur.execute("SELECT course_code FROM program_plans WHERE program=? AND level=?", (program, level))
         return {row[0] for row in cur.fetchall()}
 
 def get_completed_courses(student_id):
     """Fetches all course codes from a student's transcript."""
-    with sqlite3.connect('User.db') as con:
+    with db_connection.get_connection() as con:
         cur = con.cursor()
         cur.execute("SELECT course_code FROM transcripts WHERE student_id=?", (student_id,))
-        return {row[0] for row in cur.fetchall()}
+        return course_codes.intern_codes(row[0] for row in cur.fetchall())
+
+# Terms are "YYYY-n" (n: 1 Spring, 2 Summer, 3 Fall) so they sort in time order;
+# rows from before terms were recorded have term '' (migration 8).
+CURRENT_TERM = "2025-3"
+TERM_PATTERN = re.compile(r"^\d{4}-[123]$")
+
+GRADE_UPSERT_SQL = """
+    INSERT INTO transcripts (student_id, course_code, term, grade) VALUES (?, ?, ?, ?)
+    ON CONFLICT(student_id, course_code, term) DO UPDATE SET grade = excluded.grade"""
+
+def upsert_grades(rows):
+    """
+    Every grade write goes through here: (student_id, course_code, term, grade)
+    rows are upserted on the transcript key with one executemany; a blank grade
+    removes that attempt. Retake attempt numbers are kept by triggers, and the
+    students' cached GPAs are rebuilt in the same transaction.
+    Returns (saved, removed); removed counts the rows actually deleted, not the
+    blank grades asked for. Safe to call inside db_connection.transaction().
+    """
+    upserts, removals = [], []
+    for sid, code, term, grade in rows:
+        code = course_codes.normalize_code(code)
+        if grade:
+            upserts.append((sid, code, term, grade))
+        else:
+            removals.append((sid, code, term))
+    with db_connection.transaction(immediate=True) as con:
+        con.executemany(GRADE_UPSERT_SQL, upserts)
+        # executemany's rowcount adds up every DELETE (trigger writes are not counted)
+        removed = con.executemany("DELETE FROM transcripts WHERE student_id=? AND course_code=? AND term=?",
+                                  removals).rowcount
+        gpa_engine.rebuild(con, {row[0] for row in upserts} | {row[0] for row in removals})
+    return len(upserts), max(removed, 0)
+
+def get_latest_grades(student_id):
+    """{course_code: grade} from each course's latest attempt."""
+    con = db_connection.get_connection()
+    return {code: grade for code, grade in con.execute(
+        "SELECT course_code, grade FROM transcripts WHERE student_id=? ORDER BY course_code, term",
+        (student_id,))}
+
+def get_prerequisite_pairs():
+    """Every (course_code, prereq_code) row, for building the prerequisite graph."""
+    return db_connection.get_connection().execute(
+        "SELECT course_code, prereq_code FROM prerequisites").fetchall()
 
 def get_course_credits(course_code):
     """Fetches the credits for a single course."""
-    with sqlite3.connect('User.db') as con:
+    with db_connection.get_connection() as con:
         cur = con.cursor()
         cur.execute("SELECT credits FROM courses WHERE course_code=?", (course_code,))
         result = cur.fetchone()
@@ -295,7 +481,7 @@ def get_credits_for_courses(course_codes):
 
 def execute_query(query, params=()):
     """A general purpose function to execute insert/update/delete queries."""
-    with sqlite3.connect('User.db') as con:
+    with db_connection.get_connection() as con:
         cur = con.cursor()
         cur.execute(query, params)
         con.commit()
@@ -310,16 +496,135 @@ def drop_course_for_student(student_id, course_code):
     query = "DELETE FROM registration WHERE student_id=? AND course_code=?"
     execute_query(query, (student_id, course_code))
 
+# Capacity check and insert in ONE statement: the row is only written while the
+# course still has a free seat, so two students can never both take the last one.
+# The seat count is the trigger-maintained course_enrollment row, not a COUNT(*).
+SEAT_INSERT_SQL = """
+    INSERT INTO registration (student_id, course_code)
+    SELECT ?, c.course_code FROM courses c
+    WHERE c.course_code = ?
+      AND COALESCE((SELECT e.enrolled FROM course_enrollment e WHERE e.course_code = c.course_code), 0)
+          < c.max_capacity
+"""
+
+def register_courses_atomic(student_id, course_codes):
+    """
+    Registers a student in all `course_codes` inside a single write transaction.
+    Full courses go to the waitlist in that same transaction.
+    All-or-nothing: if anything fails, nothing is written.
+    Returns (registered, waitlisted).
+    """
+    registered = []
+    waitlisted = []
+    with db_connection.transaction(immediate=True) as con:
+        for code in course_codes:
+            if con.execute("SELECT 1 FROM registration WHERE student_id=? AND course_code=?",
+                           (student_id, code)).fetchone():
+                raise ValueError(f"Already registered in {code}.")
+
+            if con.execute(SEAT_INSERT_SQL, (student_id, code)).rowcount == 1:
+                # Got a seat directly, so any older waitlist entry is obsolete
+                con.execute("DELETE FROM waitlist WHERE student_id=? AND course_code=?", (student_id, code))
+                registered.append(code)
+            else:
+                con.execute("INSERT OR IGNORE INTO waitlist (student_id, course_code) VALUES (?, ?)",
+                            (student_id, code))
+                waitlisted.append(code)
+    return registered, waitlisted
+
+def get_courses_with_free_seats(course_codes=None):
+    """
+    [(course_code, free_seats), ...] for every course that has an empty seat AND
+    a waitlist, read from the counter table (optionally only `course_codes`).
+    Safe to call inside db_connection.transaction().
+    """
+    con = db_connection.get_connection()
+    sql = """
+        SELECT e.course_code, c.max_capacity - e.enrolled
+        FROM course_enrollment e JOIN courses c ON c.course_code = e.course_code
+        WHERE e.waitlisted > 0 AND e.enrolled < c.max_capacity"""
+    if course_codes is None:
+        return con.execute(sql + " ORDER BY e.course_code").fetchall()
+    rows = []
+    for chunk in _chunks(course_codes):
+        marks = ",".join("?" * len(chunk))
+        rows += con.execute(sql + f" AND e.course_code IN ({marks})", chunk).fetchall()
+    return sorted(rows)
+
+def get_free_seats(course_codes):
+    """
+    {course_code: seats left} from max_capacity and the enrollment counter.
+    Safe to call inside db_connection.transaction().
+    """
+    con = db_connection.get_connection()
+    free = {}
+    for chunk in _chunks(course_codes):
+        marks = ",".join("?" * len(chunk))
+        for code, seats in con.execute(f"""
+                SELECT c.course_code, c.max_capacity - COALESCE(e.enrolled, 0)
+                FROM courses c LEFT JOIN course_enrollment e ON e.course_code = c.course_code
+                WHERE c.course_code IN ({marks})""", chunk):
+            free[code] = seats or 0
+    return free
+
+def get_student_ids(program, level):
+    """Ids of every student in one program level."""
+    con = db_connection.get_connection()
+    return [row[0] for row in con.execute(
+        "SELECT id FROM students WHERE program=? AND level=? ORDER BY id", (program, level))]
+
+def get_student_contexts(student_ids):
+    """
+    Everything validation needs for many students at once:
+    {student_id: (program, level, registered courses, completed courses)}.
+    Safe to call inside db_connection.transaction().
+    """
+    con = db_connection.get_connection()
+    contexts = {}
+    for chunk in _chunks(set(student_ids)):
+        marks = ",".join("?" * len(chunk))
+        for sid, program, level in con.execute(
+                f"SELECT id, program, level FROM students WHERE id IN ({marks})", chunk):
+            contexts[sid] = (program, level, set(), set())
+        for sid, code in con.execute(
+                f"SELECT student_id, course_code FROM registration WHERE student_id IN ({marks})", chunk):
+            if sid in contexts:
+                contexts[sid][2].add(code)
+        for sid, code in con.execute(
+                f"SELECT student_id, course_code FROM transcripts WHERE student_id IN ({marks})", chunk):
+            if sid in contexts:
+                contexts[sid][3].add(code)
+    return contexts
+
+def drop_course_and_promote(student_id, course_code):
+    """
+    Drops a registration and, in the same transaction, moves the earliest
+    waitlisted student into the freed seat (capacity is re-checked).
+    Returns the promoted student's id, or None.
+    """
+    with db_connection.transaction(immediate=True) as con:
+        con.execute("DELETE FROM registration WHERE student_id=? AND course_code=?", (student_id, course_code))
+        row = con.execute("""
+            SELECT student_id FROM waitlist
+            WHERE course_code = ?
+              AND student_id NOT IN (SELECT student_id FROM registration WHERE course_code = ?)
+            ORDER BY seq ASC
+            LIMIT 1""", (course_code, course_code)).fetchone()
+        if row and con.execute(SEAT_INSERT_SQL, (row[0], course_code)).rowcount == 1:
+            con.execute("DELETE FROM waitlist WHERE student_id=? AND course_code=?", (row[0], course_code))
+            return row[0]
+    return None
+
 def get_all_courses():
     """Fetches all courses from the database."""
-    with sqlite3.connect('User.db') as con:
+    with db_connection.get_connection() as con:
         cur = con.cursor()
         cur.execute("SELECT course_code, course_name, credits, max_capacity, day, start_time, end_time, room FROM courses ORDER BY course_code")
         return cur.fetchall()
 
 def delete_course(course_code):
     """Deletes a course from the courses table."""
-    with sqlite3.connect('User.db') as con:
+    with db_connection.get_connection() as con:
         cur = con.cursor()
         cur.execute("DELETE FROM courses WHERE course_code=?", (course_code,))
         cur.execute("DELETE FROM prerequisites WHERE course_code=? OR prereq_code=?", (course_code, course_code))
@@ -342,10 +647,8 @@ if __name__ == "__main__":
 
     # This block is for testing the database script directly.
     # It's better to manage connections here rather than globally.
-    db_conn = sqlite3.connect('User.db')
-    cursor = db_conn.cursor()
+    db_conn = db_connection.get_connection()
 
     print("Students in the database:")
-    for row in cursor.execute("SELECT * FROM users"):
+    for row in db_conn.execute("SELECT * FROM users"):
         print(row)
-    db_conn.close()
@@ -0,0 +1,87 @@
+from collections import namedtuple
+import db_connection
+import users_db
+
+# ==========================================
+#  BATCHED WAITLIST PROMOTION
+# ==========================================
+# During add/drop many seats free up at once. Instead of promoting one student
+# per drop, every open seat across all courses is filled in ONE transaction:
+#   1. courses with a free seat and a waitlist come from the counter table
+#   2. the waiting students' program / registrations / transcripts are loaded
+#      in a few bulk queries
+#   3. candidates are taken in waitlist order (seq) and each one is re-checked
+#      with RegistrationValidator against their CURRENT timetable; anyone who
+#      would now break a rule (clash, credit limit, ...) is skipped and stays
+#      on the waitlist for a later round
+
+PromotionResult = namedtuple("PromotionResult", "promoted skipped")
+# promoted: [(student_id, course_code), ...] in the order seats were given
+# skipped:  [(student_id, course_code, reason), ...]
+
+
+def promote_waitlisted(validator, course_codes=None):
+    """
+    Fills every free seat (optionally only in `course_codes`) from the waitlists.
+    Joins the caller's transaction if there is one, so a batch of drops and the
+    promotions they trigger can be committed together.
+    """
+    promoted = []
+    skipped = []
+    with db_connection.transaction(immediate=True) as con:
+        open_courses = users_db.get_courses_with_free_seats(course_codes)
+        if not open_courses:
+            return PromotionResult(promoted, skipped)
+
+        queues = {}
+        for code, _ in open_courses:
+            queues[code] = [row[0] for row in con.execute(
+                "SELECT student_id FROM waitlist WHERE course_code=? ORDER BY seq", (code,))]
+        contexts = users_db.get_student_contexts(sid for queue in queues.values() for sid in queue)
+
+        for code, free in open_courses:
+            for sid in queues[code]:
+                if free <= 0:
+                    break
+                context = contexts.get(sid)
+                if context is None:
+                    skipped.append((sid, code, "Student record not found."))
+                    continue
+                program, level, registered, completed = context
+                if code in registered:
+                    # Stale entry: already holds a seat
+                    con.execute("DELETE FROM waitlist WHERE student_id=? AND course_code=?", (sid, code))
+                    continue
+
+                ok, msg = validator.validate_registration(
+                    selected_courses=sorted(registered) + [code],
+                    completed_courses=completed,
+                    student_program=program,
+                    student_level=level,
+                    current_enrollments=None
+                )
+                if not ok:
+                    skipped.append((sid, code, msg))
+                    continue
+
+                if con.execute(users_db.SEAT_INSERT_SQL, (sid, code)).rowcount != 1:
+                    break    # capacity lowered meanwhile: no seat after all
+                con.execute("DELETE FROM waitlist WHERE student_id=? AND course_code=?", (sid, code))
+                registered.add(code)    # later courses in this batch see the new timetable
+                promoted.append((sid, code))
+                free -= 1
+    return PromotionResult(promoted, skipped)
+
+
+def drop_many(validator, drops):
+    """
+    Processes a storm of drops [(student_id, course_code), ...] and the promotions
+    they free up as ONE transaction. Returns (number dropped, PromotionResult).
+    """
+    with db_connection.transaction(immediate=True) as con:
+        dropped = 0
+        for student_id, course_code in drops:
+            dropped += con.execute("DELETE FROM registration WHERE student_id=? AND course_code=?",
+                                   (student_id, course_code)).rowcount
+        result = promote_waitlisted(validator, {code for _, code in drops})
+    return dropped, result